@@ -0,0 +1,20 @@
+# controllers/empleados_controller.py
+from controllers.repositorio import Repositorio
+from models.empleado import Empleado
+
+
+class EmpleadosController(Repositorio[Empleado]):
+    """Empleados de la pantalla de empleados"""
+
+    tabla = "empleados"
+
+    # ==================== ESCRITURA ====================
+
+    def agregar(self, nombre, apellido, puesto, telefono='', usuario='', password='', privilegio='') -> bool:
+        return self.db.agregar_empleado(nombre, apellido, puesto, telefono, usuario, password, privilegio)
+
+    def actualizar(self, id, nombre, apellido, puesto, telefono, privilegio) -> bool:
+        return self.db.actualizar_empleado(id, nombre, apellido, puesto, telefono, privilegio)
+
+    def eliminar(self, id):
+        self.db.eliminar_empleado(id)
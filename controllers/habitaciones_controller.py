@@ -0,0 +1,47 @@
+# controllers/habitaciones_controller.py
+from datetime import date
+from typing import List
+
+from controllers.repositorio import Repositorio
+from models.habitacion import Habitacion
+
+
+class HabitacionesController(Repositorio[Habitacion]):
+    """
+    Habitaciones compartidas por la pantalla de habitaciones y el formulario
+    de reservas (un objeto Habitacion por id)
+    """
+
+    tabla = "habitaciones"
+
+    # ==================== LECTURA ====================
+
+    def libres(self, entrada: date, salida: date) -> List[Habitacion]:
+        """Habitaciones sin reservas en [entrada, salida), como objetos del mapa"""
+        libres = self.db.obtener_habitaciones_disponibles(entrada, salida)
+        self.sincronizar()
+        # El motor de disponibilidad tiene su propio índice: si una habitación
+        # todavía no está en el mapa se devuelve tal como vino
+        return [self.obtener(hab.id) or hab for hab in libres]
+
+    # ==================== ESCRITURA ====================
+
+    # Las escrituras pasan por DatabaseManager, que sube la versión de la
+    # tabla: la próxima lectura sincroniza
+
+    def agregar(self, numero, tipo, precio, estado='disponible') -> bool:
+        return self.db.agregar_habitacion(numero, tipo, precio, estado)
+
+    def actualizar(self, id, numero, tipo, precio, estado) -> bool:
+        return self.db.actualizar_habitacion(id, numero, tipo, precio, estado)
+
+    def eliminar(self, id):
+        self.db.eliminar_habitacion(id)
+
+    def cambiar_estado(self, id, nuevo_estado):
+        self.db.cambiar_estado_habitacion(id, nuevo_estado)
+
+    # ==================== REPOSITORIO ====================
+
+    def _ordenar(self, filas):
+        return sorted(filas, key=lambda hab: str(hab.numero))
@@ -0,0 +1,26 @@
+# controllers/huespedes_controller.py
+from typing import List
+
+from controllers.repositorio import Repositorio
+from models.huesped import Huesped, HuespedEncontrado
+
+
+class HuespedesController(Repositorio[Huesped]):
+    """Huéspedes compartidos por la pantalla de huéspedes y el formulario de reservas"""
+
+    tabla = "huespedes"
+
+    def buscar(self, texto: str, limite: int = 50) -> List[HuespedEncontrado]:
+        """Búsqueda con ranking del servidor (DatabaseManager.buscar_huespedes)"""
+        return self.db.buscar_huespedes(texto, limite)
+
+    # ==================== ESCRITURA ====================
+
+    def agregar(self, nombre, apellido, telefono, password='', email=''):
+        return self.db.agregar_huesped(nombre, apellido, telefono, password, email)
+
+    def actualizar(self, id, nombre, apellido, telefono, password='', email='') -> bool:
+        return self.db.actualizar_huesped(id, nombre, apellido, telefono, password, email)
+
+    def eliminar(self, id) -> bool:
+        return self.db.eliminar_huesped(id)
@@ -0,0 +1,164 @@
+# controllers/repositorio.py
+"""
+Base de los controladores: mapa de identidad y caché versionada por tabla
+
+Cada controlador guarda un solo objeto (modelo NamedTuple) por id. Las
+pantallas que piden los mismos datos reciben los mismos objetos, y al
+sincronizar solo se reemplazan los que cambiaron: una fila igual a la que
+ya estaba conserva su objeto, así `nuevo is anterior` alcanza para saber
+que no hay nada que repintar.
+
+La caché se considera vigente mientras no cambie db.version_datos(tabla)
+(escrituras de esta terminal) y no pase el TTL (escrituras de otras).
+La primera sincronización lee la tabla entera; las siguientes piden solo
+lo creado, modificado o borrado desde entonces
+(DatabaseManager.obtener_cambios_desde).
+"""
+
+import threading
+import time
+from typing import Dict, Generic, Iterable, List, NamedTuple, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Segundos que se confía en el snapshot sin escrituras locales
+TTL_REPOSITORIO = 30.0
+
+
+class Cambios(NamedTuple):
+    """Resultado de una sincronización"""
+    modificados: List[int]  # ids nuevos o con valores distintos
+    eliminados: List[int]
+    completa: bool  # True si se releyó toda la tabla
+
+    @property
+    def hay_cambios(self) -> bool:
+        return bool(self.modificados or self.eliminados)
+
+
+class Repositorio(Generic[T]):
+    """Mapa de identidad de una tabla con sincronización por versión y TTL"""
+
+    tabla: str = ""
+    # False: no se lee la tabla completa, el mapa se llena con lo que se consulta
+    cargar_completo: bool = True
+
+    def __init__(self, db, ttl: float = TTL_REPOSITORIO):
+        self.db = db
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._lock_sincronizar = threading.Lock()
+        self._por_id: Dict[int, T] = {}
+        self._lista: Optional[List[T]] = None
+        self._version = None
+        self._sincronizado_en: Optional[float] = None
+        self._marca = None  # Marca del servidor para _traer_cambios
+
+    # ==================== API ====================
+
+    def todas(self) -> List[T]:
+        """Todas las filas (sincroniza antes si hace falta)"""
+        self.sincronizar()
+        with self._lock:
+            if self._lista is None:
+                self._lista = self._ordenar(self._por_id.values())
+            return list(self._lista)
+
+    def obtener(self, id: int) -> Optional[T]:
+        """La fila con ese id desde el mapa (sin consultar)"""
+        with self._lock:
+            return self._por_id.get(id)
+
+    def sincronizar(self, forzar: bool = False) -> Cambios:
+        """Pone el mapa al día si cambió la versión local o venció el TTL"""
+        # Una sincronización a la vez; las lecturas del mapa no esperan a la consulta
+        with self._lock_sincronizar:
+            with self._lock:
+                version = self.db.version_datos(self.tabla)
+                vigente = (self._sincronizado_en is not None and version == self._version
+                           and time.monotonic() - self._sincronizado_en < self.ttl)
+                if vigente and not forzar:
+                    return Cambios([], [], False)
+                marca = self._marca
+
+            # La versión se leyó antes de consultar: si alguien escribe
+            # mientras tanto, la próxima lectura vuelve a sincronizar
+            delta = self._traer_cambios(marca) if marca is not None else None
+            if delta is None and self.cargar_completo:
+                filas, nueva_marca = self._traer_todo()
+            elif delta is None:
+                filas, nueva_marca = [], self._marca_inicial()
+
+            with self._lock:
+                if delta is not None:
+                    filas, eliminados, nueva_marca = delta
+                    cambios = self._aplicar(filas, eliminados, completa=False)
+                else:
+                    cambios = self._aplicar(filas, (), completa=self.cargar_completo)
+                self._marca = nueva_marca
+                self._version = version
+                self._sincronizado_en = time.monotonic()
+                return cambios
+
+    def invalidar(self):
+        """La próxima lectura vuelve a sincronizar"""
+        with self._lock:
+            self._sincronizado_en = None
+
+    def incorporar(self, filas: Iterable[T]) -> List[T]:
+        """Pasa filas consultadas por fuera por el mapa (devuelve los objetos canónicos)"""
+        with self._lock:
+            resultado = []
+            for fila in filas:
+                anterior = self._por_id.get(fila.id)
+                if anterior == fila:
+                    resultado.append(anterior)
+                else:
+                    self._por_id[fila.id] = fila
+                    self._lista = None
+                    resultado.append(fila)
+            return resultado
+
+    # ==================== PARA LOS CONTROLADORES ====================
+
+    def _traer_todo(self) -> Tuple[List[T], object]:
+        """(todas las filas, marca para la próxima sincronización)"""
+        cambios = self.db.obtener_cambios_desde(self.tabla)
+        return cambios.filas, cambios.marca
+
+    def _traer_cambios(self, marca) -> Optional[Tuple[List[T], List[int], object]]:
+        """(filas modificadas, ids eliminados, nueva marca) o None si no se sabe"""
+        cambios = self.db.obtener_cambios_desde(self.tabla, marca)
+        if cambios is None:
+            return None
+        return cambios.filas, cambios.eliminados, cambios.marca
+
+    def _marca_inicial(self):
+        """Marca desde la que seguir los cambios cuando no se carga la tabla"""
+        return None
+
+    def _ordenar(self, filas: Iterable[T]) -> List[T]:
+        return sorted(filas, key=lambda fila: fila.id)
+
+    # ==================== INTERNOS ====================
+
+    def _aplicar(self, filas: List[T], eliminados: Iterable[int], completa: bool) -> Cambios:
+        modificados = []
+        nuevos = {} if completa else self._por_id
+        for fila in filas:
+            anterior = self._por_id.get(fila.id)
+            if anterior == fila:
+                nuevos[fila.id] = anterior  # Mismo objeto: nada que repintar
+            else:
+                nuevos[fila.id] = fila
+                modificados.append(fila.id)
+
+        if completa:
+            eliminados = [id for id in self._por_id if id not in nuevos]
+            self._por_id = nuevos
+        else:
+            eliminados = [id for id in eliminados if self._por_id.pop(id, None) is not None]
+
+        if modificados or eliminados or completa:
+            self._lista = None
+        return Cambios(modificados, eliminados, completa)
@@ -0,0 +1,83 @@
+# controllers/reservas_controller.py
+from typing import List
+
+from controllers.repositorio import Repositorio
+from database.db_manager import PaginaReservas, ResultadoReserva
+from models.reserva import Reserva
+
+
+class ReservasController(Repositorio[Reserva]):
+    """
+    Reservas ya vistas por la pantalla de reservas
+
+    La tabla no se carga completa (las páginas vienen del servidor con
+    paginación por keyset); el mapa guarda las reservas que se mostraron y
+    sincronizar() trae solo las que cambiaron desde la última vez
+    (DatabaseManager.obtener_cambios_desde).
+    """
+
+    tabla = "reservaciones"
+    cargar_completo = False
+
+    def __init__(self, db, **kwargs):
+        super().__init__(db, **kwargs)
+        # Llegaron reservas creadas después de las que están en el mapa
+        self._hay_nuevas = False
+
+    def pagina(self, busqueda='', estado=None, cursor=None, limite=50) -> PaginaReservas:
+        """Una página del listado, con las reservas ya conocidas como objetos del mapa"""
+        if cursor is None:
+            self.sincronizar()
+            self._hay_nuevas = False  # La primera página ya las trae
+        pagina = self.db.obtener_reservas_pagina(busqueda, estado, cursor, limite)
+        return PaginaReservas(self.incorporar(pagina.filas), pagina.siguiente)
+
+    def vigentes(self, reservas: List[Reserva]) -> List[Reserva]:
+        """Las mismas reservas con sus valores actuales (tras sincronizar)"""
+        self.sincronizar()
+        return [self.obtener(reserva.id) or reserva for reserva in reservas]
+
+    def tomar_nuevas(self) -> bool:
+        """True (una sola vez) si desde la última página se crearon reservas"""
+        hay_nuevas, self._hay_nuevas = self._hay_nuevas, False
+        return hay_nuevas
+
+    # ==================== ESCRITURA ====================
+
+    def reservar(self, huesped_id, habitacion_id, fecha_entrada, fecha_salida, total) -> ResultadoReserva:
+        return self.db.reservar_habitacion(huesped_id, habitacion_id, fecha_entrada, fecha_salida, total)
+
+    def finalizar(self, reserva_id) -> bool:
+        return self.db.finalizar_reserva(reserva_id)
+
+    def cancelar(self, reserva_id) -> bool:
+        return self.db.cancelar_reserva(reserva_id)
+
+    # ==================== REPOSITORIO ====================
+
+    def _marca_inicial(self):
+        return self.db.marca_cambios()
+
+    def _traer_cambios(self, marca):
+        delta = super()._traer_cambios(marca)
+        if delta is None:
+            return self._releer_conocidas(marca)
+        filas, eliminados, nueva_marca = delta
+        with self._lock:
+            # Los ids son correlativos: uno mayor a todos los conocidos es una reserva nueva
+            maximo = max(self._por_id, default=None)
+            if maximo is not None and any(fila.id > maximo for fila in filas):
+                self._hay_nuevas = True
+            # Solo interesan las que ya están en el mapa (las demás llegan con su página)
+            conocidas = [fila for fila in filas if fila.id in self._por_id]
+        return conocidas, eliminados, nueva_marca
+
+    def _releer_conocidas(self, marca):
+        """Sin seguimiento de cambios (migración 009): se releen por id las del mapa"""
+        with self._lock:
+            ids = list(self._por_id)
+        if not ids:
+            return [], [], marca
+        filas = self.db.obtener_reservas_por_id(ids)
+        encontradas = {fila.id for fila in filas}
+        return filas, [id for id in ids if id not in encontradas], marca
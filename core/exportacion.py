@@ -0,0 +1,132 @@
+# core/exportacion.py
+"""
+Exportación de reportes a Excel en modo streaming
+Usa el modo write-only de openpyxl: cada fila se serializa al escribirla y
+no queda en memoria, así el costo no crece con el rango de fechas.
+Pensado para correr fuera del hilo de Tk: avisa el avance con un callback
+y se detiene cuando se activa el evento `cancelar`.
+"""
+
+import os
+import threading
+from typing import Callable, Iterable, NamedTuple, Optional, Sequence
+
+FORMATO_FECHA = "yyyy-mm-dd"
+FORMATO_MONEDA = "$#,##0.00"
+
+# Filas entre avisos de progreso
+AVISAR_CADA = 500
+
+
+class ExportacionCancelada(Exception):
+    """El usuario canceló la exportación"""
+
+
+class Columna(NamedTuple):
+    """Columna de una hoja: título, ancho y formato numérico opcional"""
+    titulo: str
+    ancho: int
+    formato: Optional[str] = None
+
+
+class HojaExcel(NamedTuple):
+    """Hoja a exportar; `filas` puede ser cualquier iterable (lista o generador)"""
+    nombre: str
+    titulo: str
+    subtitulo: str
+    color: str
+    columnas: Sequence[Columna]
+    filas: Iterable[tuple]
+    total: int = 0  # Filas esperadas, solo para el progreso
+    pie: Optional[tuple] = None  # Fila de totales, en negrita al final
+
+
+def exportar_excel(ruta: str, hojas: Sequence[HojaExcel],
+                   progreso: Optional[Callable[[int, int], None]] = None,
+                   cancelar: Optional[threading.Event] = None) -> int:
+    """
+    Escribe las hojas en un .xlsx
+
+    El archivo se genera con otro nombre y se renombra al terminar, así una
+    exportación cancelada o fallida no deja un archivo a medias.
+
+    Args:
+        progreso: Callback (escritas, total) cada AVISAR_CADA filas
+        cancelar: Evento que detiene la exportación (lanza ExportacionCancelada)
+
+    Returns:
+        Cantidad de filas de datos escritas
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Font, PatternFill
+    from openpyxl.utils import get_column_letter
+
+    total = sum(hoja.total for hoja in hojas)
+    escritas = 0
+    temporal = f"{ruta}.tmp"
+
+    wb = Workbook(write_only=True)
+    try:
+        for hoja in hojas:
+            ws = wb.create_sheet(hoja.nombre)
+            # En modo write-only los anchos se fijan antes de la primera fila
+            for i, columna in enumerate(hoja.columnas, start=1):
+                ws.column_dimensions[get_column_letter(i)].width = columna.ancho
+
+            titulo = WriteOnlyCell(ws, value=hoja.titulo)
+            titulo.font = Font(size=16, bold=True)
+            ws.append([titulo])
+            ws.append([hoja.subtitulo])
+            ws.append([])
+
+            fuente = Font(bold=True, color="FFFFFF")
+            relleno = PatternFill(start_color=hoja.color, fill_type="solid")
+            centrado = Alignment(horizontal="center")
+            encabezados = []
+            for columna in hoja.columnas:
+                celda = WriteOnlyCell(ws, value=columna.titulo)
+                celda.font = fuente
+                celda.fill = relleno
+                celda.alignment = centrado
+                encabezados.append(celda)
+            ws.append(encabezados)
+
+            formatos = [(i, columna.formato) for i, columna in enumerate(hoja.columnas) if columna.formato]
+            for fila in hoja.filas:
+                if cancelar is not None and cancelar.is_set():
+                    raise ExportacionCancelada()
+
+                if formatos:
+                    fila = list(fila)
+                    for i, formato in formatos:
+                        celda = WriteOnlyCell(ws, value=fila[i])
+                        celda.number_format = formato
+                        fila[i] = celda
+                ws.append(fila)
+
+                escritas += 1
+                if progreso and escritas % AVISAR_CADA == 0:
+                    progreso(escritas, total)
+
+            if hoja.pie is not None:
+                negrita = Font(bold=True)
+                pie = []
+                for valor, columna in zip(hoja.pie, hoja.columnas):
+                    celda = WriteOnlyCell(ws, value=valor)
+                    celda.font = negrita
+                    if columna.formato:
+                        celda.number_format = columna.formato
+                    pie.append(celda)
+                ws.append(pie)
+
+        wb.save(temporal)
+        os.replace(temporal, ruta)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+
+    if progreso:
+        progreso(escritas, total)
+    return escritas
@@ -4,7 +4,11 @@ Gestor de Sesión Global - Singleton Pattern
 Mantiene la conexión a BD y datos del usuario a través de toda la aplicación
 """
 
-from database.db_manager import DatabaseManager
+from controllers.empleados_controller import EmpleadosController
+from controllers.habitaciones_controller import HabitacionesController
+from controllers.huespedes_controller import HuespedesController
+from controllers.reservas_controller import ReservasController
+from database.db_manager import DatabaseManager, ResultadoLogin
 from typing import Optional, Dict, Any
 
 
@@ -28,6 +32,7 @@ class SessionManager:
 
         self._initialized = True
         self._db: Optional[DatabaseManager] = None
+        self._controladores: Dict[str, Any] = {}
         self._usuario: Dict[str, Any] = {}
         self._activa = False
 
@@ -40,6 +45,8 @@ class SessionManager:
 
         try:
             self._db = DatabaseManager()
+            # Avisos de cambios de otras terminales (database/notificaciones.py)
+            self._db.notificaciones.iniciar()
             return True
         except Exception as e:
             print(f"Error al conectar a BD: {e}")
@@ -55,30 +62,57 @@ class SessionManager:
                 print(f"Error al cerrar BD: {e}")
             finally:
                 self._db = None
+                self._controladores = {}
 
     @property
     def db(self) -> Optional[DatabaseManager]:
         """Obtiene la instancia de base de datos"""
         return self._db
 
+    # ==================== CONTROLADORES ====================
+
+    # Uno por tipo de entidad y por conexión: todas las pantallas comparten
+    # el mismo estado en memoria (ver controllers/repositorio.py)
+
+    def _controlador(self, nombre, clase):
+        controlador = self._controladores.get(nombre)
+        if controlador is None and self._db is not None:
+            controlador = self._controladores[nombre] = clase(self._db)
+        return controlador
+
+    @property
+    def habitaciones(self) -> Optional[HabitacionesController]:
+        return self._controlador("habitaciones", HabitacionesController)
+
+    @property
+    def empleados(self) -> Optional[EmpleadosController]:
+        return self._controlador("empleados", EmpleadosController)
+
+    @property
+    def huespedes(self) -> Optional[HuespedesController]:
+        return self._controlador("huespedes", HuespedesController)
+
+    @property
+    def reservas(self) -> Optional[ReservasController]:
+        return self._controlador("reservas", ReservasController)
+
     # ==================== GESTIÓN DE SESIÓN ====================
 
-    def iniciar_sesion(self, empleado_data: tuple, privilegio: str) -> bool:
+    def iniciar_sesion(self, empleado: ResultadoLogin) -> bool:
         """
         Inicia sesión con los datos del empleado
 
         Args:
-            empleado_data: (id, nombre, apellido, puesto)
-            privilegio: Nivel de privilegio del empleado
+            empleado: Resultado de DatabaseManager.validar_login
         """
         try:
             self._usuario = {
-                'id': empleado_data[0],
-                'nombre': empleado_data[1],
-                'apellido': empleado_data[2],
-                'puesto': empleado_data[3],
-                'privilegio': privilegio,
-                'nombre_completo': f"{empleado_data[1]} {empleado_data[2]}"
+                'id': empleado.id,
+                'nombre': empleado.nombre,
+                'apellido': empleado.apellido,
+                'puesto': empleado.puesto,
+                'privilegio': empleado.privilegio,
+                'nombre_completo': f"{empleado.nombre} {empleado.apellido}"
             }
             self._activa = True
             return True
@@ -87,10 +121,13 @@ class SessionManager:
             return False
 
     def cerrar_sesion(self):
-        """Cierra la sesión actual y limpia datos"""
+        """
+        Cierra la sesión actual y limpia datos.
+        El pool de conexiones se conserva para que el siguiente login
+        no pague de nuevo la conexión TLS; se cierra con cerrar_db().
+        """
         self._usuario = {}
         self._activa = False
-        self.cerrar_db()
 
     @property
     def sesion_activa(self) -> bool:
@@ -0,0 +1,207 @@
+# core/worker.py
+"""
+Trabajador en segundo plano para el acceso a datos
+Ejecuta las llamadas a DatabaseManager fuera del hilo de Tk y entrega
+los resultados en el hilo principal mediante root.after
+"""
+
+import queue
+import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class TrabajadorDB:
+    """
+    Pool de hilos para consultas con entrega de resultados en el hilo de Tk
+
+    Cada solicitud puede llevar una `clave`: si llega una solicitud nueva con
+    la misma clave antes de que termine la anterior, la respuesta vieja se
+    descarta (respuesta obsoleta).
+
+    `ejecutar_por_lotes` consume un iterable (p. ej. un cursor del servidor)
+    y entrega las filas en lotes a medida que llegan, sin esperar al final.
+    """
+
+    def __init__(self, hilos: int = 4, intervalo_ms: int = 30):
+        self._executor = ThreadPoolExecutor(max_workers=hilos, thread_name_prefix="db-worker")
+        self._resultados: "queue.Queue" = queue.Queue()
+        self._generaciones: Dict[Hashable, int] = {}
+        self._intervalo_ms = intervalo_ms
+        self._root = None
+        self._sondeo_activo = False
+        self._pendientes = 0
+
+    # ==================== API ====================
+
+    def ejecutar(self, widget, funcion: Callable, *args,
+                 al_terminar: Optional[Callable[[Any], None]] = None,
+                 al_fallar: Optional[Callable[[Exception], None]] = None,
+                 clave: Optional[Hashable] = None, **kwargs) -> Future:
+        """
+        Ejecuta funcion(*args, **kwargs) en segundo plano
+
+        Args:
+            widget: Widget dueño de la respuesta; si ya no existe se descarta
+            al_terminar: Callback con el resultado (se llama en el hilo de Tk)
+            al_fallar: Callback con la excepción (se llama en el hilo de Tk)
+            clave: Identifica la solicitud para descartar respuestas obsoletas
+        """
+        generacion = self._nueva_generacion(clave)
+        return self._enviar(widget, funcion, args, kwargs, al_terminar, al_fallar, clave, generacion)
+
+    def ejecutar_por_lotes(self, widget, funcion: Callable, *args,
+                           al_lote: Callable[[list], None],
+                           al_terminar: Optional[Callable[[int], None]] = None,
+                           al_fallar: Optional[Callable[[Exception], None]] = None,
+                           clave: Optional[Hashable] = None,
+                           tamano_lote: int = 500, **kwargs) -> Future:
+        """
+        Itera en segundo plano lo que devuelve funcion(*args, **kwargs)
+
+        Args:
+            al_lote: Callback con cada lote de filas (hilo de Tk, en orden)
+            al_terminar: Callback con la cantidad total de filas
+            tamano_lote: Filas por entrega
+
+        Si la solicitud queda obsoleta (otra con la misma clave) se deja de
+        iterar, lo que cierra el cursor del servidor.
+        """
+        generacion = self._nueva_generacion(clave)
+
+        def consumir():
+            filas = funcion(*args, **kwargs)
+            total = 0
+            lote = []
+            try:
+                for fila in filas:
+                    lote.append(fila)
+                    if len(lote) >= tamano_lote:
+                        if not self._vigente(clave, generacion):
+                            return total
+                        self._entregar_lote(widget, al_lote, clave, generacion, lote)
+                        total += len(lote)
+                        lote = []
+            finally:
+                # Un generador abandonado libera su cursor y su conexión ya
+                cerrar = getattr(filas, "close", None)
+                if cerrar:
+                    cerrar()
+            if lote:
+                self._entregar_lote(widget, al_lote, clave, generacion, lote)
+                total += len(lote)
+            return total
+
+        return self._enviar(widget, consumir, (), {}, al_terminar, al_fallar, clave, generacion)
+
+    def invalidar(self, clave: Hashable):
+        """Descarta la respuesta en curso para una clave sin lanzar otra"""
+        self._generaciones[clave] = self._generaciones.get(clave, 0) + 1
+
+    def cerrar(self):
+        """Detiene los hilos sin esperar trabajos pendientes"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # ==================== ENVÍO ====================
+
+    def _nueva_generacion(self, clave):
+        if clave is None:
+            return None
+        generacion = self._generaciones.get(clave, 0) + 1
+        self._generaciones[clave] = generacion
+        return generacion
+
+    def _vigente(self, clave, generacion) -> bool:
+        return clave is None or self._generaciones.get(clave) == generacion
+
+    def _enviar(self, widget, funcion, args, kwargs, al_terminar, al_fallar, clave, generacion) -> Future:
+        futuro = self._executor.submit(funcion, *args, **kwargs)
+        futuro.add_done_callback(
+            lambda f: self._resultados.put((f, widget, al_terminar, al_fallar, clave, generacion, False))
+        )
+
+        self._pendientes += 1
+        self._iniciar_sondeo(widget)
+        return futuro
+
+    def _entregar_lote(self, widget, al_lote, clave, generacion, lote):
+        """Encola un resultado parcial (desde el hilo del trabajador)"""
+        parcial = Future()
+        parcial.set_result(lote)
+        # Parcial: no descuenta _pendientes, la tarea sigue en curso
+        self._resultados.put((parcial, widget, al_lote, None, clave, generacion, True))
+
+    # ==================== ENTREGA EN EL HILO DE TK ====================
+
+    def _iniciar_sondeo(self, widget):
+        if self._sondeo_activo:
+            return
+        self._root = widget.nametowidget(".")
+        self._sondeo_activo = True
+        self._root.after(self._intervalo_ms, self._procesar_resultados)
+
+    def _procesar_resultados(self):
+        while True:
+            try:
+                futuro, widget, al_terminar, al_fallar, clave, generacion, parcial = self._resultados.get_nowait()
+            except queue.Empty:
+                break
+
+            if not parcial:
+                self._pendientes -= 1
+            self._entregar(futuro, widget, al_terminar, al_fallar, clave, generacion)
+
+        if self._pendientes > 0:
+            try:
+                self._root.after(self._intervalo_ms, self._procesar_resultados)
+                return
+            except Exception:
+                # La ventana raíz ya fue destruida
+                pass
+        self._sondeo_activo = False
+
+    def _entregar(self, futuro, widget, al_terminar, al_fallar, clave, generacion):
+        if futuro.cancelled():
+            return
+        if not self._vigente(clave, generacion):
+            return  # Respuesta obsoleta
+        try:
+            if not widget.winfo_exists():
+                return
+        except Exception:
+            return
+
+        error = futuro.exception()
+        try:
+            if error is None:
+                if al_terminar:
+                    al_terminar(futuro.result())
+            elif al_fallar:
+                al_fallar(error)
+            else:
+                print(f"Error en consulta en segundo plano: {error}")
+                traceback.print_exception(type(error), error, error.__traceback__)
+        except Exception as e:
+            print(f"Error al entregar resultado: {e}")
+
+
+# ==================== FUNCIONES DE ACCESO RÁPIDO ====================
+
+_trabajador: Optional[TrabajadorDB] = None
+
+
+def obtener_trabajador() -> TrabajadorDB:
+    """
+    Obtiene el trabajador compartido por toda la aplicación
+
+    Uso:
+        from core.worker import obtener_trabajador
+        obtener_trabajador().ejecutar(
+            self.scroll_frame, self.db.obtener_habitaciones,
+            al_terminar=self._mostrar_habitaciones, clave=(id(self), "habitaciones")
+        )
+    """
+    global _trabajador
+    if _trabajador is None:
+        _trabajador = TrabajadorDB()
+    return _trabajador
@@ -0,0 +1,219 @@
+# database/analitica.py
+"""
+Indicadores de ingresos: ocupación, ADR y RevPAR por período y tipo de habitación
+
+Las reservas se expanden en el servidor a una fila por noche
+(generate_series) y se cruzan con el inventario de habitaciones por tipo,
+todo en una sola consulta que devuelve la serie por período y los totales
+del rango (GROUPING SETS). Rangos de varios años responden en milisegundos:
+el costo depende de las noches vendidas, no de filas que viajan al cliente.
+
+- Ocupación = noches vendidas / noches disponibles
+- ADR       = ingresos / noches vendidas
+- RevPAR    = ingresos / noches disponibles
+
+Los días cerrados (anteriores a hoy) se leen del rollup estadisticas_diarias
+(database/rollup.py); solo hoy y las fechas futuras se calculan en vivo. Si
+una reserva de esos días cambió desde la última marca, el rollup se pone al
+día antes de leer. Sin la migración 007 todo se calcula en vivo.
+
+El inventario es el actual (no hay historial de altas y bajas de habitaciones).
+Cuentan las reservas activas y finalizadas; el total de cada reserva se
+reparte por igual entre sus noches.
+
+Uso (medición):
+    python -m database.analitica --desde 2023-01-01 --hasta 2025-12-31 --grano semana
+"""
+
+import argparse
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import List, NamedTuple, Optional
+
+from psycopg2 import errors
+
+from database import rollup
+
+# Granularidad -> unidad de date_trunc
+GRANOS = {
+    "dia": "day",
+    "semana": "week",
+    "mes": "month",
+}
+
+# Noches vendidas en vivo desde %(desde)s hasta %(fin)s
+_SQL_NOCHES_VIVO = """
+SELECT n.dia::date                                                  AS dia,
+       hab.tipo,
+       COUNT(*)                                                     AS vendidas,
+       SUM(r.total / GREATEST(r.fecha_salida - r.fecha_entrada, 1)) AS ingresos
+FROM reservaciones r
+         JOIN habitaciones hab ON hab.id = r.habitacion_id
+         CROSS JOIN LATERAL generate_series(
+        GREATEST(r.fecha_entrada, %(desde)s::date),
+        LEAST(r.fecha_salida - 1, %(fin)s::date),
+        interval '1 day') AS n(dia)
+WHERE r.estado IN ('activa', 'finalizada')
+  AND r.fecha_entrada <= %(fin)s::date
+  AND r.fecha_salida > %(desde)s::date
+GROUP BY 1, 2
+"""
+
+# Días cerrados desde el rollup y el resto en vivo (rangos disjuntos)
+_SQL_NOCHES_ROLLUP = """
+SELECT dia, tipo, noches_vendidas AS vendidas, ingresos
+FROM estadisticas_diarias
+WHERE dia BETWEEN %(inicio)s::date AND %(corte)s::date
+UNION ALL
+""" + _SQL_NOCHES_VIVO
+
+_SQL_INDICADORES = """
+WITH inventario AS (SELECT tipo, COUNT(*) AS habitaciones
+                    FROM habitaciones
+                    GROUP BY tipo),
+     noches AS ({noches}),
+     hechos AS (SELECT date_trunc(%(unidad)s, d.dia)::date AS periodo,
+                       i.tipo,
+                       i.habitaciones                      AS disponibles,
+                       COALESCE(n.vendidas, 0)             AS vendidas,
+                       COALESCE(n.ingresos, 0)             AS ingresos
+                FROM (SELECT g::date AS dia
+                      FROM generate_series(%(inicio)s::date, %(fin)s::date, interval '1 day') g) d
+                         CROSS JOIN inventario i
+                         LEFT JOIN noches n ON n.dia = d.dia AND n.tipo = i.tipo)
+SELECT GROUPING(periodo, tipo)                                AS nivel,
+       periodo,
+       tipo,
+       SUM(disponibles)                                       AS disponibles,
+       SUM(vendidas)                                          AS vendidas,
+       SUM(ingresos)                                          AS ingresos,
+       COALESCE(SUM(vendidas)::numeric / NULLIF(SUM(disponibles), 0), 0) AS ocupacion,
+       COALESCE(SUM(ingresos) / NULLIF(SUM(vendidas), 0), 0)             AS adr,
+       COALESCE(SUM(ingresos) / NULLIF(SUM(disponibles), 0), 0)          AS revpar
+FROM hechos
+GROUP BY GROUPING SETS ((periodo, tipo), (periodo), (tipo), ())
+ORDER BY nivel, periodo, tipo
+"""
+
+# Valores de GROUPING(periodo, tipo) que traen un período
+_NIVELES_SERIE = (0, 1)
+
+
+class Indicador(NamedTuple):
+    """Indicadores de un período (o del rango completo si periodo es None)"""
+    periodo: Optional[date]
+    tipo: Optional[str]  # None = todos los tipos
+    disponibles: int  # Noches-habitación disponibles
+    vendidas: int  # Noches-habitación vendidas
+    ingresos: Decimal
+    ocupacion: Decimal  # 0..1
+    adr: Decimal
+    revpar: Decimal
+
+
+class IndicadoresRango(NamedTuple):
+    """Serie por período y totales del rango, por tipo y generales"""
+    grano: str
+    serie: List[Indicador]
+    totales: List[Indicador]
+
+    def de_tipo(self, tipo: Optional[str] = None):
+        """(serie, total) de un tipo de habitación (None = todos)"""
+        serie = [fila for fila in self.serie if fila.tipo == tipo]
+        total = next((fila for fila in self.totales if fila.tipo == tipo), None)
+        return serie, total
+
+    @property
+    def tipos(self) -> List[str]:
+        return sorted(fila.tipo for fila in self.totales if fila.tipo is not None)
+
+
+def _a_fecha(valor) -> date:
+    return valor if isinstance(valor, date) else date.fromisoformat(str(valor))
+
+
+class ServicioAnalitica:
+    """Consulta de indicadores; los resultados se guardan en la caché de reportes"""
+
+    def __init__(self, db):
+        self.db = db
+        self._usar_rollup = True
+
+    def indicadores(self, fecha_inicio, fecha_fin, grano: str = "mes") -> IndicadoresRango:
+        """Ocupación, ADR y RevPAR de [fecha_inicio, fecha_fin] agrupados por `grano`"""
+        if grano not in GRANOS:
+            raise ValueError(f"Granularidad inválida: {grano}")
+
+        filas = self.db.reportes.obtener(
+            f"indicadores_{grano}", fecha_inicio, fecha_fin,
+            lambda inicio, fin: self._consultar(inicio, fin, GRANOS[grano])
+        )
+
+        serie, totales = [], []
+        for nivel, *valores in filas:
+            (serie if nivel in _NIVELES_SERIE else totales).append(Indicador(*valores))
+        return IndicadoresRango(grano, serie, totales)
+
+    def _consultar(self, fecha_inicio, fecha_fin, unidad):
+        inicio, fin = _a_fecha(fecha_inicio), _a_fecha(fecha_fin)
+        # Último día cerrado dentro del rango
+        corte = min(fin, date.today() - timedelta(days=1))
+        parametros = {"inicio": inicio, "fin": fin, "unidad": unidad, "corte": corte, "desde": inicio}
+
+        if corte >= inicio and self._rollup_listo(inicio, corte):
+            sql = _SQL_INDICADORES.format(noches=_SQL_NOCHES_ROLLUP)
+            parametros["desde"] = corte + timedelta(days=1)
+        else:
+            sql = _SQL_INDICADORES.format(noches=_SQL_NOCHES_VIVO)
+
+        with self.db._cursor() as cur:
+            cur.execute(sql, parametros)
+            return cur.fetchall()
+
+    def _rollup_listo(self, inicio: date, corte: date) -> bool:
+        """True si se puede leer el rollup para [inicio, corte] (lo pone al día si hace falta)"""
+        if not self._usar_rollup:
+            return False
+        try:
+            with self.db._cursor() as cur:
+                estado = rollup.vigente(cur, inicio, corte)
+        except errors.UndefinedTable:
+            # Migración 007 sin aplicar: se calcula en vivo
+            print("Aviso: falta estadisticas_diarias, ejecute python -m database.migrar")
+            self._usar_rollup = False
+            return False
+
+        if estado is None:
+            # Nunca se ejecutó: la primera carga completa es del job (python -m database.rollup)
+            return False
+        if not estado:
+            # Solo se reprocesan los días tocados desde la última marca
+            rollup.actualizar(self.db)
+        return True
+
+
+if __name__ == "__main__":
+    from database.db_manager import DatabaseManager
+
+    parser = argparse.ArgumentParser(description="Indicadores de ingresos")
+    parser.add_argument("--desde", required=True, help="Fecha inicial (YYYY-MM-DD)")
+    parser.add_argument("--hasta", required=True, help="Fecha final (YYYY-MM-DD)")
+    parser.add_argument("--grano", choices=sorted(GRANOS), default="mes")
+    args = parser.parse_args()
+
+    db = DatabaseManager()
+    try:
+        inicio = time.perf_counter()
+        resultado = db.analitica.indicadores(args.desde, args.hasta, args.grano)
+        duracion = time.perf_counter() - inicio
+    finally:
+        db.cerrar()
+
+    serie, total = resultado.de_tipo(None)
+    for fila in serie:
+        print(f"{fila.periodo}  ocupación {fila.ocupacion:6.1%}  ADR ${fila.adr:,.2f}  RevPAR ${fila.revpar:,.2f}")
+    if total:
+        print(f"\nRango: ocupación {total.ocupacion:.1%}  ADR ${total.adr:,.2f}  "
+              f"RevPAR ${total.revpar:,.2f}  ingresos ${total.ingresos:,.2f}")
+    print(f"{len(resultado.serie) + len(resultado.totales)} filas en {duracion * 1000:.0f} ms")
@@ -0,0 +1,147 @@
+# database/benchmark_modelos.py
+"""
+Memoria y tiempo de decodificación de filas: tuplas vs modelos
+
+Trae N filas con la forma de models.reserva.Reserva (generadas con
+generate_series, no toca tablas) y compara cuatro formas de leerlas:
+
+- tuplas:          cur.fetchall() tal cual (lo que hacían las pantallas)
+- modelos:         models.filas.leer_filas (fetchmany por lotes + NamedTuple._make)
+- NamedTupleCursor de psycopg2.extras
+- RealDictCursor   (un dict por fila)
+
+Para cada una mide el tiempo de fetch + conversión, la memoria que retiene
+el resultado y el pico durante la lectura (tracemalloc), y el tiempo de
+leer tres campos de cada fila.
+
+Uso:
+    python -m database.benchmark_modelos --dsn "dbname=hotel_bench" --filas 200000
+"""
+
+import argparse
+import gc
+import os
+import time
+import tracemalloc
+
+import psycopg2
+from psycopg2.extras import NamedTupleCursor, RealDictCursor
+
+from models.filas import leer_filas
+from models.reserva import Reserva
+
+FILAS_SQL = """
+SELECT g                                  AS id,
+       g %% 5000                           AS huesped_id,
+       'Huésped ' || g                    AS huesped_nombre,
+       g %% 200                            AS habitacion_id,
+       (100 + g %% 200)::text              AS numero,
+       'Doble'                            AS tipo,
+       date '2024-01-01' + g %% 700        AS fecha_entrada,
+       date '2024-01-03' + g %% 700        AS fecha_salida,
+       'activa'                           AS estado,
+       (g %% 900 + 100)::numeric           AS total
+FROM generate_series(1, %s) g
+"""
+
+
+def _leer_tuplas(conn, filas):
+    with conn.cursor() as cur:
+        cur.execute(FILAS_SQL, (filas,))
+        return cur.fetchall()
+
+
+def _leer_modelos(conn, filas):
+    with conn.cursor() as cur:
+        cur.execute(FILAS_SQL, (filas,))
+        return leer_filas(cur, Reserva)
+
+
+def _leer_namedtuple_cursor(conn, filas):
+    with conn.cursor(cursor_factory=NamedTupleCursor) as cur:
+        cur.execute(FILAS_SQL, (filas,))
+        return cur.fetchall()
+
+
+def _leer_dicts(conn, filas):
+    with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        cur.execute(FILAS_SQL, (filas,))
+        return cur.fetchall()
+
+
+# Lectura de tres campos por fila, como al pintar una tarjeta
+def _acceso_posicional(resultado):
+    for fila in resultado:
+        fila[0], fila[2], fila[8]
+
+
+def _acceso_atributos(resultado):
+    for fila in resultado:
+        fila.id, fila.huesped_nombre, fila.estado
+
+
+def _acceso_claves(resultado):
+    for fila in resultado:
+        fila['id'], fila['huesped_nombre'], fila['estado']
+
+
+VARIANTES = [
+    ("tuplas", _leer_tuplas, _acceso_posicional),
+    ("modelos", _leer_modelos, _acceso_atributos),
+    ("NamedTupleCursor", _leer_namedtuple_cursor, _acceso_atributos),
+    ("RealDictCursor", _leer_dicts, _acceso_claves),
+]
+
+
+def medir(conn, filas, leer, acceder, repeticiones):
+    """(mejor tiempo de lectura, memoria retenida, pico de memoria, mejor tiempo de acceso)"""
+    mejor_lectura = mejor_acceso = float("inf")
+    for _ in range(repeticiones):
+        gc.collect()
+        inicio = time.perf_counter()
+        resultado = leer(conn, filas)
+        mejor_lectura = min(mejor_lectura, time.perf_counter() - inicio)
+
+        inicio = time.perf_counter()
+        acceder(resultado)
+        mejor_acceso = min(mejor_acceso, time.perf_counter() - inicio)
+        del resultado
+
+    # La memoria se mide aparte: tracemalloc hace más lenta la lectura
+    gc.collect()
+    tracemalloc.start()
+    resultado = leer(conn, filas)
+    memoria, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del resultado
+    return mejor_lectura, memoria, pico, mejor_acceso
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tuplas vs modelos al leer filas")
+    parser.add_argument("--dsn", default=os.getenv("BENCH_DSN", "dbname=hotel_bench"),
+                        help="Conexión a PostgreSQL (o BENCH_DSN); no crea ni modifica tablas")
+    parser.add_argument("--filas", type=int, default=200_000)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(args.dsn)
+    try:
+        # Calentar la conexión y los planes
+        _leer_tuplas(conn, 1000)
+
+        print(f"{args.filas:,} filas, mejor de {args.repeticiones}\n")
+        print(f"{'variante':<18}{'lectura':>12}{'memoria':>12}{'pico':>12}{'por fila':>10}{'acceso':>11}")
+        base = None
+        for nombre, leer, acceder in VARIANTES:
+            lectura, memoria, pico, acceso = medir(conn, args.filas, leer, acceder, args.repeticiones)
+            base = base or lectura
+            print(f"{nombre:<18}{lectura * 1000:>9.0f} ms{memoria / 1024 / 1024:>9.1f} MB"
+                  f"{pico / 1024 / 1024:>9.1f} MB{memoria / args.filas:>8.0f} B{acceso * 1000:>8.1f} ms"
+                  f"   ({lectura / base:.2f}x)")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+# database/benchmark_reservas.py
+"""
+Prueba de estrés de reservar_habitacion contra un PostgreSQL local
+
+Lanza muchos hilos reservando habitaciones al azar en fechas que se
+solapan, mide el throughput y verifica al final que no quedó ninguna
+pareja de reservas activas solapadas.
+
+Uso:
+    python -m database.benchmark_reservas --dsn "dbname=hotel_bench" --hilos 16
+    python -m database.benchmark_reservas --sin-restriccion   (solo el bloqueo FOR UPDATE)
+
+Trabaja en un esquema propio (bench_reservas) que se borra al terminar.
+"""
+
+import argparse
+import os
+import random
+import threading
+import time
+from collections import Counter
+from datetime import date, timedelta
+
+import psycopg2
+
+from database.db_manager import DatabaseManager
+
+ESQUEMA = "bench_reservas"
+
+ESQUEMA_SQL = f"""
+DROP SCHEMA IF EXISTS {ESQUEMA} CASCADE;
+CREATE SCHEMA {ESQUEMA};
+SET search_path = {ESQUEMA}, public;
+
+CREATE TABLE habitaciones
+(
+    id     SERIAL PRIMARY KEY,
+    numero TEXT    NOT NULL UNIQUE,
+    tipo   TEXT    NOT NULL,
+    precio NUMERIC NOT NULL,
+    estado TEXT    NOT NULL DEFAULT 'disponible'
+);
+
+CREATE TABLE huespedes
+(
+    id       SERIAL PRIMARY KEY,
+    nombre   TEXT NOT NULL,
+    apellido TEXT NOT NULL,
+    telefono TEXT,
+    password TEXT,
+    email    TEXT
+);
+
+CREATE TABLE reservaciones
+(
+    id            SERIAL PRIMARY KEY,
+    huesped_id    INTEGER NOT NULL REFERENCES huespedes (id),
+    habitacion_id INTEGER NOT NULL REFERENCES habitaciones (id),
+    fecha_entrada DATE    NOT NULL,
+    fecha_salida  DATE    NOT NULL,
+    total         NUMERIC NOT NULL,
+    estado        TEXT    NOT NULL
+);
+
+CREATE TABLE eventos
+(
+    id            BIGSERIAL PRIMARY KEY,
+    creado_en     TIMESTAMPTZ NOT NULL DEFAULT now(),
+    tipo          TEXT        NOT NULL,
+    habitacion_id INTEGER,
+    reserva_id    INTEGER,
+    detalle       TEXT
+);
+"""
+
+RESTRICCION_SQL = """
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+ALTER TABLE reservaciones
+    ADD CONSTRAINT reservaciones_sin_solape
+        EXCLUDE USING gist (
+        habitacion_id WITH =,
+        daterange(fecha_entrada, fecha_salida, '[)') WITH &&
+        ) WHERE (estado = 'activa');
+"""
+
+SOLAPES_SQL = """
+SELECT COUNT(*)
+FROM reservaciones a
+         JOIN reservaciones b
+              ON a.habitacion_id = b.habitacion_id
+                  AND a.id < b.id
+                  AND a.fecha_entrada < b.fecha_salida
+                  AND b.fecha_entrada < a.fecha_salida
+WHERE a.estado = 'activa'
+  AND b.estado = 'activa'
+"""
+
+
+def preparar(dsn, habitaciones, con_restriccion):
+    """Crea el esquema de prueba con habitaciones y un huésped"""
+    conn = psycopg2.connect(dsn)
+    try:
+        with conn, conn.cursor() as cur:
+            cur.execute(ESQUEMA_SQL)
+            if con_restriccion:
+                cur.execute(RESTRICCION_SQL)
+            cur.executemany(
+                "INSERT INTO habitaciones (numero, tipo, precio) VALUES (%s, 'Doble', 800)",
+                [(str(100 + i),) for i in range(habitaciones)]
+            )
+            cur.execute("""
+                        INSERT INTO huespedes (nombre, apellido, telefono)
+                        VALUES ('Bench', 'Mark', '0000000000')
+                        RETURNING id
+                        """)
+            huesped_id = cur.fetchone()[0]
+            cur.execute("SELECT id FROM habitaciones")
+            ids = [fila[0] for fila in cur.fetchall()]
+    finally:
+        conn.close()
+    return huesped_id, ids
+
+
+def limpiar(dsn):
+    conn = psycopg2.connect(dsn)
+    try:
+        with conn, conn.cursor() as cur:
+            cur.execute(f"DROP SCHEMA IF EXISTS {ESQUEMA} CASCADE")
+    finally:
+        conn.close()
+
+
+def contar_solapes(dsn):
+    conn = psycopg2.connect(dsn, options=f"-c search_path={ESQUEMA}")
+    try:
+        with conn.cursor() as cur:
+            cur.execute(SOLAPES_SQL)
+            solapes = cur.fetchone()[0]
+            cur.execute("SELECT COUNT(*) FROM reservaciones WHERE estado = 'activa'")
+            activas = cur.fetchone()[0]
+    finally:
+        conn.close()
+    return solapes, activas
+
+
+def trabajador(db, huesped_id, habitaciones, intentos, dias, semilla, resultados, latencias, barrera):
+    """Un hilo: reserva `intentos` veces en habitaciones y fechas al azar"""
+    rnd = random.Random(semilla)
+    inicio_rango = date.today() + timedelta(days=1)
+    conteo = Counter()
+    tiempos = []
+
+    barrera.wait()
+    for _ in range(intentos):
+        entrada = inicio_rango + timedelta(days=rnd.randrange(dias))
+        salida = entrada + timedelta(days=rnd.randint(1, 5))
+        inicio = time.perf_counter()
+        resultado = db.reservar_habitacion(
+            huesped_id, rnd.choice(habitaciones), entrada, salida, 800
+        )
+        tiempos.append(time.perf_counter() - inicio)
+        conteo[resultado.estado] += 1
+
+    resultados.append(conteo)
+    latencias.extend(tiempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Estrés de reservas concurrentes")
+    parser.add_argument("--dsn", default=os.getenv("BENCH_DSN", "dbname=hotel_bench"),
+                        help="Conexión a PostgreSQL local (o BENCH_DSN)")
+    parser.add_argument("--hilos", type=int, default=16)
+    parser.add_argument("--intentos", type=int, default=200, help="Reservas por hilo")
+    parser.add_argument("--habitaciones", type=int, default=10)
+    parser.add_argument("--dias", type=int, default=60, help="Ventana de fechas de entrada")
+    parser.add_argument("--sin-restriccion", action="store_true",
+                        help="No crear la restricción de exclusión (prueba solo FOR UPDATE)")
+    parser.add_argument("--conservar", action="store_true", help="No borrar el esquema al terminar")
+    args = parser.parse_args()
+
+    print(f"Preparando esquema {ESQUEMA}...")
+    huesped_id, habitaciones = preparar(args.dsn, args.habitaciones, not args.sin_restriccion)
+
+    os.environ["DB_POOL_MIN"] = "1"
+    os.environ["DB_POOL_MAX"] = str(args.hilos)
+    db = DatabaseManager(
+        crear=lambda: psycopg2.connect(args.dsn, options=f"-c search_path={ESQUEMA}")
+    )
+
+    resultados, latencias = [], []
+    barrera = threading.Barrier(args.hilos + 1)
+    hilos = [
+        threading.Thread(
+            target=trabajador,
+            args=(db, huesped_id, habitaciones, args.intentos, args.dias, i,
+                  resultados, latencias, barrera)
+        )
+        for i in range(args.hilos)
+    ]
+
+    try:
+        for hilo in hilos:
+            hilo.start()
+        barrera.wait()
+        inicio = time.perf_counter()
+        for hilo in hilos:
+            hilo.join()
+        duracion = time.perf_counter() - inicio
+
+        total = sum(resultados, Counter())
+        intentos = sum(total.values())
+        latencias.sort()
+        solapes, activas = contar_solapes(args.dsn)
+
+        print(f"\nHilos: {args.hilos}  Habitaciones: {args.habitaciones}  "
+              f"Restricción: {'no' if args.sin_restriccion else 'sí'}")
+        print(f"Intentos: {intentos} en {duracion:.2f}s  ->  {intentos / duracion:,.0f} reservas/s")
+        for estado, cantidad in sorted(total.items()):
+            print(f"  {estado:15s} {cantidad}")
+        print(f"Latencia p50: {latencias[len(latencias) // 2] * 1000:.1f} ms  "
+              f"p99: {latencias[int(len(latencias) * 0.99)] * 1000:.1f} ms")
+        print(f"Reservas activas: {activas}  Solapes: {solapes}")
+        print("✓ Sin solapes" if solapes == 0 else "✗ SE ENCONTRARON SOLAPES")
+    finally:
+        db.cerrar()
+        if not args.conservar:
+            limpiar(args.dsn)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+# database/cache_reportes.py
+"""
+Caché de reportes por rango de fechas
+Guarda el resultado de cada reporte por (tipo, fecha_inicio, fecha_fin) con
+desalojo LRU y un presupuesto de memoria. Una entrada se descarta cuando
+se crea, finaliza o cancela una reserva cuyas fechas tocan su rango
+(DatabaseManager avisa con suscribir_reservas).
+
+Las filas también llevan número y tipo de habitación, nombres de huéspedes
+y el inventario por tipo: si cambian habitaciones o huéspedes (no solo el
+estado de una habitación) se vacía toda la caché (suscribir_cambios).
+
+Los rangos históricos no vencen. Los que llegan a hoy vencen tras
+TTL_RANGO_ACTUAL para ver también lo que escriben otras terminales.
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Callable, Iterable, NamedTuple, Optional
+
+# Memoria máxima aproximada de todas las entradas
+PRESUPUESTO_REPORTES = 32 * 1024 * 1024
+
+# Segundos que vive una entrada cuyo rango incluye hoy o fechas futuras
+TTL_RANGO_ACTUAL = 120.0
+
+# Tablas cuyos datos aparecen en cualquier rango
+TABLAS_DESCRIPTIVAS = ("habitaciones", "huespedes")
+
+
+class _Entrada(NamedTuple):
+    filas: list
+    tamano: int
+    inicio: date
+    fin: date
+    expira: Optional[float]
+
+
+def _tamano_fila(fila) -> int:
+    """Tamaño aproximado en bytes de una fila (tupla y sus valores)"""
+    return sys.getsizeof(fila) + sum(sys.getsizeof(valor) for valor in fila)
+
+
+def _a_fecha(valor) -> date:
+    return valor if isinstance(valor, date) else date.fromisoformat(str(valor))
+
+
+class CacheReportes:
+    """Caché LRU de reportes invalidada por solape de fechas"""
+
+    def __init__(self, db, presupuesto: int = PRESUPUESTO_REPORTES, ttl_actual: float = TTL_RANGO_ACTUAL):
+        self.presupuesto = presupuesto
+        self.ttl_actual = ttl_actual
+        self._lock = threading.Lock()
+        self._entradas: "OrderedDict[tuple, _Entrada]" = OrderedDict()
+        self._tamano = 0
+        self._generacion = 0
+
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self.invalidaciones = 0
+
+        db.suscribir_reservas(self.invalidar_rango)
+        db.suscribir_cambios(self._al_cambiar)
+
+    # ==================== API ====================
+
+    def obtener(self, tipo: str, fecha_inicio, fecha_fin, consultar: Callable) -> list:
+        """Filas del reporte desde la caché o, si no están, desde consultar(inicio, fin)"""
+        return list(self.iterar(tipo, fecha_inicio, fecha_fin, consultar))
+
+    def iterar(self, tipo: str, fecha_inicio, fecha_fin, iterar: Callable[..., Iterable]):
+        """
+        Entrega las filas del reporte a medida que llegan
+
+        Si no está en caché, las filas vienen de iterar(inicio, fin) y se
+        guardan al terminar (salvo que superen el presupuesto o que una
+        reserva del rango haya cambiado mientras tanto).
+        """
+        clave = (tipo, str(fecha_inicio), str(fecha_fin))
+        filas = self._buscar(clave)
+        if filas is not None:
+            yield from filas
+            return
+
+        with self._lock:
+            generacion = self._generacion
+
+        acumuladas = []
+        tamano = sys.getsizeof(acumuladas)
+        for fila in iterar(fecha_inicio, fecha_fin):
+            if acumuladas is not None:
+                acumuladas.append(fila)
+                tamano += _tamano_fila(fila)
+                if tamano > self.presupuesto:
+                    acumuladas = None  # No entraría: se deja de acumular
+            yield fila
+
+        if acumuladas is not None:
+            self._guardar(clave, acumuladas, tamano, generacion)
+
+    def invalidar_rango(self, fecha_entrada, fecha_salida):
+        """Descarta los reportes cuyo rango se cruza con [entrada, salida]"""
+        entrada, salida = _a_fecha(fecha_entrada), _a_fecha(fecha_salida)
+        with self._lock:
+            self._generacion += 1
+            for clave, entrada_cache in list(self._entradas.items()):
+                if entrada_cache.inicio <= salida and entrada <= entrada_cache.fin:
+                    self._quitar(clave)
+                    self.invalidaciones += 1
+
+    def limpiar(self):
+        """Vacía la caché"""
+        with self._lock:
+            self._generacion += 1
+            self._entradas.clear()
+            self._tamano = 0
+
+    def estadisticas(self) -> dict:
+        """Aciertos, fallos y ocupación de la caché"""
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+                'tasa_aciertos': self.aciertos / consultas if consultas else 0.0,
+                'desalojos': self.desalojos,
+                'invalidaciones': self.invalidaciones,
+                'entradas': len(self._entradas),
+                'bytes': self._tamano,
+                'presupuesto': self.presupuesto,
+            }
+
+    # ==================== INTERNOS ====================
+
+    def _al_cambiar(self, tablas):
+        """
+        Vacía la caché si cambió una habitación o un huésped. Los cambios de
+        estado de una habitación se registran junto con `eventos` y no
+        tocan los reportes (las reservas ya avisan por rango).
+        """
+        if "eventos" in tablas and "huespedes" not in tablas:
+            return
+        if any(tabla in TABLAS_DESCRIPTIVAS for tabla in tablas):
+            self.limpiar()
+
+    def _buscar(self, clave) -> Optional[list]:
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is not None and entrada.expira is not None and time.monotonic() >= entrada.expira:
+                self._quitar(clave)
+                entrada = None
+
+            if entrada is None:
+                self.fallos += 1
+                return None
+
+            self._entradas.move_to_end(clave)
+            self.aciertos += 1
+            return entrada.filas
+
+    def _guardar(self, clave, filas: list, tamano: int, generacion: int):
+        inicio, fin = _a_fecha(clave[1]), _a_fecha(clave[2])
+        # Un rango que llega a hoy puede cambiar desde otra terminal
+        expira = time.monotonic() + self.ttl_actual if fin >= date.today() else None
+
+        with self._lock:
+            # Una reserva cambió durante la consulta: el resultado puede estar viejo
+            if generacion != self._generacion:
+                return
+            if clave in self._entradas:
+                self._quitar(clave)
+
+            self._entradas[clave] = _Entrada(filas, tamano, inicio, fin, expira)
+            self._tamano += tamano
+
+            while self._tamano > self.presupuesto and len(self._entradas) > 1:
+                self._quitar(next(iter(self._entradas)))
+                self.desalojos += 1
+
+    def _quitar(self, clave):
+        entrada = self._entradas.pop(clave)
+        self._tamano -= entrada.tamano
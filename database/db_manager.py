@@ -1,70 +1,448 @@
 # database/db_manager.py
 import psycopg2
 import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import List, NamedTuple, Optional, Tuple
 from dotenv import load_dotenv
 from psycopg2 import errors
-import bcrypt
+from database import eventos, seguridad
+from database.analitica import ServicioAnalitica
+from database.cache_reportes import CacheReportes
+from database.disponibilidad import MotorDisponibilidad
+from database.estadisticas import ServicioEstadisticas
+from database.instrumentacion import CursorInstrumentado, metodo_llamador, obtener_instrumentacion
+from database.notificaciones import EscuchaCambios
+from database.pool import PoolConexiones
+from models.empleado import Empleado
+from models.filas import columnas, leer_fila, leer_filas
+from models.habitacion import Habitacion, HabitacionLibre
+from models.huesped import Huesped, HuespedEncontrado
+from models.reserva import Reserva
+from utils.indice_busqueda import digitos_telefono
 
 load_dotenv()
 
 
+# Privilegio que se asume cuando el empleado no tiene uno asignado
+PRIVILEGIO_POR_DEFECTO = "Administrador"
+
+# obtener_cambios_desde repite también los últimos minutos antes de la
+# marca: una transacción larga puede confirmar con un actualizado_en anterior
+MARGEN_CAMBIOS_MINUTOS = 10
+
+# Filas que trae cada viaje de un cursor del lado del servidor
+ITERSIZE_REPORTES = int(os.getenv("DB_ITERSIZE", 2000))
+
+
+class ResultadoLogin(NamedTuple):
+    """Empleado autenticado con los datos que necesita la sesión"""
+    id: int
+    nombre: str
+    apellido: str
+    puesto: str
+    privilegio: str
+
+
+# Resultados posibles de reservar_habitacion
+RESERVA_CREADA = "creada"
+RESERVA_CONFLICTO = "conflicto"
+RESERVA_NO_DISPONIBLE = "no_disponible"
+RESERVA_ERROR = "error"
+
+
+class ResultadoReserva(NamedTuple):
+    """Resultado de reservar_habitacion"""
+    estado: str
+    reserva_id: Optional[int] = None
+    mensaje: str = ''
+
+    @property
+    def exito(self) -> bool:
+        return self.estado == RESERVA_CREADA
+
+
+class FilaResumen(NamedTuple):
+    """Totales de un grupo de reservas"""
+    etiqueta: str
+    reservas: int
+    noches: int
+    total: Decimal
+
+
+class ResumenReservas(NamedTuple):
+    """Totales del reporte de reservas: por mes, por estado y la fila de pie"""
+    por_mes: List[FilaResumen]
+    por_estado: List[FilaResumen]
+    total: FilaResumen
+
+
+class PaginaReservas(NamedTuple):
+    """Página de reservas y cursor (fecha_entrada, id) para pedir la siguiente"""
+    filas: List[Reserva]
+    siguiente: Optional[Tuple]
+
+
+class CambiosTabla(NamedTuple):
+    """Filas nuevas o modificadas, ids borrados y marca para la próxima llamada"""
+    filas: List
+    eliminados: List[int]
+    marca: datetime
+    completa: bool  # True si se pidió sin marca (la tabla entera)
+
+
+# Consultas de reportes (compartidas por la versión con fetchall y la de streaming)
+_SQL_REPORTE_RESERVAS = """
+SELECT r.id,
+       h.nombre || ' ' || h.apellido              AS huesped,
+       hab.numero,
+       r.fecha_entrada,
+       r.fecha_salida,
+       r.fecha_salida - r.fecha_entrada            AS dias,
+       r.total,
+       to_char(r.total, 'FM$999,999,999,990.00') AS total_texto,
+       upper(r.estado)                             AS estado
+FROM reservaciones r
+         JOIN huespedes h ON r.huesped_id = h.id
+         JOIN habitaciones hab ON r.habitacion_id = hab.id
+WHERE r.fecha_entrada >= %s
+  AND r.fecha_entrada <= %s
+ORDER BY r.fecha_entrada DESC
+"""
+
+# Totales por mes de entrada, por estado y general (una sola pasada)
+_SQL_RESUMEN_RESERVAS = """
+SELECT GROUPING(date_trunc('month', r.fecha_entrada), r.estado) AS nivel,
+       date_trunc('month', r.fecha_entrada)::date               AS mes,
+       upper(r.estado)                                          AS estado,
+       COUNT(*)                                                 AS reservas,
+       COALESCE(SUM(r.fecha_salida - r.fecha_entrada), 0)       AS noches,
+       COALESCE(SUM(r.total), 0)                                AS total
+FROM reservaciones r
+WHERE r.fecha_entrada >= %s
+  AND r.fecha_entrada <= %s
+GROUP BY GROUPING SETS ((date_trunc('month', r.fecha_entrada)), (r.estado), ())
+ORDER BY nivel, mes, estado
+"""
+
+# Valores de GROUPING(mes, estado) en _SQL_RESUMEN_RESERVAS
+_NIVEL_MES = 1
+_NIVEL_ESTADO = 2
+_NIVEL_TOTAL = 3
+
+_SQL_REPORTE_HABITACIONES = """
+-- Eventos de check-in (ocupación)
+SELECT hab.numero,
+       hab.tipo,
+       'Check-in / Ocupación'        as evento,
+       r.fecha_entrada               as fecha,
+       h.nombre || ' ' || h.apellido as huesped,
+       'Entrada del huésped'         as detalles
+FROM reservaciones r
+         JOIN habitaciones hab ON r.habitacion_id = hab.id
+         JOIN huespedes h ON r.huesped_id = h.id
+WHERE r.fecha_entrada >= %s
+  AND r.fecha_entrada <= %s
+
+UNION ALL
+
+-- Eventos de check-out (salida)
+SELECT hab.numero,
+       hab.tipo,
+       'Check-out / Limpieza'                       as evento,
+       r.fecha_salida                               as fecha,
+       h.nombre || ' ' || h.apellido                as huesped,
+       'Salida del huésped - Habitación a limpieza' as detalles
+FROM reservaciones r
+         JOIN habitaciones hab ON r.habitacion_id = hab.id
+         JOIN huespedes h ON r.huesped_id = h.id
+WHERE r.fecha_salida >= %s
+  AND r.fecha_salida <= %s
+  AND r.estado = 'finalizada'
+
+ORDER BY fecha DESC, numero
+"""
+
+# Búsqueda de huéspedes (migraciones/008): fragmento en cualquier parte o
+# palabras parecidas (errores de tipeo). Primero coincidencias exactas de
+# teléfono/email, luego comienzos de palabra y después por similitud.
+_SQL_BUSCAR_HUESPEDES = """
+SELECT id, nombre, apellido, telefono, email
+FROM huespedes
+WHERE huesped_texto_busqueda(nombre, apellido, telefono, email) LIKE %(contiene)s
+   OR %(texto)s <%% huesped_texto_busqueda(nombre, apellido, telefono, email)
+ORDER BY (lower(telefono) = %(texto)s OR lower(email) = %(texto)s) IS TRUE DESC,
+         ' ' || huesped_texto_busqueda(nombre, apellido, telefono, email) LIKE %(palabra)s DESC,
+         word_similarity(%(texto)s, huesped_texto_busqueda(nombre, apellido, telefono, email)) DESC,
+         apellido, nombre
+LIMIT %(limite)s
+"""
+
+# Sin pg_trgm: solo fragmentos, recorriendo la tabla
+_SQL_BUSCAR_HUESPEDES_SIN_INDICE = """
+SELECT id, nombre, apellido, telefono, email
+FROM huespedes
+WHERE lower(nombre || ' ' || apellido || ' ' || coalesce(email, '') || ' ' || coalesce(telefono, ''))
+          LIKE %(contiene)s
+ORDER BY (lower(telefono) = %(texto)s OR lower(email) = %(texto)s) IS TRUE DESC,
+         apellido, nombre
+LIMIT %(limite)s
+"""
+
+# Resultados que devuelve buscar_huespedes si no se indica otro límite
+LIMITE_BUSQUEDA_HUESPEDES = 50
+
+# Columnas de models.reserva.Reserva, en el mismo orden
+_SELECT_RESERVAS = """
+SELECT r.id,
+       r.huesped_id,
+       h.nombre || ' ' || h.apellido AS huesped_nombre,
+       r.habitacion_id,
+       hab.numero,
+       hab.tipo,
+       r.fecha_entrada,
+       r.fecha_salida,
+       r.estado,
+       r.total
+FROM reservaciones r
+         JOIN huespedes h ON r.huesped_id = h.id
+         JOIN habitaciones hab ON r.habitacion_id = hab.id
+"""
+
+
+# Tablas que acepta obtener_cambios_desde: modelo, SELECT y condición de
+# "cambió desde %(desde)s". Las reservas cambian también si se renombra al
+# huésped o se renumera la habitación (columnas que vienen del JOIN).
+_TABLAS_SINCRONIZABLES = {
+    "habitaciones": (
+        Habitacion,
+        f"SELECT {columnas(Habitacion)} FROM habitaciones",
+        "actualizado_en >= %(desde)s",
+    ),
+    "empleados": (
+        Empleado,
+        f"SELECT {columnas(Empleado)} FROM empleados",
+        "actualizado_en >= %(desde)s",
+    ),
+    "huespedes": (
+        Huesped,
+        f"SELECT {columnas(Huesped)} FROM huespedes",
+        "actualizado_en >= %(desde)s",
+    ),
+    "reservaciones": (
+        Reserva,
+        _SELECT_RESERVAS,
+        "(r.actualizado_en >= %(desde)s OR h.actualizado_en >= %(desde)s"
+        " OR hab.actualizado_en >= %(desde)s)",
+    ),
+}
+
+
+def crear_conexion():
+    """Abre una conexión nueva a Supabase con los datos del entorno"""
+    return psycopg2.connect(
+        host=os.getenv("DB_HOST"),
+        dbname=os.getenv("DB_NAME"),
+        user=os.getenv("DB_USER"),
+        password=os.getenv("DB_PASSWORD"),
+        port=int(os.getenv("DB_PORT", 5432)),
+        sslmode="require",
+        keepalives=1,
+        keepalives_idle=60
+    )
+
+
 class DatabaseManager:
-    def __init__(self):
+    def __init__(self, crear=crear_conexion):
+        """
+        Args:
+            crear: Función que abre una conexión nueva (por defecto la de
+                Supabase; los benchmarks pasan una a PostgreSQL local)
+        """
+        # Backends del pool: sus avisos de cambios no vienen de otra terminal
+        self._pids_propios = set()
+
+        def crear_propia():
+            conn = crear()
+            self._pids_propios.add(conn.get_backend_pid())
+            return conn
+
         try:
-            self.conn = psycopg2.connect(
-                host=os.getenv("DB_HOST"),
-                dbname=os.getenv("DB_NAME"),
-                user=os.getenv("DB_USER"),
-                password=os.getenv("DB_PASSWORD"),
-                port=int(os.getenv("DB_PORT", 5432)),
-                sslmode="require"
+            self.pool = PoolConexiones(
+                crear_propia,
+                minimo=int(os.getenv("DB_POOL_MIN", 1)),
+                maximo=int(os.getenv("DB_POOL_MAX", 5)),
+                max_inactividad=float(os.getenv("DB_POOL_MAX_INACTIVIDAD", 300))
             )
-            self.cursor = self.conn.cursor()
             print("✓ Conexión exitosa a Supabase PostgreSQL")
+
+            # Versión por tabla: se incrementa en cada escritura confirmada
+            # para que las vistas sepan si sus datos cambiaron
+            self._versiones = {}
+            self._lock_versiones = threading.Lock()
+            self._suscriptores = []
+            self._suscriptores_reservas = []
+
+            self.estadisticas = ServicioEstadisticas(self)
+            self.disponibilidad = MotorDisponibilidad(self)
+            self.reportes = CacheReportes(self)
+            self.analitica = ServicioAnalitica(self)
+            # Con conexión propia fuera del pool; la sesión la inicia
+            self.notificaciones = EscuchaCambios(self, crear)
+            self._busqueda_trgm = True
+            self._cambios_incrementales = True
         except Exception as e:
             print(f"✗ Error de conexión: {e}")
             raise
 
+    @contextmanager
+    def _cursor(self, cambia=()):
+        """
+        Presta una conexión del pool y un cursor de vida corta.
+        Confirma la transacción al salir o la revierte si hubo una excepción.
+
+        Args:
+            cambia: Tablas que modifica la transacción; su versión se
+                incrementa solo si el commit tuvo éxito
+        """
+        conn = self.pool.obtener()
+        roto = False
+        try:
+            with self._nuevo_cursor(conn) as cur:
+                yield cur
+            conn.commit()
+            if cambia:
+                self._registrar_cambio(*cambia)
+        except Exception as e:
+            roto = isinstance(e, (psycopg2.OperationalError, psycopg2.InterfaceError))
+            try:
+                conn.rollback()
+            except psycopg2.Error:
+                roto = True
+            raise
+        finally:
+            self.pool.devolver(conn, descartar=roto)
+
+    @contextmanager
+    def _cursor_servidor(self, nombre, itersize=None, metodo=None):
+        """
+        Cursor con nombre (del lado del servidor): al iterarlo las filas se
+        traen de a `itersize`, sin materializar el resultado completo.
+        La conexión queda prestada hasta que se termina (o abandona) la iteración.
+
+        Args:
+            metodo: Método público con el que se mide la consulta; hace falta
+                desde generadores, que se abren cuando ese método ya volvió
+        """
+        conn = self.pool.obtener()
+        roto = False
+        try:
+            with self._nuevo_cursor(conn, nombre, metodo) as cur:
+                cur.itersize = itersize or ITERSIZE_REPORTES
+                yield cur
+            conn.commit()
+        except BaseException as e:
+            # También GeneratorExit: el consumidor dejó de iterar antes del final
+            roto = isinstance(e, (psycopg2.OperationalError, psycopg2.InterfaceError))
+            try:
+                conn.rollback()
+            except psycopg2.Error:
+                roto = True
+            raise
+        finally:
+            self.pool.devolver(conn, descartar=roto)
+
+    @staticmethod
+    def _nuevo_cursor(conn, nombre=None, metodo=None):
+        """Cursor medido (ver database/instrumentacion.py) salvo con DB_INSTRUMENTAR=0"""
+        if not obtener_instrumentacion().activa:
+            return conn.cursor(name=nombre)
+        cur = conn.cursor(name=nombre, cursor_factory=CursorInstrumentado)
+        # _nuevo_cursor <- _cursor <- contextlib <- quien pidió el cursor
+        cur.metodo = metodo or metodo_llamador(3)
+        return cur
+
+    def _registrar_cambio(self, *tablas):
+        """Marca las tablas como modificadas y avisa a los suscriptores"""
+        with self._lock_versiones:
+            for tabla in tablas:
+                self._versiones[tabla] = self._versiones.get(tabla, 0) + 1
+            suscriptores = list(self._suscriptores)
+
+        for funcion in suscriptores:
+            try:
+                funcion(tablas)
+            except Exception as e:
+                print(f"Error al notificar cambio: {e}")
+
+    def suscribir_cambios(self, funcion):
+        """Registra funcion(tablas) para cada escritura confirmada (se llama en el hilo que escribió)"""
+        with self._lock_versiones:
+            self._suscriptores.append(funcion)
+
+    def suscribir_reservas(self, funcion):
+        """Registra funcion(fecha_entrada, fecha_salida) tras crear, finalizar o cancelar una reserva"""
+        with self._lock_versiones:
+            self._suscriptores_reservas.append(funcion)
+
+    def _registrar_cambio_reserva(self, fecha_entrada, fecha_salida):
+        """Avisa qué fechas tocó una reserva confirmada"""
+        with self._lock_versiones:
+            suscriptores = list(self._suscriptores_reservas)
+
+        for funcion in suscriptores:
+            try:
+                funcion(fecha_entrada, fecha_salida)
+            except Exception as e:
+                print(f"Error al notificar cambio de reserva: {e}")
+
+    def es_conexion_propia(self, pid) -> bool:
+        """True si el backend `pid` es una conexión de este pool"""
+        return pid in self._pids_propios
+
+    def version_datos(self, *tablas):
+        """Versión actual de las tablas indicadas (cambia tras cada escritura)"""
+        with self._lock_versiones:
+            return tuple(self._versiones.get(tabla, 0) for tabla in tablas)
+
     # ==================== UTILIDADES DE SEGURIDAD ====================
 
+    # Lentas a propósito (bcrypt): llamarlas desde el trabajador, no desde Tk
+
     @staticmethod
     def hashear_password(password):
-        """Hashea una contraseña usando bcrypt"""
-        if not password:
-            return ''
-        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        """Hashea una contraseña usando bcrypt con el costo configurado"""
+        return seguridad.hashear_password(password)
 
     @staticmethod
     def verificar_password(password, password_hash):
         """Verifica si una contraseña coincide con su hash"""
-        if not password or not password_hash:
-            return False
-        try:
-            return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
-        except Exception as e:
-            print(f"Error al verificar contraseña: {e}")
-            return False
+        return seguridad.verificar_password(password, password_hash)
 
     # ==================== HABITACIONES ====================
 
-    def obtener_habitaciones(self):
-        self.cursor.execute("SELECT * FROM habitaciones")
-        return self.cursor.fetchall()
+    def obtener_habitaciones(self) -> List[Habitacion]:
+        with self._cursor() as cur:
+            cur.execute(f"SELECT {columnas(Habitacion)} FROM habitaciones")
+            return leer_filas(cur, Habitacion)
 
     def agregar_habitacion(self, numero, tipo, precio, estado='disponible'):
         try:
-            self.cursor.execute("""
-                                INSERT INTO habitaciones (numero, tipo, precio, estado)
-                                VALUES (%s, %s, %s, %s)
-                                """, (numero, tipo, precio, estado))
-            self.conn.commit()
+            with self._cursor(cambia=("habitaciones",)) as cur:
+                cur.execute("""
+                            INSERT INTO habitaciones (numero, tipo, precio, estado)
+                            VALUES (%s, %s, %s, %s)
+                            """, (numero, tipo, precio, estado))
             return True
         except errors.UniqueViolation:
-            self.conn.rollback()
             return False
 
     def actualizar_habitacion(self, id, numero, tipo, precio, estado):
-        self.cursor.execute("""
+        try:
+            with self._cursor(cambia=("habitaciones",)) as cur:
+                cur.execute("""
                             UPDATE habitaciones
                             SET numero=%s,
                                 tipo=%s,
@@ -72,43 +450,80 @@ class DatabaseManager:
                                 estado=%s
                             WHERE id = %s
                             """, (numero, tipo, precio, estado, id))
-        self.conn.commit()
-        return True
+            return True
+        except errors.UniqueViolation:
+            return False
 
     def eliminar_habitacion(self, id):
-        self.cursor.execute("DELETE FROM habitaciones WHERE id=%s", (id,))
-        self.conn.commit()
+        with self._cursor(cambia=("habitaciones",)) as cur:
+            cur.execute("DELETE FROM habitaciones WHERE id=%s", (id,))
 
     def cambiar_estado_habitacion(self, id, nuevo_estado):
-        self.cursor.execute("""
-                            UPDATE habitaciones
-                            SET estado=%s
-                            WHERE id = %s
-                            """, (nuevo_estado, id))
-        self.conn.commit()
+        with self._cursor(cambia=("habitaciones", "eventos")) as cur:
+            self._actualizar_estado_habitacion(cur, id, nuevo_estado)
+            eventos.registrar(cur, [
+                eventos.NuevoEvento(eventos.HABITACION_ESTADO, id, detalle=nuevo_estado)
+            ])
+
+    @staticmethod
+    def _actualizar_estado_habitacion(cur, id, nuevo_estado):
+        """Cambia el estado dentro de una transacción ya abierta (sin commit)"""
+        cur.execute("""
+                    UPDATE habitaciones
+                    SET estado=%s
+                    WHERE id = %s
+                    """, (nuevo_estado, id))
 
     # ==================== EMPLEADOS ====================
 
-    def obtener_empleados(self):
-        self.cursor.execute("SELECT * FROM empleados")
-        return self.cursor.fetchall()
+    def obtener_empleados(self) -> List[Empleado]:
+        with self._cursor() as cur:
+            cur.execute(f"SELECT {columnas(Empleado)} FROM empleados")
+            return leer_filas(cur, Empleado)
+
+    def validar_login(self, usuario, password) -> Optional[ResultadoLogin]:
+        """
+        Valida login con contraseña hasheada
 
-    def validar_login(self, usuario, password):
-        """Valida login con contraseña hasheada"""
-        self.cursor.execute("""
-                            SELECT id, nombre, apellido, puesto, password
-                            FROM empleados
-                            WHERE usuario = %s
-                            """, (usuario,))
-        resultado = self.cursor.fetchone()
+        Una sola consulta por índice (idx_empleados_usuario) trae también
+        el privilegio, así la sesión no necesita leer la tabla completa.
+        """
+        with self._cursor() as cur:
+            cur.execute("""
+                        SELECT id, nombre, apellido, puesto, privilegio, password
+                        FROM empleados
+                        WHERE usuario = %s
+                        """, (usuario,))
+            resultado = cur.fetchone()
 
-        if resultado and len(resultado) >= 5:
-            password_hash = resultado[4]
-            # Verificar contraseña hasheada
-            if self.verificar_password(password, password_hash):
-                return (resultado[0], resultado[1], resultado[2], resultado[3])
+        if not resultado:
+            return None
 
-        return None
+        empleado_id, nombre, apellido, puesto, privilegio, password_hash = resultado
+        # Verificar contraseña hasheada
+        if not self.verificar_password(password, password_hash):
+            return None
+
+        # Aprovechar que tenemos la contraseña en claro para actualizar el costo
+        if seguridad.necesita_rehash(password_hash):
+            self._rehashear_empleado(empleado_id, password, password_hash)
+
+        return ResultadoLogin(empleado_id, nombre, apellido, puesto,
+                              privilegio or PRIVILEGIO_POR_DEFECTO)
+
+    def _rehashear_empleado(self, empleado_id, password, hash_anterior):
+        """Guarda la contraseña con el costo actual (no interrumpe el login si falla)"""
+        try:
+            nuevo_hash = self.hashear_password(password)
+            with self._cursor() as cur:
+                # Solo si nadie cambió la contraseña mientras tanto
+                cur.execute("""
+                            UPDATE empleados
+                            SET password=%s
+                            WHERE id = %s AND password = %s
+                            """, (nuevo_hash, empleado_id, hash_anterior))
+        except Exception as e:
+            print(f"Error al actualizar hash de contraseña: {e}")
 
     def agregar_empleado(self, nombre, apellido, puesto, telefono='', usuario='', password='', privilegio=''):
         """Agrega un empleado con contraseña hasheada"""
@@ -116,48 +531,86 @@ class DatabaseManager:
             # Hashear contraseña antes de guardar
             password_hash = self.hashear_password(password) if password else ''
 
-            self.cursor.execute("""
-                                INSERT INTO empleados
-                                    (nombre, apellido, puesto, telefono, usuario, password, privilegio)
-                                VALUES (%s, %s, %s, %s, %s, %s, %s)
-                                """, (nombre, apellido, puesto, telefono, usuario, password_hash, privilegio))
-            self.conn.commit()
+            with self._cursor(cambia=("empleados",)) as cur:
+                cur.execute("""
+                            INSERT INTO empleados
+                                (nombre, apellido, puesto, telefono, usuario, password, privilegio)
+                            VALUES (%s, %s, %s, %s, %s, %s, %s)
+                            """, (nombre, apellido, puesto, telefono, usuario, password_hash, privilegio))
             return True
         except errors.UniqueViolation:
-            self.conn.rollback()
             return False
 
     def actualizar_empleado(self, id, nombre, apellido, puesto, telefono, privilegio):
-        self.cursor.execute("""
-                            UPDATE empleados
-                            SET nombre=%s,
-                                apellido=%s,
-                                puesto=%s,
-                                telefono=%s,
-                                privilegio=%s
-                            WHERE id = %s
-                            """, (nombre, apellido, puesto, telefono, privilegio, id))
-        self.conn.commit()
+        with self._cursor(cambia=("empleados",)) as cur:
+            cur.execute("""
+                        UPDATE empleados
+                        SET nombre=%s,
+                            apellido=%s,
+                            puesto=%s,
+                            telefono=%s,
+                            privilegio=%s
+                        WHERE id = %s
+                        """, (nombre, apellido, puesto, telefono, privilegio, id))
         return True
 
     def eliminar_empleado(self, id):
-        self.cursor.execute("DELETE FROM empleados WHERE id=%s", (id,))
-        self.conn.commit()
+        with self._cursor(cambia=("empleados",)) as cur:
+            cur.execute("DELETE FROM empleados WHERE id=%s", (id,))
 
     # ==================== HUESPEDES ====================
 
-    def obtener_huespedes(self):
-        self.cursor.execute("SELECT * FROM huespedes")
-        return self.cursor.fetchall()
+    def obtener_huespedes(self) -> List[Huesped]:
+        with self._cursor() as cur:
+            cur.execute(f"SELECT {columnas(Huesped)} FROM huespedes")
+            return leer_filas(cur, Huesped)
 
-    def buscar_huesped_por_telefono(self, telefono):
+    def buscar_huesped_por_telefono(self, telefono) -> Optional[HuespedEncontrado]:
         """Busca un huésped por su número de teléfono"""
-        self.cursor.execute("""
-                            SELECT id, nombre, apellido, telefono, email, password
-                            FROM huespedes
-                            WHERE telefono = %s
-                            """, (telefono,))
-        return self.cursor.fetchone()
+        with self._cursor() as cur:
+            cur.execute(f"""
+                        SELECT {columnas(HuespedEncontrado)}
+                        FROM huespedes
+                        WHERE telefono = %s
+                        """, (telefono,))
+            return leer_fila(cur, HuespedEncontrado)
+
+    def buscar_huespedes(self, texto, limite=LIMITE_BUSQUEDA_HUESPEDES):
+        """
+        Huéspedes cuyo nombre, teléfono o email contiene `texto`, ordenados
+        por relevancia. Acepta fragmentos ("ramír", "5512", "@gmail") y
+        teléfonos con separadores.
+
+        Returns:
+            Lista de HuespedEncontrado
+        """
+        texto = texto.strip().lower()
+        if not texto:
+            return []
+        texto = digitos_telefono(texto) or texto
+
+        # Los comodines de LIKE que escriba el usuario se buscan literalmente
+        literal = texto.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        parametros = {
+            "texto": texto,
+            "contiene": f"%{literal}%",
+            "palabra": f"% {literal}%",
+            "limite": limite,
+        }
+
+        if self._busqueda_trgm:
+            try:
+                with self._cursor() as cur:
+                    cur.execute(_SQL_BUSCAR_HUESPEDES, parametros)
+                    return leer_filas(cur, HuespedEncontrado)
+            except errors.UndefinedFunction:
+                # Migración 008 sin aplicar
+                print("Aviso: falta la búsqueda por trigramas, ejecute python -m database.migrar")
+                self._busqueda_trgm = False
+
+        with self._cursor() as cur:
+            cur.execute(_SQL_BUSCAR_HUESPEDES_SIN_INDICE, parametros)
+            return leer_filas(cur, HuespedEncontrado)
 
     def agregar_huesped(self, nombre, apellido, telefono, password='', email=''):
         """Agrega un huésped con contraseña hasheada"""
@@ -165,150 +618,409 @@ class DatabaseManager:
             # Hashear contraseña antes de guardar
             password_hash = self.hashear_password(password) if password else ''
 
-            self.cursor.execute("""
-                                INSERT INTO huespedes (nombre, apellido, telefono, password, email)
-                                VALUES (%s, %s, %s, %s, %s) RETURNING id
-                                """, (nombre, apellido, telefono, password_hash, email))
-            self.conn.commit()
-            return self.cursor.fetchone()
+            with self._cursor(cambia=("huespedes",)) as cur:
+                cur.execute("""
+                            INSERT INTO huespedes (nombre, apellido, telefono, password, email)
+                            VALUES (%s, %s, %s, %s, %s) RETURNING id
+                            """, (nombre, apellido, telefono, password_hash, email))
+                return cur.fetchone()
         except errors.UniqueViolation:
-            self.conn.rollback()
             return None
 
+    def actualizar_huesped(self, id, nombre, apellido, telefono, password='', email=''):
+        """
+        Actualiza un huésped; `password` puede ser una contraseña nueva (se
+        hashea) o el hash que ya tenía (se conserva)
+        """
+        try:
+            with self._cursor(cambia=("huespedes",)) as cur:
+                cur.execute("SELECT password FROM huespedes WHERE id = %s FOR UPDATE", (id,))
+                fila = cur.fetchone()
+                if fila is None:
+                    return False
+
+                actual = fila[0] or ''
+                if password and password != actual:
+                    password = self.hashear_password(password)
+                else:
+                    password = actual
+
+                cur.execute("""
+                            UPDATE huespedes
+                            SET nombre=%s,
+                                apellido=%s,
+                                telefono=%s,
+                                password=%s,
+                                email=%s
+                            WHERE id = %s
+                            """, (nombre, apellido, telefono, password, email, id))
+            return True
+        except errors.UniqueViolation:
+            return False
+
+    def eliminar_huesped(self, id):
+        """Elimina un huésped; False si tiene reservas registradas"""
+        try:
+            with self._cursor(cambia=("huespedes",)) as cur:
+                cur.execute("DELETE FROM huespedes WHERE id=%s", (id,))
+            return True
+        except errors.ForeignKeyViolation:
+            return False
+
     # ==================== RESERVAS ====================
 
-    def obtener_reservas(self):
-        self.cursor.execute("""
-                            SELECT r.id,
-                                   r.huesped_id,
-                                   h.nombre || ' ' || h.apellido AS huesped_nombre,
-                                   r.habitacion_id,
-                                   hab.numero,
-                                   hab.tipo,
-                                   r.fecha_entrada,
-                                   r.fecha_salida,
-                                   r.estado,
-                                   r.total
-                            FROM reservaciones r
-                                     JOIN huespedes h ON r.huesped_id = h.id
-                                     JOIN habitaciones hab ON r.habitacion_id = hab.id
-                            ORDER BY r.fecha_entrada DESC
-                            """)
-        return self.cursor.fetchall()
-
-    def obtener_habitaciones_disponibles(self):
-        """Obtiene las habitaciones disponibles para reservar"""
-        self.cursor.execute("""
-                            SELECT id, numero, tipo, precio
-                            FROM habitaciones
-                            WHERE estado = 'disponible'
-                            ORDER BY numero
-                            """)
-        return self.cursor.fetchall()
+    def obtener_reservas(self) -> List[Reserva]:
+        with self._cursor() as cur:
+            cur.execute(f"""
+                        {_SELECT_RESERVAS}
+                        ORDER BY r.fecha_entrada DESC
+                        """)
+            return leer_filas(cur, Reserva)
+
+    def obtener_reservas_pagina(self, busqueda='', estado=None, cursor=None, limite=50):
+        """
+        Obtiene una página de reservas con paginación por keyset
+
+        Args:
+            busqueda: Texto a buscar en el nombre del huésped o número de habitación
+            estado: Estado de la reserva o None para todas
+            cursor: (fecha_entrada, id) de la última fila de la página anterior
+            limite: Cantidad máxima de filas de la página
+        """
+        condiciones = []
+        parametros = []
+
+        if busqueda:
+            patron = self._patron_like(busqueda)
+            condiciones.append("(h.nombre || ' ' || h.apellido ILIKE %s OR hab.numero::text ILIKE %s)")
+            parametros += [patron, patron]
+
+        if estado:
+            condiciones.append("r.estado = %s")
+            parametros.append(estado)
+
+        if cursor:
+            condiciones.append("(r.fecha_entrada, r.id) < (%s, %s)")
+            parametros += list(cursor)
+
+        where = f"WHERE {' AND '.join(condiciones)}" if condiciones else ""
+
+        with self._cursor() as cur:
+            # Se pide una fila extra para saber si existe otra página
+            cur.execute(f"""
+                        {_SELECT_RESERVAS}
+                        {where}
+                        ORDER BY r.fecha_entrada DESC, r.id DESC
+                        LIMIT %s
+                        """, parametros + [limite + 1])
+            filas = leer_filas(cur, Reserva)
+
+        siguiente = None
+        if len(filas) > limite:
+            filas = filas[:limite]
+            ultima = filas[-1]
+            siguiente = (ultima.fecha_entrada, ultima.id)
+
+        return PaginaReservas(filas, siguiente)
+
+    def obtener_reservas_por_id(self, ids) -> List[Reserva]:
+        """Las reservas con esos ids (las que no existen no vienen)"""
+        with self._cursor() as cur:
+            cur.execute(f"""
+                        {_SELECT_RESERVAS}
+                        WHERE r.id = ANY(%s)
+                        """, (list(ids),))
+            return leer_filas(cur, Reserva)
+
+    @staticmethod
+    def _patron_like(texto):
+        """Escapa los comodines de LIKE y envuelve el texto en %...%"""
+        escapado = texto.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        return f"%{escapado}%"
+
+    def obtener_habitaciones_disponibles(self, fecha_entrada=None, fecha_salida=None) -> List[HabitacionLibre]:
+        """
+        Obtiene las habitaciones disponibles para reservar
+
+        Con fechas, usa el motor de disponibilidad: libres en [entrada, salida)
+        aunque hoy estén ocupadas. Sin fechas, las que hoy están 'disponible'.
+        """
+        if fecha_entrada and fecha_salida:
+            return self.disponibilidad.habitaciones_libres(fecha_entrada, fecha_salida)
+
+        with self._cursor() as cur:
+            cur.execute(f"""
+                        SELECT {columnas(HabitacionLibre)}
+                        FROM habitaciones
+                        WHERE estado = 'disponible'
+                        ORDER BY numero
+                        """)
+            return leer_filas(cur, HabitacionLibre)
 
     def agregar_reserva(self, huesped_id, habitacion_id, fecha_entrada, fecha_salida, total):
+        """Crea una reserva; devuelve True/False (ver reservar_habitacion para el detalle)"""
+        return self.reservar_habitacion(huesped_id, habitacion_id, fecha_entrada, fecha_salida, total).exito
+
+    def reservar_habitacion(self, huesped_id, habitacion_id, fecha_entrada, fecha_salida, total) -> ResultadoReserva:
+        """
+        Crea una reserva en una sola transacción
+
+        Bloquea la fila de la habitación (SELECT ... FOR UPDATE) para que dos
+        terminales no reserven la misma a la vez, revisa solapes en
+        [entrada, salida) y confirma una sola vez. La restricción de exclusión
+        de migraciones/006 es la última defensa si algo escribe sin bloquear.
+        """
         try:
-            self.cursor.execute("""
-                                INSERT INTO reservaciones
-                                    (huesped_id, habitacion_id, fecha_entrada, fecha_salida, total, estado)
-                                VALUES (%s, %s, %s, %s, %s, 'activa')
-                                """, (huesped_id, habitacion_id, fecha_entrada, fecha_salida, total))
-            self.cambiar_estado_habitacion(habitacion_id, 'ocupada')
-            self.conn.commit()
-            return True
+            with self._cursor() as cur:
+                cur.execute("""
+                            SELECT estado, %s::date <= CURRENT_DATE
+                            FROM habitaciones
+                            WHERE id = %s
+                                FOR UPDATE
+                            """, (fecha_entrada, habitacion_id))
+                habitacion = cur.fetchone()
+
+                if not habitacion:
+                    return ResultadoReserva(RESERVA_NO_DISPONIBLE, mensaje="La habitación no existe")
+
+                estado_actual, empieza_hoy = habitacion
+                if estado_actual == 'mantenimiento' or (empieza_hoy and estado_actual != 'disponible'):
+                    return ResultadoReserva(
+                        RESERVA_NO_DISPONIBLE,
+                        mensaje=f"La habitación está en {estado_actual}"
+                    )
+
+                cur.execute("""
+                            SELECT id
+                            FROM reservaciones
+                            WHERE habitacion_id = %s
+                              AND estado = 'activa'
+                              AND fecha_entrada < %s
+                              AND fecha_salida > %s
+                            LIMIT 1
+                            """, (habitacion_id, fecha_salida, fecha_entrada))
+                choque = cur.fetchone()
+
+                if choque:
+                    return ResultadoReserva(
+                        RESERVA_CONFLICTO, choque[0],
+                        "La habitación ya está reservada en esas fechas"
+                    )
+
+                cur.execute("""
+                            INSERT INTO reservaciones
+                                (huesped_id, habitacion_id, fecha_entrada, fecha_salida, total, estado)
+                            VALUES (%s, %s, %s, %s, %s, 'activa')
+                            RETURNING id
+                            """, (huesped_id, habitacion_id, fecha_entrada, fecha_salida, total))
+                reserva_id = cur.fetchone()[0]
+
+                nuevos_eventos = [eventos.NuevoEvento(eventos.RESERVA_CREADA, habitacion_id, reserva_id)]
+
+                # Una reserva futura no ocupa la habitación todavía
+                if empieza_hoy:
+                    self._actualizar_estado_habitacion(cur, habitacion_id, 'ocupada')
+                    nuevos_eventos.append(
+                        eventos.NuevoEvento(eventos.HABITACION_ESTADO, habitacion_id, reserva_id, 'ocupada')
+                    )
+
+                eventos.registrar(cur, nuevos_eventos)
+            # Solo se avisa si hubo escritura (los rechazos salen antes sin cambios)
+            self._registrar_cambio("reservaciones", "habitaciones", "eventos")
+            self._registrar_cambio_reserva(fecha_entrada, fecha_salida)
+            return ResultadoReserva(RESERVA_CREADA, reserva_id, "Reserva creada")
+        except errors.ExclusionViolation:
+            return ResultadoReserva(RESERVA_CONFLICTO, mensaje="La habitación ya está reservada en esas fechas")
         except Exception as e:
-            self.conn.rollback()
             print(f"Error al agregar reserva: {e}")
-            return False
+            return ResultadoReserva(RESERVA_ERROR, mensaje=str(e))
+
+    def registrar_llegadas(self) -> int:
+        """
+        Pone 'ocupada' cada habitación 'disponible' que tiene una reserva
+        activa que cubre hoy (reservas hechas a futuro cuyo día llegó).
+        Las que están en limpieza o mantenimiento se ocupan cuando vuelvan
+        a estar disponibles.
+
+        Returns:
+            Cantidad de habitaciones que pasaron a ocupadas
+        """
+        with self._cursor() as cur:
+            cur.execute("""
+                        UPDATE habitaciones hab
+                        SET estado = 'ocupada'
+                        FROM reservaciones r
+                        WHERE r.habitacion_id = hab.id
+                          AND r.estado = 'activa'
+                          AND r.fecha_entrada <= CURRENT_DATE
+                          AND r.fecha_salida > CURRENT_DATE
+                          AND hab.estado = 'disponible'
+                        RETURNING hab.id, r.id
+                        """)
+            ocupadas = cur.fetchall()
+            eventos.registrar(cur, [
+                eventos.NuevoEvento(eventos.HABITACION_ESTADO, habitacion_id, reserva_id, 'ocupada')
+                for habitacion_id, reserva_id in ocupadas
+            ])
+
+        if ocupadas:
+            self._registrar_cambio("habitaciones", "eventos")
+        return len(ocupadas)
 
     def finalizar_reserva(self, reserva_id):
-        """Finaliza una reserva (check-out) y pone la habitación en limpieza"""
+        """
+        Finaliza una reserva (check-out) y pone la habitación en limpieza.
+        False si la reserva ya no está activa (otra terminal la cerró) o
+        todavía no empezó: la habitación puede tener a otro huésped.
+        """
         try:
-            # Obtener habitacion_id de la reserva
-            self.cursor.execute("""
-                                SELECT habitacion_id
-                                FROM reservaciones
-                                WHERE id = %s
-                                """, (reserva_id,))
-            resultado = self.cursor.fetchone()
-
-            if resultado:
-                habitacion_id = resultado[0]
-
-                # Actualizar estado de la reserva
-                self.cursor.execute("""
-                                    UPDATE reservaciones
-                                    SET estado = 'finalizada'
-                                    WHERE id = %s
-                                    """, (reserva_id,))
+            with self._cursor() as cur:
+                cur.execute("""
+                            UPDATE reservaciones
+                            SET estado = 'finalizada'
+                            WHERE id = %s
+                              AND estado = 'activa'
+                              AND fecha_entrada <= CURRENT_DATE
+                            RETURNING habitacion_id, fecha_entrada, fecha_salida
+                            """, (reserva_id,))
+                resultado = cur.fetchone()
+
+                if not resultado:
+                    return False
+
+                habitacion_id, fecha_entrada, fecha_salida = resultado
 
                 # Cambiar habitación a limpieza
-                self.cambiar_estado_habitacion(habitacion_id, 'limpieza')
+                self._actualizar_estado_habitacion(cur, habitacion_id, 'limpieza')
 
-                self.conn.commit()
-                return True
-            return False
+                eventos.registrar(cur, [
+                    eventos.NuevoEvento(eventos.RESERVA_FINALIZADA, habitacion_id, reserva_id),
+                    eventos.NuevoEvento(eventos.HABITACION_ESTADO, habitacion_id, reserva_id, 'limpieza'),
+                ])
+            self._registrar_cambio("reservaciones", "habitaciones", "eventos")
+            self._registrar_cambio_reserva(fecha_entrada, fecha_salida)
+            return True
         except Exception as e:
-            self.conn.rollback()
             print(f"Error al finalizar reserva: {e}")
             return False
 
     def cancelar_reserva(self, reserva_id):
-        """Cancela una reserva y libera la habitación"""
+        """Cancela una reserva activa y libera la habitación (False si ya no estaba activa)"""
         try:
-            # Obtener habitacion_id de la reserva
-            self.cursor.execute("""
-                                SELECT habitacion_id
-                                FROM reservaciones
-                                WHERE id = %s
-                                """, (reserva_id,))
-            resultado = self.cursor.fetchone()
-
-            if resultado:
-                habitacion_id = resultado[0]
-
-                # Actualizar estado de la reserva
-                self.cursor.execute("""
-                                    UPDATE reservaciones
-                                    SET estado = 'cancelada'
-                                    WHERE id = %s
-                                    """, (reserva_id,))
-
-                # Cambiar habitación a disponible
-                self.cambiar_estado_habitacion(habitacion_id, 'disponible')
-
-                self.conn.commit()
-                return True
-            return False
+            with self._cursor() as cur:
+                # Devuelve habitacion_id y fechas de la reserva, y si ya había empezado
+                cur.execute("""
+                            UPDATE reservaciones
+                            SET estado = 'cancelada'
+                            WHERE id = %s
+                              AND estado = 'activa'
+                            RETURNING habitacion_id, fecha_entrada, fecha_salida, fecha_entrada <= CURRENT_DATE
+                            """, (reserva_id,))
+                resultado = cur.fetchone()
+
+                if not resultado:
+                    return False
+
+                habitacion_id, fecha_entrada, fecha_salida, en_curso = resultado
+
+                nuevos_eventos = [eventos.NuevoEvento(eventos.RESERVA_CANCELADA, habitacion_id, reserva_id)]
+
+                # Cambiar habitación a disponible (una reserva futura no la tenía ocupada)
+                if en_curso:
+                    self._actualizar_estado_habitacion(cur, habitacion_id, 'disponible')
+                    nuevos_eventos.append(
+                        eventos.NuevoEvento(eventos.HABITACION_ESTADO, habitacion_id, reserva_id, 'disponible')
+                    )
+
+                eventos.registrar(cur, nuevos_eventos)
+            self._registrar_cambio("reservaciones", "habitaciones", "eventos")
+            self._registrar_cambio_reserva(fecha_entrada, fecha_salida)
+            return True
         except Exception as e:
-            self.conn.rollback()
             print(f"Error al cancelar reserva: {e}")
             return False
 
+    # ==================== SINCRONIZACIÓN ====================
+
+    def marca_cambios(self) -> datetime:
+        """Hora del servidor desde la que pedir cambios con obtener_cambios_desde"""
+        with self._cursor() as cur:
+            cur.execute("SELECT now()")
+            return cur.fetchone()[0]
+
+    def obtener_cambios_desde(self, tabla, marca=None,
+                              margen_minutos=MARGEN_CAMBIOS_MINUTOS) -> Optional[CambiosTabla]:
+        """
+        Filas de `tabla` creadas o modificadas desde `marca` y los ids que se
+        borraron (filas_eliminadas, migraciones/009). Sin marca devuelve la
+        tabla entera. La marca devuelta es la hora del servidor al empezar
+        la consulta: se pasa tal cual en la próxima llamada.
+
+        Se repiten también los últimos `margen_minutos` antes de la marca
+        (una transacción larga confirma con un actualizado_en anterior), así
+        que una fila puede llegar más de una vez.
+
+        Args:
+            tabla: 'habitaciones', 'empleados', 'huespedes' o 'reservaciones'
+
+        Returns:
+            CambiosTabla, o None si faltan las columnas de seguimiento
+            (hay que releer la tabla entera)
+        """
+        if tabla not in _TABLAS_SINCRONIZABLES:
+            raise ValueError(f"Tabla sin seguimiento de cambios: {tabla}")
+        modelo, select, condicion = _TABLAS_SINCRONIZABLES[tabla]
+
+        if marca is None:
+            with self._cursor() as cur:
+                cur.execute("SELECT now()")
+                nueva_marca = cur.fetchone()[0]
+                cur.execute(select)
+                return CambiosTabla(leer_filas(cur, modelo), [], nueva_marca, True)
+
+        if not self._cambios_incrementales:
+            return None
+
+        parametros = {"tabla": tabla, "desde": marca - timedelta(minutes=margen_minutos)}
+        try:
+            with self._cursor() as cur:
+                cur.execute("SELECT now()")
+                nueva_marca = cur.fetchone()[0]
+                cur.execute(f"{select} WHERE {condicion}", parametros)
+                filas = leer_filas(cur, modelo)
+                cur.execute("""
+                            SELECT fila_id
+                            FROM filas_eliminadas
+                            WHERE tabla = %(tabla)s
+                              AND eliminado_en >= %(desde)s
+                            """, parametros)
+                eliminados = [fila[0] for fila in cur.fetchall()]
+        except (errors.UndefinedColumn, errors.UndefinedTable):
+            # Migración 009 sin aplicar
+            print("Aviso: falta el seguimiento de cambios, ejecute python -m database.migrar")
+            self._cambios_incrementales = False
+            return None
+
+        return CambiosTabla(filas, eliminados, nueva_marca, False)
+
+    # ==================== EVENTOS ====================
+
+    def obtener_eventos_recientes(self, limite=8):
+        """Últimos eventos para el feed de actividad (del más nuevo al más viejo)"""
+        with self._cursor() as cur:
+            return eventos.obtener_recientes(cur, limite)
+
+    def obtener_eventos_desde(self, ultimo_id, limite=50):
+        """Eventos posteriores al último visto (del más nuevo al más viejo)"""
+        with self._cursor() as cur:
+            return eventos.obtener_desde(cur, ultimo_id, limite)
+
     # ==================== ESTADÍSTICAS ====================
 
     def obtener_estadisticas(self):
-        """Obtiene estadísticas generales del hotel"""
+        """Obtiene estadísticas generales del hotel (una consulta, con caché)"""
         try:
-            # Contar habitaciones por estado
-            self.cursor.execute("""
-                                SELECT estado, COUNT(*)
-                                FROM habitaciones
-                                GROUP BY estado
-                                """)
-            habitaciones_estado = dict(self.cursor.fetchall())
-
-            # Contar empleados
-            self.cursor.execute("SELECT COUNT(*) FROM empleados")
-            total_empleados = self.cursor.fetchone()[0]
-
-            return {
-                'disponibles': habitaciones_estado.get('disponible', 0),
-                'ocupadas': habitaciones_estado.get('ocupada', 0),
-                'limpieza': habitaciones_estado.get('limpieza', 0),
-                'mantenimiento': habitaciones_estado.get('mantenimiento', 0),
-                'empleados': total_empleados
-            }
+            return self.estadisticas.obtener()
         except Exception as e:
             print(f"Error al obtener estadísticas: {e}")
             return {
@@ -320,71 +1032,83 @@ class DatabaseManager:
             }
 
     def obtener_reporte_reservas(self, fecha_inicio, fecha_fin):
-        """Obtiene el historial completo de reservas en un período"""
+        """Obtiene el historial completo de reservas en un período (con caché)"""
         try:
-            self.cursor.execute("""
-                                SELECT r.id,
-                                       h.nombre || ' ' || h.apellido AS huesped,
-                                       hab.numero,
-                                       r.fecha_entrada,
-                                       r.fecha_salida,
-                                       r.total,
-                                       r.estado
-                                FROM reservaciones r
-                                         JOIN huespedes h ON r.huesped_id = h.id
-                                         JOIN habitaciones hab ON r.habitacion_id = hab.id
-                                WHERE r.fecha_entrada >= %s
-                                  AND r.fecha_entrada <= %s
-                                ORDER BY r.fecha_entrada DESC
-                                """, (fecha_inicio, fecha_fin))
-            return self.cursor.fetchall()
+            return self.reportes.obtener("reservas", fecha_inicio, fecha_fin, self._consultar_reporte_reservas)
         except Exception as e:
             print(f"Error al obtener reporte de reservas: {e}")
             return []
 
+    def iterar_reporte_reservas(self, fecha_inicio, fecha_fin, itersize=None):
+        """Como obtener_reporte_reservas, pero entrega las filas a medida que llegan del servidor"""
+        return self.reportes.iterar(
+            "reservas", fecha_inicio, fecha_fin,
+            lambda inicio, fin: self._iterar_sql("iterar_reporte_reservas", "reporte_reservas",
+                                                 _SQL_REPORTE_RESERVAS, (inicio, fin), itersize)
+        )
+
+    def _consultar_reporte_reservas(self, fecha_inicio, fecha_fin):
+        with self._cursor() as cur:
+            cur.execute(_SQL_REPORTE_RESERVAS, (fecha_inicio, fecha_fin))
+            return cur.fetchall()
+
+    def obtener_resumen_reservas(self, fecha_inicio, fecha_fin) -> ResumenReservas:
+        """Totales del reporte de reservas calculados en la base de datos (con caché)"""
+        filas = self.reportes.obtener("resumen_reservas", fecha_inicio, fecha_fin,
+                                      self._consultar_resumen_reservas)
+        por_mes, por_estado = [], []
+        total = FilaResumen("TOTAL", 0, 0, Decimal(0))
+        for nivel, mes, estado, reservas, noches, importe in filas:
+            if nivel == _NIVEL_MES:
+                por_mes.append(FilaResumen(mes.strftime("%Y-%m"), reservas, noches, importe))
+            elif nivel == _NIVEL_ESTADO:
+                por_estado.append(FilaResumen(estado, reservas, noches, importe))
+            elif nivel == _NIVEL_TOTAL:
+                total = FilaResumen("TOTAL", reservas, noches, importe)
+        return ResumenReservas(por_mes, por_estado, total)
+
+    def _consultar_resumen_reservas(self, fecha_inicio, fecha_fin):
+        with self._cursor() as cur:
+            cur.execute(_SQL_RESUMEN_RESERVAS, (fecha_inicio, fecha_fin))
+            return cur.fetchall()
+
+    def obtener_indicadores(self, fecha_inicio, fecha_fin, grano="mes"):
+        """Ocupación, ADR y RevPAR por período y tipo de habitación"""
+        return self.analitica.indicadores(fecha_inicio, fecha_fin, grano)
+
     def obtener_reporte_habitaciones(self, fecha_inicio, fecha_fin):
-        """Obtiene el historial de uso y limpieza de habitaciones"""
+        """Obtiene el historial de uso y limpieza de habitaciones (con caché)"""
         try:
-            self.cursor.execute("""
-                                -- Eventos de check-in (ocupación)
-                                SELECT hab.numero,
-                                       hab.tipo,
-                                       'Check-in / Ocupación'        as evento,
-                                       r.fecha_entrada               as fecha,
-                                       h.nombre || ' ' || h.apellido as huesped,
-                                       'Entrada del huésped'         as detalles
-                                FROM reservaciones r
-                                         JOIN habitaciones hab ON r.habitacion_id = hab.id
-                                         JOIN huespedes h ON r.huesped_id = h.id
-                                WHERE r.fecha_entrada >= %s
-                                  AND r.fecha_entrada <= %s
-
-                                UNION ALL
-
-                                -- Eventos de check-out (salida)
-                                SELECT hab.numero,
-                                       hab.tipo,
-                                       'Check-out / Limpieza'                       as evento,
-                                       r.fecha_salida                               as fecha,
-                                       h.nombre || ' ' || h.apellido                as huesped,
-                                       'Salida del huésped - Habitación a limpieza' as detalles
-                                FROM reservaciones r
-                                         JOIN habitaciones hab ON r.habitacion_id = hab.id
-                                         JOIN huespedes h ON r.huesped_id = h.id
-                                WHERE r.fecha_salida >= %s
-                                  AND r.fecha_salida <= %s
-                                  AND r.estado = 'finalizada'
-
-                                ORDER BY fecha DESC, numero
-                                """, (fecha_inicio, fecha_fin, fecha_inicio, fecha_fin))
-            return self.cursor.fetchall()
+            return self.reportes.obtener("habitaciones", fecha_inicio, fecha_fin,
+                                         self._consultar_reporte_habitaciones)
         except Exception as e:
             print(f"Error al obtener reporte de habitaciones: {e}")
             return []
 
+    def iterar_reporte_habitaciones(self, fecha_inicio, fecha_fin, itersize=None):
+        """Como obtener_reporte_habitaciones, pero entrega las filas a medida que llegan del servidor"""
+        return self.reportes.iterar(
+            "habitaciones", fecha_inicio, fecha_fin,
+            lambda inicio, fin: self._iterar_sql("iterar_reporte_habitaciones", "reporte_habitaciones",
+                                                 _SQL_REPORTE_HABITACIONES, (inicio, fin, inicio, fin), itersize)
+        )
+
+    def _consultar_reporte_habitaciones(self, fecha_inicio, fecha_fin):
+        with self._cursor() as cur:
+            cur.execute(_SQL_REPORTE_HABITACIONES, (fecha_inicio, fecha_fin, fecha_inicio, fecha_fin))
+            return cur.fetchall()
+
+    def _iterar_sql(self, metodo, nombre, sql, parametros, itersize=None):
+        """
+        Ejecuta la consulta en un cursor del servidor y entrega sus filas.
+        Cuando se abre el cursor `metodo` ya no está en la pila: se pasa su nombre.
+        """
+        with self._cursor_servidor(nombre, itersize, metodo) as cur:
+            cur.execute(sql, parametros)
+            yield from cur
+
     def cerrar(self):
-        if self.cursor:
-            self.cursor.close()
-        if self.conn:
-            self.conn.close()
-        print("✓ Conexión cerrada")
\ No newline at end of file
+        self.notificaciones.detener()
+        if self.pool:
+            self.pool.cerrar()
+        print("✓ Conexión cerrada")
@@ -0,0 +1,164 @@
+# database/disponibilidad.py
+"""
+Motor de disponibilidad por rango de fechas
+Responde "¿qué habitaciones están libres en [entrada, salida)?" con un índice
+de intervalos por habitación (búsqueda binaria), en lugar de mirar el estado
+actual de la habitación.
+
+Solo se cargan las reservas activas que terminan después de hoy (índice
+parcial de migraciones/005), así el costo no crece con el historial.
+"""
+
+import bisect
+import threading
+import time
+from datetime import date
+from typing import Dict, List, Optional
+
+from models.habitacion import HabitacionLibre
+
+# Segundos que se reutiliza el índice si no hubo escrituras locales
+TTL_DISPONIBILIDAD = 60.0
+
+
+class IntervalosHabitacion:
+    """
+    Reservas de una habitación ordenadas por fecha de entrada
+
+    `max_salida[i]` es la mayor salida entre las primeras i+1 reservas, así
+    la consulta de choque es O(log n) aun si hubiera reservas solapadas.
+    """
+    __slots__ = ("entradas", "salidas", "max_salida")
+
+    def __init__(self):
+        self.entradas: List[date] = []
+        self.salidas: List[date] = []
+        self.max_salida: List[date] = []
+
+    def construir(self, intervalos):
+        """Carga todas las reservas de la habitación"""
+        intervalos = sorted(intervalos)
+        self.entradas = [entrada for entrada, _ in intervalos]
+        self.salidas = [salida for _, salida in intervalos]
+        self.max_salida = list(self.salidas)
+        self._recalcular_desde(0)
+
+    def choca(self, entrada: date, salida: date) -> bool:
+        """True si alguna reserva se solapa con [entrada, salida)"""
+        # Reservas que empiezan antes de la nueva salida
+        k = bisect.bisect_left(self.entradas, salida)
+        return k > 0 and self.max_salida[k - 1] > entrada
+
+    def _recalcular_desde(self, i: int):
+        maximo = self.max_salida[i - 1] if i > 0 else None
+        for j in range(i, len(self.salidas)):
+            if maximo is None or self.salidas[j] > maximo:
+                maximo = self.salidas[j]
+            self.max_salida[j] = maximo
+
+    def __len__(self):
+        return len(self.entradas)
+
+
+class MotorDisponibilidad:
+    """
+    Índice de disponibilidad en memoria, recargado cuando cambian
+    reservaciones o habitaciones (o al vencer el TTL)
+    """
+
+    def __init__(self, db, ttl: float = TTL_DISPONIBILIDAD):
+        self.db = db
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._habitaciones: List[tuple] = []
+        self._intervalos: Dict[int, IntervalosHabitacion] = {}
+        self._cargado_en: Optional[float] = None
+        self._generacion = 0
+
+        db.suscribir_cambios(self._al_cambiar)
+
+    # ==================== API ====================
+
+    def habitaciones_libres(self, entrada: date, salida: date) -> List[HabitacionLibre]:
+        """
+        Habitaciones sin reservas que se solapen con [entrada, salida)
+
+        Returns:
+            Lista de HabitacionLibre ordenada por número
+        """
+        self._asegurar_indice()
+        hoy = date.today()
+
+        with self._lock:
+            libres = []
+            for habitacion_id, numero, tipo, precio, estado in self._habitaciones:
+                if not self._estado_permite(estado, entrada, hoy):
+                    continue
+                intervalos = self._intervalos.get(habitacion_id)
+                if intervalos is not None and intervalos.choca(entrada, salida):
+                    continue
+                libres.append(HabitacionLibre(habitacion_id, numero, tipo, precio))
+            return libres
+
+    def invalidar(self):
+        """Obliga a recargar el índice en la próxima consulta"""
+        with self._lock:
+            self._cargado_en = None
+            self._generacion += 1
+
+    # ==================== INTERNOS ====================
+
+    @staticmethod
+    def _estado_permite(estado: str, entrada: date, hoy: date) -> bool:
+        """El estado actual solo cuenta para estancias que empiezan hoy"""
+        if estado == 'mantenimiento':
+            return False
+        if entrada <= hoy:
+            return estado == 'disponible'
+        return True
+
+    def _al_cambiar(self, tablas):
+        if "reservaciones" in tablas or "habitaciones" in tablas:
+            self.invalidar()
+
+    def _asegurar_indice(self):
+        with self._lock:
+            vigente = self._cargado_en is not None and time.monotonic() - self._cargado_en < self.ttl
+            generacion = self._generacion
+        if not vigente:
+            self._cargar(generacion)
+
+    def _cargar(self, generacion: int):
+        with self.db._cursor() as cur:
+            cur.execute("""
+                        SELECT id, numero, tipo, precio, estado
+                        FROM habitaciones
+                        ORDER BY numero
+                        """)
+            habitaciones = cur.fetchall()
+
+            # Índice parcial idx_reservaciones_activas_salida
+            cur.execute("""
+                        SELECT habitacion_id, fecha_entrada, fecha_salida
+                        FROM reservaciones
+                        WHERE estado = 'activa'
+                          AND fecha_salida > CURRENT_DATE
+                        """)
+            reservas = cur.fetchall()
+
+        por_habitacion: Dict[int, list] = {}
+        for habitacion_id, entrada, salida in reservas:
+            por_habitacion.setdefault(habitacion_id, []).append((entrada, salida))
+
+        intervalos = {}
+        for habitacion_id, lista in por_habitacion.items():
+            indice = IntervalosHabitacion()
+            indice.construir(lista)
+            intervalos[habitacion_id] = indice
+
+        with self._lock:
+            self._habitaciones = habitaciones
+            self._intervalos = intervalos
+            # Si hubo una escritura durante la carga, se vuelve a cargar la próxima vez
+            if generacion == self._generacion:
+                self._cargado_en = time.monotonic()
@@ -0,0 +1,97 @@
+# database/estadisticas.py
+"""
+Servicio de estadísticas del dashboard
+Lee todos los contadores en una sola consulta desde `estadisticas_resumen`
+(mantenida por triggers, ver migraciones/003) y los guarda unos segundos
+en memoria. Se invalida cuando DatabaseManager registra escrituras en
+habitaciones o empleados.
+"""
+
+import threading
+import time
+from typing import Optional
+
+from psycopg2 import errors
+
+# Segundos que se reutiliza el último resultado
+TTL_ESTADISTICAS = 10.0
+
+# Tablas cuyas escrituras invalidan la caché
+TABLAS_ESTADISTICAS = {"habitaciones", "empleados"}
+
+
+class ServicioEstadisticas:
+    """Contadores del dashboard con caché TTL"""
+
+    def __init__(self, db, ttl: float = TTL_ESTADISTICAS):
+        self.db = db
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._valor: Optional[dict] = None
+        self._expira = 0.0
+        self._generacion = 0
+        self._usar_resumen = True
+
+        db.suscribir_cambios(self._al_cambiar)
+
+    # ==================== API ====================
+
+    def obtener(self) -> dict:
+        """Contadores actuales (desde la caché si no expiró)"""
+        with self._lock:
+            if self._valor is not None and time.monotonic() < self._expira:
+                return dict(self._valor)
+            generacion = self._generacion
+
+        valor = self._consultar()
+
+        with self._lock:
+            # Si hubo una escritura durante la consulta, el valor no se guarda
+            if generacion == self._generacion:
+                self._valor = valor
+                self._expira = time.monotonic() + self.ttl
+        return dict(valor)
+
+    def invalidar(self):
+        """Descarta el valor en caché"""
+        with self._lock:
+            self._valor = None
+            self._generacion += 1
+
+    # ==================== INTERNOS ====================
+
+    def _al_cambiar(self, tablas):
+        if TABLAS_ESTADISTICAS.intersection(tablas):
+            self.invalidar()
+
+    def _consultar(self) -> dict:
+        if self._usar_resumen:
+            try:
+                with self.db._cursor() as cur:
+                    cur.execute("SELECT clave, valor FROM estadisticas_resumen")
+                    return self._formatear(dict(cur.fetchall()))
+            except errors.UndefinedTable:
+                # Migración 003 sin aplicar: se calcula en vivo
+                print("Aviso: falta estadisticas_resumen, ejecute python -m database.migrar")
+                self._usar_resumen = False
+
+        with self.db._cursor() as cur:
+            cur.execute("""
+                        SELECT 'habitaciones:' || COALESCE(estado, ''), COUNT(*)
+                        FROM habitaciones
+                        GROUP BY 1
+                        UNION ALL
+                        SELECT 'empleados', COUNT(*)
+                        FROM empleados
+                        """)
+            return self._formatear(dict(cur.fetchall()))
+
+    @staticmethod
+    def _formatear(contadores: dict) -> dict:
+        return {
+            'disponibles': contadores.get('habitaciones:disponible', 0),
+            'ocupadas': contadores.get('habitaciones:ocupada', 0),
+            'limpieza': contadores.get('habitaciones:limpieza', 0),
+            'mantenimiento': contadores.get('habitaciones:mantenimiento', 0),
+            'empleados': contadores.get('empleados', 0)
+        }
@@ -0,0 +1,85 @@
+# database/eventos.py
+"""
+Registro de eventos de habitaciones y reservas (tabla `eventos`, solo inserción)
+Los eventos de una operación se insertan juntos, en un solo viaje y dentro
+de la misma transacción que la escritura que los produce.
+El feed del dashboard lee por id: los últimos N y luego solo los más nuevos.
+"""
+
+from datetime import datetime
+from typing import Iterable, List, NamedTuple, Optional
+
+from psycopg2.extras import execute_values
+
+# Tipos de evento
+RESERVA_CREADA = "reserva_creada"
+RESERVA_FINALIZADA = "reserva_finalizada"
+RESERVA_CANCELADA = "reserva_cancelada"
+HABITACION_ESTADO = "habitacion_estado"
+
+
+class NuevoEvento(NamedTuple):
+    """Evento pendiente de insertar"""
+    tipo: str
+    habitacion_id: Optional[int] = None
+    reserva_id: Optional[int] = None
+    detalle: Optional[str] = None
+
+
+class Evento(NamedTuple):
+    """Evento leído para el feed (con el número de habitación resuelto)"""
+    id: int
+    creado_en: datetime
+    tipo: str
+    numero_habitacion: Optional[str]
+    reserva_id: Optional[int]
+    detalle: Optional[str]
+
+
+_COLUMNAS_FEED = """
+                 SELECT e.id, e.creado_en, e.tipo, h.numero::text, e.reserva_id, e.detalle
+                 FROM eventos e
+                          LEFT JOIN habitaciones h ON h.id = e.habitacion_id
+                 """
+
+
+def registrar(cur, eventos: Iterable[NuevoEvento]):
+    """Inserta los eventos en lote usando el cursor de la transacción en curso"""
+    filas = [tuple(evento) for evento in eventos]
+    if not filas:
+        return
+    execute_values(
+        cur,
+        "INSERT INTO eventos (tipo, habitacion_id, reserva_id, detalle) VALUES %s",
+        filas
+    )
+
+
+def obtener_recientes(cur, limite: int) -> List[Evento]:
+    """Los últimos `limite` eventos, del más nuevo al más viejo"""
+    cur.execute(_COLUMNAS_FEED + " ORDER BY e.id DESC LIMIT %s", (limite,))
+    return [Evento(*fila) for fila in cur.fetchall()]
+
+
+def obtener_desde(cur, ultimo_id: int, limite: int) -> List[Evento]:
+    """Eventos con id mayor a `ultimo_id`, del más nuevo al más viejo"""
+    cur.execute(_COLUMNAS_FEED + " WHERE e.id > %s ORDER BY e.id DESC LIMIT %s",
+                (ultimo_id, limite))
+    return [Evento(*fila) for fila in cur.fetchall()]
+
+
+def describir(evento: Evento) -> str:
+    """Texto del evento para el feed"""
+    habitacion = f"Hab. {evento.numero_habitacion}" if evento.numero_habitacion else "Hab. eliminada"
+
+    if evento.tipo == RESERVA_CREADA:
+        return f"Nueva reserva registrada - {habitacion}"
+    if evento.tipo == RESERVA_FINALIZADA:
+        return f"Check-out completado - {habitacion}"
+    if evento.tipo == RESERVA_CANCELADA:
+        return f"Reserva cancelada - {habitacion}"
+    if evento.tipo == HABITACION_ESTADO:
+        if evento.detalle == "disponible":
+            return f"{habitacion} lista para ocupar"
+        return f"{habitacion} pasó a {evento.detalle}"
+    return f"{evento.tipo} - {habitacion}"
@@ -0,0 +1,333 @@
+# database/importacion.py
+"""
+Importación masiva de habitaciones y huéspedes desde CSV
+
+- Lee el archivo por lotes (no se carga completo en memoria)
+- Valida y hashea contraseñas en procesos paralelos (bcrypt usa CPU)
+- Carga cada lote con COPY a una tabla temporal y de ahí inserta en bloque
+- Las filas inválidas o duplicadas se reportan con su número de línea
+  sin abortar el resto del lote
+
+Uso:
+    python -m database.importacion habitaciones habitaciones.csv
+    python -m database.importacion huespedes huespedes.csv --procesos 8 --rechazos rechazos.csv
+
+Columnas esperadas (encabezado en la primera línea):
+    habitaciones: numero, tipo, precio[, estado]
+    huespedes:    nombre, apellido, telefono[, email, password]
+"""
+
+import argparse
+import csv
+import io
+import time
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+import psycopg2
+
+from database import seguridad
+
+TAMANO_LOTE = 5000
+
+TIPOS_HABITACION = ("Sencilla", "Doble", "Familiar", "Deluxe")
+ESTADOS_HABITACION = ("disponible", "ocupada", "limpieza", "mantenimiento")
+
+
+class Rechazo(NamedTuple):
+    """Fila del CSV que no se importó"""
+    linea: int
+    motivo: str
+
+
+class ResultadoImportacion(NamedTuple):
+    """Resumen de una importación"""
+    tabla: str
+    leidas: int
+    insertadas: int
+    rechazos: List[Rechazo]
+    segundos: float
+
+
+# ==================== VALIDACIÓN (se ejecuta en los procesos) ====================
+
+def _preparar_habitacion(linea: int, fila: dict) -> Tuple[int, Optional[tuple], str]:
+    """Valida una fila de habitación -> (linea, valores o None, motivo)"""
+    numero = (fila.get("numero") or "").strip()
+    tipo = (fila.get("tipo") or "").strip()
+    estado = (fila.get("estado") or "disponible").strip()
+
+    if not numero:
+        return linea, None, "El número de habitación es obligatorio"
+    if tipo not in TIPOS_HABITACION:
+        return linea, None, f"Tipo inválido: {tipo!r}"
+    if estado not in ESTADOS_HABITACION:
+        return linea, None, f"Estado inválido: {estado!r}"
+    try:
+        # Decimal como la columna numeric; NaN e Infinity no son precios
+        precio = Decimal((fila.get("precio") or "").strip())
+        if not precio.is_finite() or precio <= 0:
+            raise ValueError
+    except (InvalidOperation, ValueError):
+        return linea, None, "El precio debe ser un número válido mayor a 0"
+
+    return linea, (numero, tipo, precio, estado), ""
+
+
+def _preparar_huesped(linea: int, fila: dict) -> Tuple[int, Optional[tuple], str]:
+    """Valida una fila de huésped y hashea su contraseña -> (linea, valores o None, motivo)"""
+    nombre = (fila.get("nombre") or "").strip()
+    apellido = (fila.get("apellido") or "").strip()
+    telefono = (fila.get("telefono") or "").strip()
+    email = (fila.get("email") or "").strip()
+    password = (fila.get("password") or "").strip()
+
+    if not nombre or not apellido or not telefono:
+        return linea, None, "Nombre, apellido y teléfono son obligatorios"
+
+    password_hash = seguridad.hashear_password(password) if password else ""
+    return linea, (nombre, apellido, telefono, password_hash, email), ""
+
+
+class _Destino(NamedTuple):
+    columnas: Tuple[str, ...]
+    requeridas: Tuple[str, ...]
+    clave: str
+    preparar: Callable
+    usa_procesos: bool
+
+
+# Solo estas tablas y columnas llegan al SQL
+DESTINOS = {
+    "habitaciones": _Destino(
+        columnas=("numero", "tipo", "precio", "estado"),
+        requeridas=("numero", "tipo", "precio"),
+        clave="numero",
+        preparar=_preparar_habitacion,
+        usa_procesos=False
+    ),
+    "huespedes": _Destino(
+        columnas=("nombre", "apellido", "telefono", "password", "email"),
+        requeridas=("nombre", "apellido", "telefono"),
+        clave="telefono",
+        preparar=_preparar_huesped,
+        usa_procesos=True
+    ),
+}
+
+
+# ==================== CARGA ====================
+
+def importar_csv(db, tabla: str, ruta: str, procesos: Optional[int] = None,
+                 lote: int = TAMANO_LOTE,
+                 al_avanzar: Optional[Callable[[int, int], None]] = None) -> ResultadoImportacion:
+    """
+    Importa un CSV en la tabla indicada
+
+    Args:
+        db: DatabaseManager
+        tabla: "habitaciones" o "huespedes"
+        procesos: Procesos para validar/hashear (None = núcleos disponibles)
+        lote: Filas por transacción
+        al_avanzar: Callback (leidas, insertadas) después de cada lote
+    """
+    destino = DESTINOS.get(tabla)
+    if destino is None:
+        raise ValueError(f"Tabla no soportada para importación: {tabla}")
+
+    inicio = time.perf_counter()
+    leidas = insertadas = 0
+    rechazos: List[Rechazo] = []
+    executor = ProcessPoolExecutor(max_workers=procesos) if destino.usa_procesos else None
+
+    try:
+        with open(ruta, newline="", encoding="utf-8-sig") as archivo:
+            lector = csv.DictReader(archivo)
+            faltantes = [c for c in destino.requeridas if c not in (lector.fieldnames or [])]
+            if faltantes:
+                raise ValueError(f"Faltan columnas en el CSV: {', '.join(faltantes)}")
+
+            # La línea 1 es el encabezado
+            filas = enumerate(lector, start=2)
+            while True:
+                bloque = list(islice(filas, lote))
+                if not bloque:
+                    break
+
+                lineas = [linea for linea, _ in bloque]
+                datos = [fila for _, fila in bloque]
+                if executor is not None:
+                    preparadas = list(executor.map(destino.preparar, lineas, datos, chunksize=64))
+                else:
+                    preparadas = [destino.preparar(linea, fila) for linea, fila in bloque]
+
+                validas = []
+                for linea, valores, motivo in preparadas:
+                    if valores is None:
+                        rechazos.append(Rechazo(linea, motivo))
+                    else:
+                        validas.append((linea, valores))
+
+                if validas:
+                    cantidad, rechazos_lote = _cargar_lote(db, tabla, destino, validas)
+                    insertadas += cantidad
+                    rechazos.extend(rechazos_lote)
+
+                leidas += len(bloque)
+                if al_avanzar:
+                    al_avanzar(leidas, insertadas)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    rechazos.sort()
+    return ResultadoImportacion(tabla, leidas, insertadas, rechazos, time.perf_counter() - inicio)
+
+
+def _cargar_lote(db, tabla: str, destino: _Destino, validas) -> Tuple[int, List[Rechazo]]:
+    """COPY del lote a una tabla temporal y de ahí a la tabla real (una transacción)"""
+    columnas = ", ".join(destino.columnas)
+    clave = destino.clave
+    rechazos = []
+
+    with db._cursor(cambia=(tabla,)) as cur:
+        # Misma definición de columnas que la tabla destino
+        cur.execute(f"""
+                    CREATE TEMP TABLE _importacion ON COMMIT DROP AS
+                    SELECT 0 AS linea, {columnas}
+                    FROM {tabla} WITH NO DATA
+                    """)
+
+        buffer = io.StringIO()
+        # QUOTE_ALL: un texto vacío se guarda como '' y no como NULL
+        csv.writer(buffer, quoting=csv.QUOTE_ALL).writerows(
+            (linea, *valores) for linea, valores in validas
+        )
+        buffer.seek(0)
+
+        cur.execute("SAVEPOINT copia")
+        try:
+            cur.copy_expert(f"COPY _importacion (linea, {columnas}) FROM STDIN WITH (FORMAT csv)", buffer)
+        except psycopg2.DataError:
+            # Algún valor no encaja en el tipo de la columna: aislar fila por fila
+            cur.execute("ROLLBACK TO SAVEPOINT copia")
+            return _insertar_fila_a_fila(cur, tabla, destino, validas)
+        cur.execute("RELEASE SAVEPOINT copia")
+
+        # Repetidos dentro del mismo archivo (se conserva la primera aparición)
+        cur.execute(f"""
+                    DELETE FROM _importacion s
+                        USING (SELECT linea,
+                                      row_number() OVER (PARTITION BY {clave} ORDER BY linea) AS n
+                               FROM _importacion) d
+                    WHERE s.linea = d.linea
+                      AND d.n > 1
+                    RETURNING s.linea, s.{clave}
+                    """)
+        rechazos += [Rechazo(linea, f"{clave} {valor} repetido en el archivo")
+                     for linea, valor in cur.fetchall()]
+
+        # Ya existentes en la base de datos
+        cur.execute(f"""
+                    DELETE FROM _importacion s
+                        USING {tabla} t
+                    WHERE t.{clave} = s.{clave}
+                    RETURNING s.linea, s.{clave}
+                    """)
+        rechazos += [Rechazo(linea, f"UniqueViolation: {clave} {valor} ya existe")
+                     for linea, valor in cur.fetchall()]
+
+        cur.execute("SAVEPOINT insercion")
+        try:
+            # Solo se saltean los choques con la clave; cualquier otra restricción falla
+            cur.execute(f"""
+                        INSERT INTO {tabla} ({columnas})
+                        SELECT {columnas}
+                        FROM _importacion
+                        ORDER BY linea
+                        ON CONFLICT ({clave}) DO NOTHING
+                        RETURNING {clave}
+                        """)
+        except psycopg2.IntegrityError:
+            # NOT NULL, CHECK, FK u otro índice único: aislar fila por fila
+            cur.execute("ROLLBACK TO SAVEPOINT insercion")
+            cur.execute("SELECT linea FROM _importacion")
+            restantes = {fila[0] for fila in cur.fetchall()}
+            cantidad, rechazos_filas = _insertar_fila_a_fila(
+                cur, tabla, destino, [fila for fila in validas if fila[0] in restantes]
+            )
+            return cantidad, rechazos + rechazos_filas
+        insertadas = {fila[0] for fila in cur.fetchall()}
+        cur.execute("RELEASE SAVEPOINT insercion")
+
+        # Las que chocaron con una escritura concurrente
+        cur.execute(f"SELECT linea, {clave} FROM _importacion")
+        rechazos += [Rechazo(linea, f"UniqueViolation: {clave} {valor} ya existe")
+                     for linea, valor in cur.fetchall() if valor not in insertadas]
+
+    return len(insertadas), rechazos
+
+
+def _insertar_fila_a_fila(cur, tabla: str, destino: _Destino, validas) -> Tuple[int, List[Rechazo]]:
+    """Inserta cada fila en su propio savepoint para rechazar solo las que fallan"""
+    columnas = ", ".join(destino.columnas)
+    marcadores = ", ".join(["%s"] * len(destino.columnas))
+    insertadas = 0
+    rechazos = []
+
+    for linea, valores in validas:
+        cur.execute("SAVEPOINT fila")
+        try:
+            cur.execute(f"INSERT INTO {tabla} ({columnas}) VALUES ({marcadores})", valores)
+            cur.execute("RELEASE SAVEPOINT fila")
+            insertadas += 1
+        except psycopg2.Error as e:
+            cur.execute("ROLLBACK TO SAVEPOINT fila")
+            detalle = (e.pgerror or str(e)).strip().splitlines()[0]
+            rechazos.append(Rechazo(linea, f"{type(e).__name__}: {detalle}"))
+
+    return insertadas, rechazos
+
+
+def guardar_rechazos(rechazos: List[Rechazo], ruta: str):
+    """Escribe los rechazos en un CSV (linea, motivo)"""
+    with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow(Rechazo._fields)
+        escritor.writerows(rechazos)
+
+
+if __name__ == "__main__":
+    from database.db_manager import DatabaseManager
+
+    parser = argparse.ArgumentParser(description="Importación masiva desde CSV")
+    parser.add_argument("tabla", choices=sorted(DESTINOS))
+    parser.add_argument("archivo", help="Ruta del CSV (UTF-8, con encabezado)")
+    parser.add_argument("--procesos", type=int, default=None,
+                        help="Procesos para validar/hashear (default: núcleos)")
+    parser.add_argument("--lote", type=int, default=TAMANO_LOTE, help="Filas por transacción")
+    parser.add_argument("--rechazos", help="CSV donde guardar las filas rechazadas")
+    args = parser.parse_args()
+
+    db = DatabaseManager()
+    try:
+        resultado = importar_csv(
+            db, args.tabla, args.archivo, args.procesos, args.lote,
+            al_avanzar=lambda leidas, insertadas: print(f"  {leidas} leídas, {insertadas} insertadas")
+        )
+    finally:
+        db.cerrar()
+
+    print(f"\n✓ {resultado.insertadas} de {resultado.leidas} filas importadas en "
+          f"{resultado.segundos:.1f}s ({len(resultado.rechazos)} rechazadas)")
+
+    for rechazo in resultado.rechazos[:20]:
+        print(f"  línea {rechazo.linea}: {rechazo.motivo}")
+    if len(resultado.rechazos) > 20:
+        print(f"  ... y {len(resultado.rechazos) - 20} más")
+
+    if args.rechazos and resultado.rechazos:
+        guardar_rechazos(resultado.rechazos, args.rechazos)
+        print(f"Rechazos guardados en {args.rechazos}")
@@ -0,0 +1,321 @@
+# database/instrumentacion.py
+"""
+Instrumentación de consultas de DatabaseManager
+
+Cada cursor que presta DatabaseManager mide sus consultas: método que la
+originó, huella del SQL (sin valores), cantidad de parámetros, filas
+devueltas, tiempo de ida (execute) y de lectura (fetch). Las mediciones
+quedan en un buffer circular en memoria para el panel de diagnóstico, y las
+lentas (o con error) se escriben como JSON por línea en un archivo.
+
+Variables de entorno:
+    DB_INSTRUMENTAR=0          desactiva la medición
+    DB_UMBRAL_LENTA_MS=200     umbral de consulta lenta
+    DB_LOG_LENTAS=ruta.jsonl   archivo de consultas lentas (default logs/consultas_lentas.jsonl)
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional
+
+from psycopg2.extensions import cursor as CursorBase
+
+CAPACIDAD_BUFFER = 5000
+
+RUTA_LOG_LENTAS = os.getenv(
+    "DB_LOG_LENTAS",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logs", "consultas_lentas.jsonl")
+)
+
+
+class Medicion(NamedTuple):
+    """Una consulta medida"""
+    momento: float  # time.time() al terminar
+    metodo: str
+    huella: str
+    parametros: int
+    filas: int
+    ida_ms: float
+    lectura_ms: float
+    error: Optional[str] = None
+
+    @property
+    def total_ms(self) -> float:
+        return self.ida_ms + self.lectura_ms
+
+
+class ResumenMetodo(NamedTuple):
+    """Percentiles de tiempo total de un método"""
+    metodo: str
+    llamadas: int
+    errores: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    filas_promedio: float
+
+
+# ==================== HUELLA DEL SQL ====================
+
+_COMENTARIOS = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_TEXTOS = re.compile(r"'(?:[^']|'')*'")
+_NUMEROS = re.compile(r"\b\d+(?:\.\d+)?\b")
+_MARCADORES = re.compile(r"%\((\w+)\)s|%s")
+_LISTAS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_ESPACIOS = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=512)
+def huella_sql(sql) -> str:
+    """SQL normalizado: sin comentarios ni valores, espacios colapsados"""
+    if isinstance(sql, bytes):
+        sql = sql.decode("utf-8", "replace")
+    sql = str(sql)
+    sql = _COMENTARIOS.sub(" ", sql)
+    sql = _TEXTOS.sub("?", sql)
+    sql = _MARCADORES.sub("?", sql)
+    sql = _NUMEROS.sub("?", sql)
+    sql = _LISTAS.sub("(?...)", sql)
+    return _ESPACIOS.sub(" ", sql).strip()
+
+
+def _contar_parametros(parametros) -> int:
+    if parametros is None:
+        return 0
+    try:
+        return len(parametros)
+    except TypeError:
+        return 1
+
+
+# ==================== REGISTRO ====================
+
+class Instrumentacion:
+    """Buffer circular de mediciones y log de consultas lentas"""
+
+    def __init__(self, capacidad: int = CAPACIDAD_BUFFER, umbral_ms: Optional[float] = None,
+                 ruta_log: str = RUTA_LOG_LENTAS):
+        self.umbral_ms = umbral_ms if umbral_ms is not None else float(os.getenv("DB_UMBRAL_LENTA_MS", 200))
+        self.ruta_log = ruta_log
+        self.activa = os.getenv("DB_INSTRUMENTAR", "1") != "0"
+        self._mediciones: "deque[Medicion]" = deque(maxlen=capacidad)
+        self._lock = threading.Lock()
+        self._lock_log = threading.Lock()
+
+    def registrar(self, medicion: Medicion):
+        with self._lock:
+            self._mediciones.append(medicion)
+
+        if medicion.error or medicion.total_ms >= self.umbral_ms:
+            self._escribir_log(medicion)
+
+    def mediciones(self) -> List[Medicion]:
+        """Copia de las mediciones en el buffer (de la más vieja a la más nueva)"""
+        with self._lock:
+            return list(self._mediciones)
+
+    def lentas(self, limite: int = 50) -> List[Medicion]:
+        """Las últimas consultas lentas o con error, de la más nueva a la más vieja"""
+        lentas = [m for m in self.mediciones() if m.error or m.total_ms >= self.umbral_ms]
+        return lentas[::-1][:limite]
+
+    def resumen(self) -> List[ResumenMetodo]:
+        """p50/p95/p99 por método, del más lento (p95) al más rápido"""
+        por_metodo: Dict[str, List[Medicion]] = {}
+        for medicion in self.mediciones():
+            por_metodo.setdefault(medicion.metodo, []).append(medicion)
+
+        resumen = []
+        for metodo, lista in por_metodo.items():
+            tiempos = sorted(m.total_ms for m in lista)
+            resumen.append(ResumenMetodo(
+                metodo=metodo,
+                llamadas=len(lista),
+                errores=sum(1 for m in lista if m.error),
+                p50_ms=_percentil(tiempos, 50),
+                p95_ms=_percentil(tiempos, 95),
+                p99_ms=_percentil(tiempos, 99),
+                max_ms=tiempos[-1],
+                filas_promedio=sum(m.filas for m in lista) / len(lista)
+            ))
+        return sorted(resumen, key=lambda r: r.p95_ms, reverse=True)
+
+    def limpiar(self):
+        with self._lock:
+            self._mediciones.clear()
+
+    def _escribir_log(self, medicion: Medicion):
+        entrada = {
+            "momento": datetime.fromtimestamp(medicion.momento).isoformat(timespec="milliseconds"),
+            "tipo": "error" if medicion.error else "lenta",
+            "metodo": medicion.metodo,
+            "huella": medicion.huella,
+            "parametros": medicion.parametros,
+            "filas": medicion.filas,
+            "ida_ms": round(medicion.ida_ms, 2),
+            "lectura_ms": round(medicion.lectura_ms, 2),
+            "total_ms": round(medicion.total_ms, 2),
+            "umbral_ms": self.umbral_ms,
+        }
+        if medicion.error:
+            entrada["error"] = medicion.error
+
+        try:
+            with self._lock_log:
+                os.makedirs(os.path.dirname(self.ruta_log), exist_ok=True)
+                with open(self.ruta_log, "a", encoding="utf-8") as archivo:
+                    archivo.write(json.dumps(entrada, ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"Error al escribir log de consultas lentas: {e}")
+
+
+def _percentil(ordenados: List[float], p: float) -> float:
+    """Percentil por rango más cercano sobre una lista ordenada"""
+    if not ordenados:
+        return 0.0
+    indice = max(0, min(len(ordenados) - 1, int(round(p / 100 * len(ordenados))) - 1))
+    return ordenados[indice]
+
+
+# ==================== CURSOR ====================
+
+class CursorInstrumentado(CursorBase):
+    """
+    Cursor de psycopg2 que mide cada consulta
+
+    La medición de una consulta se cierra al ejecutar la siguiente o al
+    cerrar el cursor, así incluye el tiempo de todos sus fetch.
+    """
+
+    metodo = "?"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pendiente = None  # [sql, parametros, ida_ms, lectura_ms, filas, leyo]
+
+    # ----- Ejecución -----
+
+    def execute(self, query, vars=None):
+        return self._medir_ejecucion(super().execute, query, vars)
+
+    def executemany(self, query, vars_list):
+        return self._medir_ejecucion(super().executemany, query, vars_list)
+
+    def copy_expert(self, sql, file, size=8192):
+        return self._medir_ejecucion(lambda q, _: CursorBase.copy_expert(self, q, file, size), sql, None)
+
+    def _medir_ejecucion(self, ejecutar, query, parametros):
+        self._cerrar_medicion()
+        inicio = time.perf_counter()
+        try:
+            resultado = ejecutar(query, parametros)
+        except Exception as e:
+            self._pendiente = [query, parametros, (time.perf_counter() - inicio) * 1000, 0.0, 0, False]
+            detalle = str(e).strip().splitlines()
+            self._cerrar_medicion(error=f"{type(e).__name__}: {detalle[0] if detalle else ''}")
+            raise
+        self._pendiente = [query, parametros, (time.perf_counter() - inicio) * 1000, 0.0, 0, False]
+        return resultado
+
+    # ----- Lectura -----
+
+    def fetchone(self):
+        fila = self._medir_lectura(super().fetchone)
+        self._contar(1 if fila is not None else 0)
+        return fila
+
+    def fetchmany(self, size=None):
+        filas = self._medir_lectura(super().fetchmany, size if size is not None else self.arraysize)
+        self._contar(len(filas))
+        return filas
+
+    def fetchall(self):
+        filas = self._medir_lectura(super().fetchall)
+        self._contar(len(filas))
+        return filas
+
+    def __iter__(self):
+        # Por lotes de itersize (en cursores con nombre, un FETCH por lote)
+        while True:
+            filas = self.fetchmany(self.itersize)
+            if not filas:
+                return
+            yield from filas
+
+    def close(self):
+        self._cerrar_medicion()
+        super().close()
+
+    def _medir_lectura(self, leer, *args):
+        inicio = time.perf_counter()
+        try:
+            return leer(*args)
+        finally:
+            if self._pendiente is not None:
+                self._pendiente[3] += (time.perf_counter() - inicio) * 1000
+
+    def _contar(self, filas: int):
+        if self._pendiente is not None:
+            self._pendiente[4] += filas
+            self._pendiente[5] = True
+
+    def _cerrar_medicion(self, error: Optional[str] = None):
+        pendiente, self._pendiente = self._pendiente, None
+        if pendiente is None:
+            return
+        sql, parametros, ida_ms, lectura_ms, filas, leyo = pendiente
+        if not leyo and error is None:
+            # INSERT/UPDATE/DELETE: filas afectadas
+            filas = max(self.rowcount, 0)
+
+        obtener_instrumentacion().registrar(Medicion(
+            momento=time.time(),
+            metodo=self.metodo,
+            huella=huella_sql(sql),
+            parametros=_contar_parametros(parametros),
+            filas=filas,
+            ida_ms=ida_ms,
+            lectura_ms=lectura_ms,
+            error=error
+        ))
+
+
+def metodo_llamador(profundidad: int = 2) -> str:
+    """
+    Nombre del método público de DatabaseManager que originó la consulta
+
+    Sube por la pila desde quien pidió el cursor; si la consulta no viene de
+    DatabaseManager (servicios, scripts) devuelve el primer llamador.
+    """
+    frame = sys._getframe(profundidad)
+    primero = None
+    while frame is not None:
+        codigo = frame.f_code
+        if frame.f_globals.get("__name__") != "contextlib":
+            if primero is None:
+                primero = codigo.co_name
+            if frame.f_globals.get("__name__") == "database.db_manager" and not codigo.co_name.startswith("_"):
+                return codigo.co_name
+        frame = frame.f_back
+    return primero or "?"
+
+
+# ==================== FUNCIONES DE ACCESO RÁPIDO ====================
+
+_instrumentacion: Optional[Instrumentacion] = None
+
+
+def obtener_instrumentacion() -> Instrumentacion:
+    """Instrumentación compartida por toda la aplicación"""
+    global _instrumentacion
+    if _instrumentacion is None:
+        _instrumentacion = Instrumentacion()
+    return _instrumentacion
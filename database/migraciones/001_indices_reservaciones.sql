@@ -0,0 +1,6 @@
+-- Índices para la paginación por keyset de reservaciones (fecha_entrada DESC, id DESC)
+CREATE INDEX IF NOT EXISTS idx_reservaciones_entrada_id
+    ON reservaciones (fecha_entrada DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_reservaciones_estado_entrada_id
+    ON reservaciones (estado, fecha_entrada DESC, id DESC);
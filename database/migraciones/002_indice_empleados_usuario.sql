@@ -0,0 +1,3 @@
+-- Índice para validar_login: búsqueda del empleado por usuario
+CREATE INDEX IF NOT EXISTS idx_empleados_usuario
+    ON empleados (usuario);
@@ -0,0 +1,68 @@
+-- Resumen de contadores del dashboard mantenido por triggers
+-- (habitaciones por estado y total de empleados en una sola tabla)
+LOCK TABLE habitaciones, empleados IN SHARE ROW EXCLUSIVE MODE;
+
+CREATE TABLE IF NOT EXISTS estadisticas_resumen
+(
+    clave TEXT PRIMARY KEY,
+    valor BIGINT NOT NULL DEFAULT 0
+);
+
+CREATE OR REPLACE FUNCTION sumar_estadistica(p_clave TEXT, p_delta INTEGER) RETURNS void AS
+$$
+BEGIN
+    INSERT INTO estadisticas_resumen (clave, valor)
+    VALUES (p_clave, p_delta)
+    ON CONFLICT (clave) DO UPDATE SET valor = estadisticas_resumen.valor + EXCLUDED.valor;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION trg_estadisticas_habitaciones() RETURNS trigger AS
+$$
+BEGIN
+    IF TG_OP = 'UPDATE' AND OLD.estado IS NOT DISTINCT FROM NEW.estado THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM sumar_estadistica('habitaciones:' || COALESCE(OLD.estado, ''), -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM sumar_estadistica('habitaciones:' || COALESCE(NEW.estado, ''), 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION trg_estadisticas_empleados() RETURNS trigger AS
+$$
+BEGIN
+    PERFORM sumar_estadistica('empleados', CASE WHEN TG_OP = 'INSERT' THEN 1 ELSE -1 END);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS estadisticas_habitaciones ON habitaciones;
+CREATE TRIGGER estadisticas_habitaciones
+    AFTER INSERT OR DELETE OR UPDATE OF estado
+    ON habitaciones
+    FOR EACH ROW
+EXECUTE FUNCTION trg_estadisticas_habitaciones();
+
+DROP TRIGGER IF EXISTS estadisticas_empleados ON empleados;
+CREATE TRIGGER estadisticas_empleados
+    AFTER INSERT OR DELETE
+    ON empleados
+    FOR EACH ROW
+EXECUTE FUNCTION trg_estadisticas_empleados();
+
+-- Carga inicial (las tablas están bloqueadas, no se pierden escrituras)
+DELETE FROM estadisticas_resumen;
+
+INSERT INTO estadisticas_resumen (clave, valor)
+SELECT 'habitaciones:' || COALESCE(estado, ''), COUNT(*)
+FROM habitaciones
+GROUP BY 1;
+
+INSERT INTO estadisticas_resumen (clave, valor)
+SELECT 'empleados', COUNT(*)
+FROM empleados;
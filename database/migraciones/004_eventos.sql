@@ -0,0 +1,26 @@
+-- Registro de eventos (solo inserción) para el feed de actividad reciente
+CREATE TABLE IF NOT EXISTS eventos
+(
+    id            BIGSERIAL PRIMARY KEY,
+    creado_en     TIMESTAMPTZ NOT NULL DEFAULT now(),
+    tipo          TEXT        NOT NULL,
+    habitacion_id INTEGER,
+    reserva_id    INTEGER,
+    detalle       TEXT
+);
+
+-- El feed lee por id (índice de la clave primaria): los últimos N y los mayores al último visto
+
+CREATE OR REPLACE FUNCTION trg_eventos_solo_insercion() RETURNS trigger AS
+$$
+BEGIN
+    RAISE EXCEPTION 'La tabla eventos solo admite inserciones';
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS eventos_solo_insercion ON eventos;
+CREATE TRIGGER eventos_solo_insercion
+    BEFORE UPDATE OR DELETE
+    ON eventos
+    FOR EACH ROW
+EXECUTE FUNCTION trg_eventos_solo_insercion();
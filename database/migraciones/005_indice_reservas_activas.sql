@@ -0,0 +1,5 @@
+-- Índice parcial para el motor de disponibilidad: solo reservas activas,
+-- por fecha de salida (las que ya terminaron no se leen)
+CREATE INDEX IF NOT EXISTS idx_reservaciones_activas_salida
+    ON reservaciones (fecha_salida) INCLUDE (habitacion_id, fecha_entrada)
+    WHERE estado = 'activa';
@@ -0,0 +1,18 @@
+-- Impide dos reservas activas de la misma habitación con fechas solapadas
+-- ([entrada, salida): la salida de una puede ser la entrada de otra).
+-- Falla si ya existen solapes; resolverlos antes de aplicar.
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+DO
+$$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'reservaciones_sin_solape') THEN
+        ALTER TABLE reservaciones
+            ADD CONSTRAINT reservaciones_sin_solape
+                EXCLUDE USING gist (
+                habitacion_id WITH =,
+                daterange(fecha_entrada, fecha_salida, '[)') WITH &&
+                ) WHERE (estado = 'activa');
+    END IF;
+END
+$$;
@@ -0,0 +1,47 @@
+-- Rollup diario de noches vendidas, ingresos, entradas y salidas por tipo
+-- de habitación (lo mantiene database/rollup.py de forma incremental).
+-- Después de aplicarla: python -m database.rollup
+
+-- Marca de última modificación para saber qué reservas cambiaron
+ALTER TABLE reservaciones
+    ADD COLUMN IF NOT EXISTS actualizado_en TIMESTAMPTZ NOT NULL DEFAULT now();
+
+CREATE INDEX IF NOT EXISTS idx_reservaciones_actualizado_en
+    ON reservaciones (actualizado_en);
+
+CREATE OR REPLACE FUNCTION marcar_actualizado_en() RETURNS trigger AS
+$$
+BEGIN
+    NEW.actualizado_en := now();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS reservaciones_actualizado_en ON reservaciones;
+CREATE TRIGGER reservaciones_actualizado_en
+    BEFORE UPDATE
+    ON reservaciones
+    FOR EACH ROW
+EXECUTE FUNCTION marcar_actualizado_en();
+
+CREATE TABLE IF NOT EXISTS estadisticas_diarias
+(
+    dia             DATE    NOT NULL,
+    tipo            TEXT    NOT NULL,
+    noches_vendidas INTEGER NOT NULL DEFAULT 0,
+    ingresos        NUMERIC NOT NULL DEFAULT 0,
+    entradas        INTEGER NOT NULL DEFAULT 0,
+    salidas         INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (dia, tipo)
+);
+
+-- Hasta dónde llegó cada rollup (NULL = nunca se ejecutó)
+CREATE TABLE IF NOT EXISTS rollup_marcas
+(
+    nombre TEXT PRIMARY KEY,
+    marca  TIMESTAMPTZ
+);
+
+INSERT INTO rollup_marcas (nombre)
+VALUES ('estadisticas_diarias')
+ON CONFLICT (nombre) DO NOTHING;
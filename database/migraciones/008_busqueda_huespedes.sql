@@ -0,0 +1,20 @@
+-- Búsqueda de huéspedes por fragmentos de nombre, teléfono o email
+-- (DatabaseManager.buscar_huespedes) con un índice de trigramas.
+-- pg_trgm viene con PostgreSQL (contrib); crear la extensión requiere
+-- permisos de owner de la base.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Texto en el que se busca: nombre completo, email y teléfono con y sin
+-- separadores, en minúsculas. IMMUTABLE para poder indexarlo.
+CREATE OR REPLACE FUNCTION huesped_texto_busqueda(nombre TEXT, apellido TEXT, telefono TEXT, email TEXT)
+    RETURNS TEXT AS
+$$
+SELECT lower(coalesce(nombre, '') || ' ' || coalesce(apellido, '') || ' ' ||
+             coalesce(email, '') || ' ' || coalesce(telefono, '') || ' ' ||
+             regexp_replace(coalesce(telefono, ''), '[^0-9]', '', 'g'))
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+-- Sirve para LIKE '%fragmento%' y para la similitud por palabras (<%)
+CREATE INDEX IF NOT EXISTS idx_huespedes_busqueda_trgm
+    ON huespedes USING gin (huesped_texto_busqueda(nombre, apellido, telefono, email) gin_trgm_ops);
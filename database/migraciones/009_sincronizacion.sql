@@ -0,0 +1,88 @@
+-- Seguimiento de cambios para DatabaseManager.obtener_cambios_desde: cada
+-- tabla que se sincroniza lleva actualizado_en (como reservaciones desde la
+-- migración 007) y las filas borradas dejan una lápida en filas_eliminadas.
+-- Los DELETE siguen siendo reales: las claves foráneas y las consultas no
+-- cambian.
+
+ALTER TABLE habitaciones
+    ADD COLUMN IF NOT EXISTS actualizado_en TIMESTAMPTZ NOT NULL DEFAULT now();
+ALTER TABLE empleados
+    ADD COLUMN IF NOT EXISTS actualizado_en TIMESTAMPTZ NOT NULL DEFAULT now();
+ALTER TABLE huespedes
+    ADD COLUMN IF NOT EXISTS actualizado_en TIMESTAMPTZ NOT NULL DEFAULT now();
+
+CREATE INDEX IF NOT EXISTS idx_habitaciones_actualizado_en ON habitaciones (actualizado_en);
+CREATE INDEX IF NOT EXISTS idx_empleados_actualizado_en ON empleados (actualizado_en);
+CREATE INDEX IF NOT EXISTS idx_huespedes_actualizado_en ON huespedes (actualizado_en);
+
+-- marcar_actualizado_en() está definida en la migración 007
+DROP TRIGGER IF EXISTS habitaciones_actualizado_en ON habitaciones;
+CREATE TRIGGER habitaciones_actualizado_en
+    BEFORE UPDATE
+    ON habitaciones
+    FOR EACH ROW
+EXECUTE FUNCTION marcar_actualizado_en();
+
+DROP TRIGGER IF EXISTS empleados_actualizado_en ON empleados;
+CREATE TRIGGER empleados_actualizado_en
+    BEFORE UPDATE
+    ON empleados
+    FOR EACH ROW
+EXECUTE FUNCTION marcar_actualizado_en();
+
+DROP TRIGGER IF EXISTS huespedes_actualizado_en ON huespedes;
+CREATE TRIGGER huespedes_actualizado_en
+    BEFORE UPDATE
+    ON huespedes
+    FOR EACH ROW
+EXECUTE FUNCTION marcar_actualizado_en();
+
+-- Lápidas: qué id se borró de qué tabla y cuándo
+CREATE TABLE IF NOT EXISTS filas_eliminadas
+(
+    tabla        TEXT        NOT NULL,
+    fila_id      INTEGER     NOT NULL,
+    eliminado_en TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (tabla, fila_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_filas_eliminadas_tabla_eliminado_en
+    ON filas_eliminadas (tabla, eliminado_en);
+
+CREATE OR REPLACE FUNCTION registrar_fila_eliminada() RETURNS trigger AS
+$$
+BEGIN
+    INSERT INTO filas_eliminadas (tabla, fila_id)
+    VALUES (TG_TABLE_NAME, OLD.id)
+    ON CONFLICT (tabla, fila_id) DO UPDATE SET eliminado_en = now();
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS habitaciones_eliminada ON habitaciones;
+CREATE TRIGGER habitaciones_eliminada
+    AFTER DELETE
+    ON habitaciones
+    FOR EACH ROW
+EXECUTE FUNCTION registrar_fila_eliminada();
+
+DROP TRIGGER IF EXISTS empleados_eliminada ON empleados;
+CREATE TRIGGER empleados_eliminada
+    AFTER DELETE
+    ON empleados
+    FOR EACH ROW
+EXECUTE FUNCTION registrar_fila_eliminada();
+
+DROP TRIGGER IF EXISTS huespedes_eliminada ON huespedes;
+CREATE TRIGGER huespedes_eliminada
+    AFTER DELETE
+    ON huespedes
+    FOR EACH ROW
+EXECUTE FUNCTION registrar_fila_eliminada();
+
+DROP TRIGGER IF EXISTS reservaciones_eliminada ON reservaciones;
+CREATE TRIGGER reservaciones_eliminada
+    AFTER DELETE
+    ON reservaciones
+    FOR EACH ROW
+EXECUTE FUNCTION registrar_fila_eliminada();
@@ -0,0 +1,54 @@
+-- Aviso inmediato a las demás terminales (database/notificaciones.py) de
+-- cada fila creada, modificada o borrada en habitaciones y reservaciones.
+-- El payload es JSON chico: tabla, operación, id y, para reservas, la
+-- habitación y el rango de fechas (para invalidar solo los reportes que
+-- se cruzan). Se entrega al confirmar la transacción.
+
+CREATE OR REPLACE FUNCTION notificar_cambio() RETURNS trigger AS
+$$
+DECLARE
+    fila    RECORD;
+    payload JSON;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        fila := OLD;
+    ELSE
+        fila := NEW;
+    END IF;
+
+    IF TG_TABLE_NAME = 'reservaciones' THEN
+        payload := json_build_object(
+                'tabla', TG_TABLE_NAME,
+                'op', TG_OP,
+                'id', fila.id,
+                'habitacion_id', fila.habitacion_id,
+                -- Si cambiaron las fechas, el rango cubre las viejas y las nuevas
+                'fecha_entrada', CASE WHEN TG_OP = 'UPDATE'
+                                          THEN least(OLD.fecha_entrada, NEW.fecha_entrada)
+                                      ELSE fila.fecha_entrada END,
+                'fecha_salida', CASE WHEN TG_OP = 'UPDATE'
+                                         THEN greatest(OLD.fecha_salida, NEW.fecha_salida)
+                                     ELSE fila.fecha_salida END
+                   );
+    ELSE
+        payload := json_build_object('tabla', TG_TABLE_NAME, 'op', TG_OP, 'id', fila.id);
+    END IF;
+
+    PERFORM pg_notify('hotel_cambios', payload::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS habitaciones_notificar ON habitaciones;
+CREATE TRIGGER habitaciones_notificar
+    AFTER INSERT OR UPDATE OR DELETE
+    ON habitaciones
+    FOR EACH ROW
+EXECUTE FUNCTION notificar_cambio();
+
+DROP TRIGGER IF EXISTS reservaciones_notificar ON reservaciones;
+CREATE TRIGGER reservaciones_notificar
+    AFTER INSERT OR UPDATE OR DELETE
+    ON reservaciones
+    FOR EACH ROW
+EXECUTE FUNCTION notificar_cambio();
@@ -0,0 +1,57 @@
+-- Avisos de huéspedes y de qué cambió en una habitación.
+-- Los reportes en caché (database/cache_reportes.py) muestran número y tipo
+-- de habitación y nombres de huéspedes: un cambio de esos datos en otra
+-- terminal tiene que vaciarlos, pero un cambio de estado (check-in,
+-- check-out, limpieza) no. `solo_estado` lo distingue en el payload.
+
+CREATE OR REPLACE FUNCTION notificar_cambio() RETURNS trigger AS
+$$
+DECLARE
+    fila    RECORD;
+    payload JSON;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        fila := OLD;
+    ELSE
+        fila := NEW;
+    END IF;
+
+    IF TG_TABLE_NAME = 'reservaciones' THEN
+        payload := json_build_object(
+                'tabla', TG_TABLE_NAME,
+                'op', TG_OP,
+                'id', fila.id,
+                'habitacion_id', fila.habitacion_id,
+                -- Si cambiaron las fechas, el rango cubre las viejas y las nuevas
+                'fecha_entrada', CASE WHEN TG_OP = 'UPDATE'
+                                          THEN least(OLD.fecha_entrada, NEW.fecha_entrada)
+                                      ELSE fila.fecha_entrada END,
+                'fecha_salida', CASE WHEN TG_OP = 'UPDATE'
+                                         THEN greatest(OLD.fecha_salida, NEW.fecha_salida)
+                                     ELSE fila.fecha_salida END
+                   );
+    ELSIF TG_TABLE_NAME = 'habitaciones' THEN
+        payload := json_build_object(
+                'tabla', TG_TABLE_NAME,
+                'op', TG_OP,
+                'id', fila.id,
+                'solo_estado', TG_OP = 'UPDATE'
+                                   AND OLD.numero IS NOT DISTINCT FROM NEW.numero
+                                   AND OLD.tipo IS NOT DISTINCT FROM NEW.tipo
+                                   AND OLD.precio IS NOT DISTINCT FROM NEW.precio
+                   );
+    ELSE
+        payload := json_build_object('tabla', TG_TABLE_NAME, 'op', TG_OP, 'id', fila.id);
+    END IF;
+
+    PERFORM pg_notify('hotel_cambios', payload::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS huespedes_notificar ON huespedes;
+CREATE TRIGGER huespedes_notificar
+    AFTER INSERT OR UPDATE OR DELETE
+    ON huespedes
+    FOR EACH ROW
+EXECUTE FUNCTION notificar_cambio();
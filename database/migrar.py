@@ -0,0 +1,55 @@
+# database/migrar.py
+"""
+Aplica en orden los scripts de database/migraciones que aún no se ejecutaron
+
+Uso:
+    python -m database.migrar
+"""
+
+import os
+from database.db_manager import DatabaseManager
+
+CARPETA_MIGRACIONES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migraciones")
+
+
+def migraciones_disponibles():
+    """Lista los scripts .sql ordenados por nombre (prefijo numérico)"""
+    return sorted(f for f in os.listdir(CARPETA_MIGRACIONES) if f.endswith(".sql"))
+
+
+def aplicar_migraciones(db: DatabaseManager):
+    """Ejecuta cada migración pendiente en su propia transacción"""
+    with db._cursor() as cur:
+        cur.execute("""
+                    CREATE TABLE IF NOT EXISTS schema_migraciones
+                    (
+                        nombre     TEXT PRIMARY KEY,
+                        aplicada_en TIMESTAMPTZ NOT NULL DEFAULT now()
+                    )
+                    """)
+        cur.execute("SELECT nombre FROM schema_migraciones")
+        aplicadas = {fila[0] for fila in cur.fetchall()}
+
+    nuevas = []
+    for nombre in migraciones_disponibles():
+        if nombre in aplicadas:
+            continue
+        with open(os.path.join(CARPETA_MIGRACIONES, nombre), encoding="utf-8") as archivo:
+            sql = archivo.read()
+        with db._cursor() as cur:
+            cur.execute(sql)
+            cur.execute("INSERT INTO schema_migraciones (nombre) VALUES (%s)", (nombre,))
+        print(f"✓ Migración aplicada: {nombre}")
+        nuevas.append(nombre)
+
+    return nuevas
+
+
+if __name__ == "__main__":
+    db = DatabaseManager()
+    try:
+        aplicadas = aplicar_migraciones(db)
+        if not aplicadas:
+            print("✓ La base de datos ya está al día")
+    finally:
+        db.cerrar()
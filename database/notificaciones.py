@@ -0,0 +1,219 @@
+# database/notificaciones.py
+"""
+Avisos de cambios hechos por otras terminales (LISTEN/NOTIFY)
+
+Los triggers de migraciones/010 y 011 publican en el canal `hotel_cambios`
+cada fila que cambia en habitaciones, reservaciones o huéspedes. Un hilo en segundo plano
+escucha con una conexión propia (fuera del pool) y convierte cada aviso en
+las mismas invalidaciones que produce una escritura local:
+
+- DatabaseManager._registrar_cambio(tablas): sube la versión de la tabla
+  (controladores y vistas en caché) y avisa a disponibilidad y estadísticas
+- DatabaseManager._registrar_cambio_reserva(entrada, salida): descarta solo
+  los reportes cuyo rango se cruza con la reserva
+
+Los avisos de las conexiones de esta misma terminal se ignoran (ya se
+invalidó al escribir). El hilo de Tk no recibe llamadas desde este hilo:
+pregunta con recoger() qué tablas cambiaron desde la última vez.
+
+LISTEN necesita una conexión de sesión (puerto directo o pooler en modo
+sesión, no el de transacciones). DB_NOTIFICACIONES=0 lo desactiva.
+"""
+
+import json
+import os
+import select
+import threading
+from datetime import date
+from typing import Iterable, List, NamedTuple, Optional, Set
+
+import psycopg2
+
+# Canal de los triggers (migraciones/010)
+CANAL_CAMBIOS = "hotel_cambios"
+
+# Tablas que publican avisos
+TABLAS_NOTIFICADAS = ("habitaciones", "reservaciones", "huespedes")
+
+# Segundos que espera select() antes de revisar si hay que detenerse
+ESPERA_AVISOS = 1.0
+
+# Espera entre reintentos de conexión (se duplica hasta el máximo)
+REINTENTO_INICIAL = 1.0
+REINTENTO_MAXIMO = 30.0
+
+
+class Notificacion(NamedTuple):
+    """Una fila que cambió en otra terminal"""
+    tabla: str
+    operacion: str  # INSERT, UPDATE o DELETE
+    id: int
+    habitacion_id: Optional[int] = None
+    fecha_entrada: Optional[date] = None
+    fecha_salida: Optional[date] = None
+    solo_estado: bool = False  # habitación: cambió el estado y nada más
+
+
+def leer_notificacion(payload: str) -> Optional[Notificacion]:
+    """Notificación desde el JSON del trigger (None si no se entiende)"""
+    try:
+        datos = json.loads(payload)
+        entrada, salida = datos.get("fecha_entrada"), datos.get("fecha_salida")
+        return Notificacion(
+            datos["tabla"],
+            datos["op"],
+            int(datos["id"]),
+            datos.get("habitacion_id"),
+            date.fromisoformat(entrada) if entrada else None,
+            date.fromisoformat(salida) if salida else None,
+            bool(datos.get("solo_estado")),
+        )
+    except (ValueError, KeyError, TypeError) as e:
+        print(f"Aviso de cambio inválido ({e}): {payload!r}")
+        return None
+
+
+class EscuchaCambios:
+    """
+    Hilo que escucha `hotel_cambios` y reconecta solo si se corta
+
+    Args:
+        db: DatabaseManager al que se le registran los cambios
+        crear: Función que abre una conexión nueva
+    """
+
+    def __init__(self, db, crear):
+        self.db = db
+        self.crear = crear
+        self.activa = os.getenv("DB_NOTIFICACIONES", "1") != "0"
+
+        self._lock = threading.Lock()
+        self._pendientes: Set[str] = set()
+        self._detener = threading.Event()
+        self._hilo: Optional[threading.Thread] = None
+        self._conn = None
+
+        self.recibidas = 0
+        self.ignoradas = 0
+        self.reconexiones = 0
+
+    # ==================== API ====================
+
+    def iniciar(self):
+        """Arranca el hilo (no hace nada si ya corre o si está desactivado)"""
+        if not self.activa or (self._hilo is not None and self._hilo.is_alive()):
+            return
+        self._detener.clear()
+        self._hilo = threading.Thread(target=self._bucle, name="db-notificaciones", daemon=True)
+        self._hilo.start()
+
+    def detener(self):
+        """Detiene el hilo y cierra su conexión"""
+        self._detener.set()
+        if self._hilo is not None:
+            self._hilo.join(timeout=ESPERA_AVISOS * 2)
+            self._hilo = None
+
+    def recoger(self) -> Set[str]:
+        """Tablas que cambiaron en otras terminales desde la última llamada"""
+        with self._lock:
+            tablas, self._pendientes = self._pendientes, set()
+        return tablas
+
+    @property
+    def conectada(self) -> bool:
+        conn = self._conn
+        return conn is not None and not conn.closed
+
+    # ==================== HILO ====================
+
+    def _bucle(self):
+        espera = REINTENTO_INICIAL
+        primera = True
+        while not self._detener.is_set():
+            try:
+                self._conn = self._conectar()
+                if not primera:
+                    # Lo que pasó mientras no había conexión no se avisó
+                    self.reconexiones += 1
+                    self._perdidos()
+                primera = False
+                espera = REINTENTO_INICIAL
+                self._escuchar(self._conn)
+            except Exception as e:
+                print(f"Error en la escucha de cambios: {e}")
+            finally:
+                self._cerrar_conexion()
+
+            if self._detener.wait(espera):
+                break
+            espera = min(espera * 2, REINTENTO_MAXIMO)
+
+    def _conectar(self):
+        conn = self.crear()
+        try:
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute(f"LISTEN {CANAL_CAMBIOS}")
+        except psycopg2.Error:
+            conn.close()
+            raise
+        return conn
+
+    def _escuchar(self, conn):
+        """Espera avisos hasta que se pida detener o se corte la conexión"""
+        while not self._detener.is_set():
+            listos, _, _ = select.select([conn], [], [], ESPERA_AVISOS)
+            if not listos:
+                continue
+            conn.poll()
+            if conn.notifies:
+                avisos = list(conn.notifies)
+                conn.notifies.clear()
+                self._despachar(avisos)
+
+    def _despachar(self, avisos: Iterable):
+        """Registra en DatabaseManager los cambios de otras terminales"""
+        notificaciones: List[Notificacion] = []
+        for aviso in avisos:
+            self.recibidas += 1
+            if self.db.es_conexion_propia(aviso.pid):
+                self.ignoradas += 1
+                continue
+            notificacion = leer_notificacion(aviso.payload)
+            if notificacion is not None:
+                notificaciones.append(notificacion)
+
+        if not notificaciones:
+            return
+
+        for notificacion in notificaciones:
+            if notificacion.fecha_entrada and notificacion.fecha_salida:
+                self.db._registrar_cambio_reserva(notificacion.fecha_entrada, notificacion.fecha_salida)
+
+        # Un cambio de estado en otra terminal también escribió `eventos`:
+        # se registra igual que uno local (no vacía los reportes en caché)
+        tablas = {notificacion.tabla for notificacion in notificaciones}
+        cambios = {n.tabla for n in notificaciones if not n.solo_estado}
+        estados = tablas - cambios
+        if cambios:
+            self.db._registrar_cambio(*cambios)
+        if estados:
+            self.db._registrar_cambio(*estados, "eventos")
+        with self._lock:
+            self._pendientes |= tablas
+
+    def _perdidos(self):
+        """Invalida todo lo que avisan los triggers (tras una reconexión)"""
+        self.db.reportes.limpiar()
+        self.db._registrar_cambio(*TABLAS_NOTIFICADAS)
+        with self._lock:
+            self._pendientes.update(TABLAS_NOTIFICADAS)
+
+    def _cerrar_conexion(self):
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            try:
+                conn.close()
+            except psycopg2.Error:
+                pass
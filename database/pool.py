@@ -0,0 +1,168 @@
+# database/pool.py
+"""
+Pool de conexiones thread-safe para PostgreSQL
+Mantiene conexiones abiertas entre llamadas y sesiones para no pagar
+el handshake TLS con Supabase en cada operación
+"""
+
+import threading
+import time
+from typing import Callable, List, Tuple
+
+import psycopg2
+
+
+class PoolAgotadoError(Exception):
+    """No se obtuvo una conexión libre dentro del tiempo de espera"""
+
+
+class PoolConexiones:
+    """
+    Pool acotado de conexiones (mínimo / máximo)
+
+    - Verifica la salud de una conexión antes de prestarla si estuvo
+      inactiva más de `verificar_tras` segundos
+    - Cierra las conexiones inactivas por encima del mínimo que superan
+      `max_inactividad` segundos
+    """
+
+    def __init__(self, crear_conexion: Callable, minimo: int = 1, maximo: int = 5,
+                 max_inactividad: float = 300.0, verificar_tras: float = 30.0,
+                 espera_maxima: float = 30.0):
+        if minimo < 0 or maximo < 1 or minimo > maximo:
+            raise ValueError("Tamaños de pool inválidos")
+
+        self._crear_conexion = crear_conexion
+        self.minimo = minimo
+        self.maximo = maximo
+        self.max_inactividad = max_inactividad
+        self.verificar_tras = verificar_tras
+        self.espera_maxima = espera_maxima
+
+        self._condicion = threading.Condition()
+        self._libres: List[Tuple[object, float]] = []  # (conexión, momento en que se devolvió)
+        self._total = 0
+        self._cerrado = False
+
+        for _ in range(minimo):
+            self._libres.append((self._nueva_conexion(), time.monotonic()))
+
+    # ==================== PRÉSTAMO ====================
+
+    def obtener(self):
+        """Presta una conexión sana; bloquea si el pool está al máximo"""
+        limite = time.monotonic() + self.espera_maxima
+
+        with self._condicion:
+            while True:
+                if self._cerrado:
+                    raise PoolAgotadoError("El pool está cerrado")
+
+                self._desalojar_inactivas()
+
+                if self._libres:
+                    conn, devuelta = self._libres.pop()
+                    break
+
+                if self._total < self.maximo:
+                    conn, devuelta = None, None
+                    self._total += 1
+                    break
+
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    raise PoolAgotadoError(
+                        f"Sin conexiones libres tras {self.espera_maxima:.0f}s (máximo {self.maximo})"
+                    )
+                self._condicion.wait(restante)
+
+        # Crear o verificar fuera del lock: son operaciones de red
+        if conn is None:
+            try:
+                return self._crear_conexion()
+            except Exception:
+                self._liberar_cupo()
+                raise
+
+        if time.monotonic() - devuelta > self.verificar_tras and not self._esta_sana(conn):
+            self._cerrar_silencioso(conn)
+            try:
+                return self._crear_conexion()
+            except Exception:
+                self._liberar_cupo()
+                raise
+
+        return conn
+
+    def devolver(self, conn, descartar: bool = False):
+        """Devuelve una conexión al pool (o la descarta si quedó rota)"""
+        if descartar or conn.closed or self._cerrado:
+            self._cerrar_silencioso(conn)
+            self._liberar_cupo()
+            return
+
+        with self._condicion:
+            self._libres.append((conn, time.monotonic()))
+            self._condicion.notify()
+
+    # ==================== MANTENIMIENTO ====================
+
+    def _nueva_conexion(self):
+        conn = self._crear_conexion()
+        self._total += 1
+        return conn
+
+    def _liberar_cupo(self):
+        with self._condicion:
+            self._total -= 1
+            self._condicion.notify()
+
+    def _desalojar_inactivas(self):
+        """Cierra las conexiones ociosas sobrantes (se llama con el lock tomado)"""
+        ahora = time.monotonic()
+        conservadas = []
+        # Las más antiguas están al inicio de la lista
+        for conn, devuelta in self._libres:
+            sobran = self._total > self.minimo
+            if sobran and ahora - devuelta > self.max_inactividad:
+                self._cerrar_silencioso(conn)
+                self._total -= 1
+            else:
+                conservadas.append((conn, devuelta))
+        self._libres = conservadas
+
+    @staticmethod
+    def _esta_sana(conn) -> bool:
+        if conn.closed:
+            return False
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    @staticmethod
+    def _cerrar_silencioso(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def cerrar(self):
+        """Cierra todas las conexiones libres y rechaza nuevos préstamos"""
+        with self._condicion:
+            self._cerrado = True
+            for conn, _ in self._libres:
+                self._cerrar_silencioso(conn)
+                self._total -= 1
+            self._libres = []
+            self._condicion.notify_all()
+
+    @property
+    def estado(self) -> dict:
+        """Resumen del uso del pool"""
+        with self._condicion:
+            libres = len(self._libres)
+            return {'total': self._total, 'libres': libres, 'en_uso': self._total - libres}
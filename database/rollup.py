@@ -0,0 +1,174 @@
+# database/rollup.py
+"""
+Rollup diario de ocupación (tabla estadisticas_diarias, migraciones/007)
+
+Guarda por día y tipo de habitación las noches vendidas, los ingresos y las
+entradas/salidas. Cada ejecución reprocesa solo los días que tocan las
+reservas modificadas desde la última marca, así el costo no depende del
+tamaño del historial. La analítica lee de aquí los días cerrados
+(anteriores a hoy) y calcula en vivo solo el resto.
+
+Uso (p. ej. cada noche con cron o el Programador de tareas):
+    python -m database.rollup
+    python -m database.rollup --completo   (reconstruye todo, p. ej. tras cambiar tipos)
+"""
+
+import argparse
+import time
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+NOMBRE_ROLLUP = "estadisticas_diarias"
+
+# Se reprocesa también lo modificado un poco antes de la marca: una
+# transacción larga puede confirmar después con un actualizado_en anterior
+MARGEN_MINUTOS = 10
+
+
+class ResultadoRollup(NamedTuple):
+    """Resumen de una ejecución del rollup"""
+    dias: int
+    filas: int
+    marca: Optional[datetime]
+    completo: bool
+
+
+_SQL_DIAS_CAMBIADOS = """
+CREATE TEMP TABLE _dias_tocados ON COMMIT DROP AS
+SELECT DISTINCT g::date AS dia
+FROM reservaciones r
+         CROSS JOIN LATERAL generate_series(r.fecha_entrada, r.fecha_salida, interval '1 day') g
+WHERE r.actualizado_en >= %(marca)s - make_interval(mins => %(margen)s)
+"""
+
+_SQL_DIAS_TODOS = """
+CREATE TEMP TABLE _dias_tocados ON COMMIT DROP AS
+SELECT DISTINCT g::date AS dia
+FROM reservaciones r
+         CROSS JOIN LATERAL generate_series(r.fecha_entrada, r.fecha_salida, interval '1 day') g
+"""
+
+# Mismas reglas que analitica: cuentan activas y finalizadas, y el total
+# de la reserva se reparte por igual entre sus noches
+_SQL_RECALCULAR = """
+INSERT INTO estadisticas_diarias (dia, tipo, noches_vendidas, ingresos, entradas, salidas)
+SELECT dia, tipo, SUM(noches), SUM(ingresos), SUM(entradas), SUM(salidas)
+FROM (SELECT n.dia::date                                                AS dia,
+             hab.tipo,
+             1                                                          AS noches,
+             r.total / GREATEST(r.fecha_salida - r.fecha_entrada, 1) AS ingresos,
+             0                                                          AS entradas,
+             0                                                          AS salidas
+      FROM reservaciones r
+               JOIN habitaciones hab ON hab.id = r.habitacion_id
+               CROSS JOIN LATERAL generate_series(r.fecha_entrada, r.fecha_salida - 1, interval '1 day') AS n(dia)
+               JOIN _dias_tocados d ON d.dia = n.dia::date
+      WHERE r.estado IN ('activa', 'finalizada')
+        AND r.fecha_salida > (SELECT MIN(dia) FROM _dias_tocados)
+        AND r.fecha_entrada <= (SELECT MAX(dia) FROM _dias_tocados)
+
+      UNION ALL
+
+      SELECT r.fecha_entrada, hab.tipo, 0, 0, 1, 0
+      FROM reservaciones r
+               JOIN habitaciones hab ON hab.id = r.habitacion_id
+               JOIN _dias_tocados d ON d.dia = r.fecha_entrada
+      WHERE r.estado IN ('activa', 'finalizada')
+
+      UNION ALL
+
+      SELECT r.fecha_salida, hab.tipo, 0, 0, 0, 1
+      FROM reservaciones r
+               JOIN habitaciones hab ON hab.id = r.habitacion_id
+               JOIN _dias_tocados d ON d.dia = r.fecha_salida
+      WHERE r.estado IN ('activa', 'finalizada')) hechos
+GROUP BY dia, tipo
+"""
+
+
+def actualizar(db, completo: bool = False, margen_minutos: int = MARGEN_MINUTOS) -> ResultadoRollup:
+    """
+    Reprocesa los días tocados por reservas modificadas desde la última marca
+
+    Todo ocurre en una transacción: quien lee el rollup ve los días
+    anteriores o los nuevos, nunca un día a medio recalcular.
+    """
+    with db._cursor(cambia=(NOMBRE_ROLLUP,)) as cur:
+        # Una sola ejecución a la vez (otra terminal o el job nocturno)
+        cur.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (NOMBRE_ROLLUP,))
+        cur.execute("SELECT marca FROM rollup_marcas WHERE nombre = %s FOR UPDATE", (NOMBRE_ROLLUP,))
+        marca = cur.fetchone()[0]
+
+        completo = completo or marca is None
+        if completo:
+            cur.execute(_SQL_DIAS_TODOS)
+        else:
+            cur.execute(_SQL_DIAS_CAMBIADOS, {"marca": marca, "margen": margen_minutos})
+        cur.execute("SELECT COUNT(*) FROM _dias_tocados")
+        dias = cur.fetchone()[0]
+
+        filas = 0
+        if completo:
+            cur.execute("DELETE FROM estadisticas_diarias")
+        if dias:
+            if not completo:
+                cur.execute("DELETE FROM estadisticas_diarias e USING _dias_tocados d WHERE e.dia = d.dia")
+            cur.execute(_SQL_RECALCULAR)
+            filas = cur.rowcount
+
+        # now() es el inicio de esta transacción: lo que se confirme después
+        # queda por encima de la marca (o dentro del margen)
+        cur.execute("""
+                    UPDATE rollup_marcas
+                    SET marca = now()
+                    WHERE nombre = %s
+                    RETURNING marca
+                    """, (NOMBRE_ROLLUP,))
+        nueva_marca = cur.fetchone()[0]
+
+    return ResultadoRollup(dias, filas, nueva_marca, completo)
+
+
+def vigente(cur, fecha_inicio, fecha_corte) -> Optional[bool]:
+    """
+    ¿El rollup cubre [fecha_inicio, fecha_corte] sin cambios pendientes?
+
+    Usa el cursor de quien consulta. None si nunca se ejecutó; False si
+    alguna reserva de esos días cambió después de la última marca.
+    """
+    cur.execute("""
+                SELECT m.marca IS NULL,
+                       EXISTS (SELECT 1
+                               FROM reservaciones r
+                               WHERE r.actualizado_en > m.marca
+                                 AND r.fecha_entrada <= %s
+                                 AND r.fecha_salida >= %s)
+                FROM rollup_marcas m
+                WHERE m.nombre = %s
+                """, (fecha_corte, fecha_inicio, NOMBRE_ROLLUP))
+    fila = cur.fetchone()
+    if fila is None or fila[0]:
+        return None
+    return not fila[1]
+
+
+if __name__ == "__main__":
+    from database.db_manager import DatabaseManager
+
+    parser = argparse.ArgumentParser(description="Rollup diario de ocupación")
+    parser.add_argument("--completo", action="store_true", help="Reconstruir todo el historial")
+    parser.add_argument("--margen", type=int, default=MARGEN_MINUTOS,
+                        help="Minutos antes de la marca que también se reprocesan")
+    args = parser.parse_args()
+
+    db = DatabaseManager()
+    try:
+        inicio = time.perf_counter()
+        resultado = actualizar(db, args.completo, args.margen)
+        duracion = time.perf_counter() - inicio
+    finally:
+        db.cerrar()
+
+    modo = "completo" if resultado.completo else "incremental"
+    print(f"✓ Rollup {modo}: {resultado.dias} días reprocesados, {resultado.filas} filas "
+          f"en {duracion:.2f}s (marca {resultado.marca})")
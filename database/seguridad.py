@@ -0,0 +1,165 @@
+# database/seguridad.py
+"""
+Hash de contraseñas con bcrypt
+- El costo (rondas) se toma de BCRYPT_ROUNDS; se calibra con:
+      python -m database.seguridad --calibrar --objetivo-ms 250
+- Registra cuántas operaciones se hicieron y cuánto tardaron (se muestran
+  en el panel de diagnóstico)
+- Estas funciones son lentas a propósito: llamarlas fuera del hilo de Tk
+"""
+
+import argparse
+import os
+import re
+import threading
+import time
+from typing import Optional
+
+import bcrypt
+
+# Costo usado si BCRYPT_ROUNDS no está definido
+RONDAS_POR_DEFECTO = 12
+
+# Límites que acepta bcrypt
+RONDAS_MINIMAS = 4
+RONDAS_MAXIMAS = 31
+
+_PATRON_HASH = re.compile(r"^\$2[abxy]?\$(\d{2})\$")
+
+
+def rondas_configuradas() -> int:
+    """Costo configurado para los hashes nuevos"""
+    try:
+        rondas = int(os.getenv("BCRYPT_ROUNDS", RONDAS_POR_DEFECTO))
+    except ValueError:
+        print("BCRYPT_ROUNDS inválido, se usa el valor por defecto")
+        return RONDAS_POR_DEFECTO
+    return min(max(rondas, RONDAS_MINIMAS), RONDAS_MAXIMAS)
+
+
+# ==================== MEDICIÓN ====================
+
+class _Tiempos:
+    """Acumula cantidad y duración de cada operación (thread-safe)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._datos = {}
+
+    def registrar(self, operacion: str, segundos: float):
+        with self._lock:
+            cantidad, total, maximo = self._datos.get(operacion, (0, 0.0, 0.0))
+            self._datos[operacion] = (cantidad + 1, total + segundos, max(maximo, segundos))
+
+    def resumen(self) -> dict:
+        with self._lock:
+            return {
+                operacion: {
+                    'cantidad': cantidad,
+                    'promedio_ms': total / cantidad * 1000,
+                    'maximo_ms': maximo * 1000,
+                }
+                for operacion, (cantidad, total, maximo) in self._datos.items()
+            }
+
+
+_tiempos = _Tiempos()
+
+
+def estadisticas() -> dict:
+    """Cantidad, promedio y máximo (ms) de hashear / verificar"""
+    return _tiempos.resumen()
+
+
+# ==================== HASH Y VERIFICACIÓN ====================
+
+def hashear_password(password: str, rondas: Optional[int] = None) -> str:
+    """Hashea una contraseña usando bcrypt"""
+    if not password:
+        return ''
+
+    inicio = time.perf_counter()
+    resultado = bcrypt.hashpw(
+        password.encode('utf-8'),
+        bcrypt.gensalt(rounds=rondas or rondas_configuradas())
+    ).decode('utf-8')
+    _tiempos.registrar('hashear', time.perf_counter() - inicio)
+    return resultado
+
+
+def verificar_password(password: str, password_hash: str) -> bool:
+    """Verifica si una contraseña coincide con su hash"""
+    if not password or not password_hash:
+        return False
+
+    inicio = time.perf_counter()
+    try:
+        return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+    except Exception as e:
+        print(f"Error al verificar contraseña: {e}")
+        return False
+    finally:
+        _tiempos.registrar('verificar', time.perf_counter() - inicio)
+
+
+def rondas_de_hash(password_hash: str) -> Optional[int]:
+    """Costo con el que se generó un hash ($2b$12$... -> 12)"""
+    coincidencia = _PATRON_HASH.match(password_hash or '')
+    return int(coincidencia.group(1)) if coincidencia else None
+
+
+def necesita_rehash(password_hash: str) -> bool:
+    """True si el hash se generó con un costo distinto al configurado"""
+    rondas = rondas_de_hash(password_hash)
+    return rondas is not None and rondas != rondas_configuradas()
+
+
+# ==================== CALIBRACIÓN ====================
+
+def medir_rondas(rondas: int, repeticiones: int = 3) -> float:
+    """Milisegundos (mediana) que tarda un hash con el costo indicado"""
+    sal = bcrypt.gensalt(rounds=rondas)
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        bcrypt.hashpw(b"calibracion", sal)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    tiempos.sort()
+    return tiempos[len(tiempos) // 2]
+
+
+def calibrar(objetivo_ms: float = 250.0, minimo: int = 10, maximo: int = 16,
+             repeticiones: int = 3) -> int:
+    """
+    Elige el mayor costo cuyo tiempo no supera el objetivo en esta máquina
+
+    Cada ronda extra duplica el tiempo, así que se mide de menor a mayor
+    y se detiene al pasar el objetivo.
+    """
+    elegido = minimo
+    for rondas in range(minimo, maximo + 1):
+        ms = medir_rondas(rondas, repeticiones)
+        print(f"  rondas={rondas:2d}  {ms:8.1f} ms")
+        if ms > objetivo_ms:
+            break
+        elegido = rondas
+    return elegido
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Costo de bcrypt para contraseñas")
+    parser.add_argument("--calibrar", action="store_true",
+                        help="Mide esta máquina y recomienda BCRYPT_ROUNDS")
+    parser.add_argument("--objetivo-ms", type=float, default=250.0,
+                        help="Latencia objetivo por hash (default: 250)")
+    parser.add_argument("--minimo", type=int, default=10)
+    parser.add_argument("--maximo", type=int, default=16)
+    args = parser.parse_args()
+
+    if args.calibrar:
+        print(f"Calibrando bcrypt (objetivo {args.objetivo_ms:.0f} ms)...")
+        rondas = calibrar(args.objetivo_ms, args.minimo, args.maximo)
+        print(f"\nAgregar al archivo .env:\nBCRYPT_ROUNDS={rondas}")
+    else:
+        rondas = rondas_configuradas()
+        print(f"BCRYPT_ROUNDS actual: {rondas} ({medir_rondas(rondas):.1f} ms por hash)")
@@ -0,0 +1,107 @@
+# gui/busqueda.py
+"""
+Utilidades de búsqueda para las pantallas de listados
+- Debouncer: agrupa las pulsaciones de teclado en una sola llamada
+- FiltroIncremental: filtra un snapshot en memoria reutilizando el
+  resultado anterior cuando el texto buscado solo se extiende; con
+  indexar=True usa un índice de trigramas (utils/indice_busqueda.py)
+"""
+
+from typing import Callable, Hashable, List, Optional, Sequence
+
+from utils.indice_busqueda import IndiceNgramas, normalizar
+
+# Espera tras la última tecla antes de filtrar
+ESPERA_BUSQUEDA_MS = 250
+
+
+class Debouncer:
+    """Ejecuta `funcion` una sola vez cuando dejan de llegar llamadas durante `espera_ms`"""
+
+    def __init__(self, widget, funcion: Callable[[], None], espera_ms: int = ESPERA_BUSQUEDA_MS):
+        self.widget = widget
+        self.funcion = funcion
+        self.espera_ms = espera_ms
+        self._pendiente = None
+
+    def __call__(self, *args):
+        self.cancelar()
+        self._pendiente = self.widget.after(self.espera_ms, self._ejecutar)
+
+    def _ejecutar(self):
+        self._pendiente = None
+        self.funcion()
+
+    def cancelar(self):
+        if self._pendiente is not None:
+            self.widget.after_cancel(self._pendiente)
+            self._pendiente = None
+
+
+class FiltroIncremental:
+    """
+    Snapshot en memoria con claves de búsqueda precalculadas
+
+    Si el texto nuevo empieza con el anterior y los demás filtros no
+    cambiaron, solo se revisan las filas que ya coincidían.
+    """
+
+    def __init__(self):
+        self.filas: List = []
+        self._claves: List[str] = []
+        self._indice: Optional[IndiceNgramas] = None
+        self._ultimo_texto: Optional[str] = None
+        self._ultima_firma: Optional[Hashable] = None
+        self._ultimos_indices: List[int] = []
+
+    def cargar(self, filas: Sequence, clave_busqueda: Callable[[tuple], str], indexar: bool = False):
+        """
+        Reemplaza el snapshot y precalcula el texto de búsqueda de cada fila
+
+        Con indexar=True las claves se normalizan sin acentos y se indexan
+        por trigramas; conviene llamarlo fuera del hilo de Tk en snapshots
+        grandes (el índice tarda en armarse, las búsquedas no).
+        """
+        self.filas = list(filas)
+        if indexar:
+            self._claves = [normalizar(clave_busqueda(fila)) for fila in self.filas]
+            self._indice = IndiceNgramas(self._claves)
+        else:
+            self._claves = [clave_busqueda(fila).lower() for fila in self.filas]
+            self._indice = None
+        self._ultimo_texto = None
+        self._ultima_firma = None
+        self._ultimos_indices = []
+
+    def filtrar(self, texto: str, firma: Hashable = None,
+                predicado: Optional[Callable[[tuple], bool]] = None) -> List[int]:
+        """
+        Devuelve los índices de las filas que coinciden
+
+        Args:
+            texto: Texto buscado (se compara en minúsculas)
+            firma: Valor que identifica los demás filtros (combos); si cambia
+                se hace una pasada completa
+            predicado: Filtro adicional sobre la fila
+        """
+        texto = normalizar(texto.strip()) if self._indice is not None else texto.strip().lower()
+
+        if (self._ultimo_texto is not None and firma == self._ultima_firma
+                and texto.startswith(self._ultimo_texto)):
+            candidatos = self._ultimos_indices
+        elif texto and self._indice is not None:
+            candidatos = self._indice.buscar(texto)
+        else:
+            candidatos = range(len(self.filas))
+
+        claves = self._claves
+        filas = self.filas
+        indices = [
+            i for i in candidatos
+            if (not texto or texto in claves[i]) and (predicado is None or predicado(filas[i]))
+        ]
+
+        self._ultimo_texto = texto
+        self._ultima_firma = firma
+        self._ultimos_indices = indices
+        return indices
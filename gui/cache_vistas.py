@@ -0,0 +1,167 @@
+# gui/cache_vistas.py
+"""
+Caché de vistas del dashboard
+Mantiene vivas las pantallas ya construidas (ocultas con pack_forget) y
+solo las recarga si cambiaron las tablas de las que dependen.
+Las menos usadas se destruyen al superar el máximo de vistas o el
+presupuesto de widgets.
+"""
+
+from collections import OrderedDict
+from typing import Callable, Hashable, Iterable, Optional, Sequence
+
+import customtkinter as ctk
+
+# Límites de la caché
+MAX_VISTAS = 4
+PRESUPUESTO_WIDGETS = 6000
+
+
+class _Vista:
+    """Frame de una vista y lo necesario para saber si está al día"""
+    __slots__ = ("frame", "refrescar", "tablas", "version", "peso")
+
+    def __init__(self, frame, refrescar, tablas, version):
+        self.frame = frame
+        self.refrescar = refrescar
+        self.tablas = tablas
+        self.version = version
+        self.peso = 0
+
+
+class CacheVistas:
+    """
+    Caché LRU de vistas dentro de un contenedor
+
+    Args:
+        contenedor: Frame donde se muestran las vistas
+        db: DatabaseManager (se usa `version_datos` para detectar cambios)
+        max_vistas: Vistas vivas como máximo
+        presupuesto_widgets: Total de widgets permitido entre todas las vistas
+    """
+
+    def __init__(self, contenedor, db, max_vistas: int = MAX_VISTAS,
+                 presupuesto_widgets: int = PRESUPUESTO_WIDGETS):
+        self.contenedor = contenedor
+        self.db = db
+        self.max_vistas = max_vistas
+        self.presupuesto_widgets = presupuesto_widgets
+
+        self._vistas: "OrderedDict[Hashable, _Vista]" = OrderedDict()  # la menos usada primero
+        self._actual: Optional[Hashable] = None
+        self._transitoria = None
+
+    # ==================== API ====================
+
+    def mostrar(self, clave: Hashable, construir: Callable[[ctk.CTkFrame], Optional[Callable[[], None]]],
+                tablas: Sequence[str] = ()):
+        """
+        Muestra la vista `clave`, construyéndola si no está en caché
+
+        Args:
+            construir: Recibe el frame de la vista, crea su contenido y
+                devuelve la función que la recarga (o None)
+            tablas: Tablas de las que depende; si su versión cambió desde la
+                última vez que se mostró, se llama a la función de recarga
+        """
+        if clave == self._actual:
+            return
+
+        self._ocultar_actual()
+        version = self.db.version_datos(*tablas)
+        vista = self._vistas.get(clave)
+
+        if vista is None:
+            frame = ctk.CTkFrame(self.contenedor, fg_color="transparent")
+            frame.pack(fill="both", expand=True)
+            vista = _Vista(frame, construir(frame), tuple(tablas), version)
+            self._vistas[clave] = vista
+        else:
+            self._vistas.move_to_end(clave)
+            vista.frame.pack(fill="both", expand=True)
+            if version != vista.version:
+                vista.version = version
+                if vista.refrescar:
+                    vista.refrescar()
+
+        self._actual = clave
+        self._desalojar()
+
+    def mostrar_transitoria(self, construir: Callable[[ctk.CTkFrame], None]):
+        """Muestra una pantalla que no se guarda (acceso denegado, diagnóstico)"""
+        self._ocultar_actual()
+        frame = ctk.CTkFrame(self.contenedor, fg_color="transparent")
+        frame.pack(fill="both", expand=True)
+        construir(frame)
+        self._transitoria = frame
+
+    def refrescar_visible(self, tablas: Iterable[str]):
+        """
+        Recarga la vista visible si depende de alguna de `tablas` (cambios
+        avisados por otras terminales); las ocultas se recargan al mostrarlas
+        """
+        vista = self._vistas.get(self._actual)
+        if vista is None or not set(vista.tablas).intersection(tablas):
+            return
+        vista.version = self.db.version_datos(*vista.tablas)
+        if vista.refrescar:
+            vista.refrescar()
+
+    def descartar(self, clave: Hashable):
+        """Destruye una vista de la caché (se reconstruye la próxima vez)"""
+        vista = self._vistas.pop(clave, None)
+        if vista is not None:
+            vista.frame.destroy()
+        if clave == self._actual:
+            self._actual = None
+
+    def limpiar(self):
+        """Destruye todas las vistas"""
+        for clave in list(self._vistas):
+            self.descartar(clave)
+        self._ocultar_actual()
+
+    @property
+    def estado(self) -> dict:
+        """Resumen de la caché"""
+        return {
+            'vistas': list(self._vistas),
+            'actual': self._actual,
+            'widgets': sum(vista.peso for vista in self._vistas.values()),
+        }
+
+    # ==================== INTERNOS ====================
+
+    def _ocultar_actual(self):
+        if self._transitoria is not None:
+            self._transitoria.destroy()
+            self._transitoria = None
+
+        vista = self._vistas.get(self._actual)
+        if vista is not None:
+            # El contenido crece con las cargas, así que se mide al ocultarla
+            vista.peso = self._contar_widgets(vista.frame)
+            vista.frame.pack_forget()
+        self._actual = None
+
+    def _desalojar(self):
+        """Destruye las vistas menos usadas mientras se superen los límites"""
+        while len(self._vistas) > 1:
+            peso_total = sum(vista.peso for vista in self._vistas.values())
+            if len(self._vistas) <= self.max_vistas and peso_total <= self.presupuesto_widgets:
+                break
+
+            clave = next(iter(self._vistas))
+            if clave == self._actual:
+                break
+            self.descartar(clave)
+
+    @staticmethod
+    def _contar_widgets(widget) -> int:
+        total = 0
+        pendientes = [widget]
+        while pendientes:
+            actual = pendientes.pop()
+            total += 1
+            pendientes.extend(actual.winfo_children())
+        return total
@@ -6,7 +6,21 @@ from gui.empleados_window import EmpleadosWindow
 from gui.reportes_window import ReportesWindow
 from gui.reservas_window import ReservasWindow
 from gui.huespedes_window import HuespedesWindow
+from gui.diagnostico_window import DiagnosticoWindow
+from gui.cache_vistas import CacheVistas
 from core.session import obtener_sesion
+from core.worker import obtener_trabajador
+from database.eventos import describir
+
+# Feed de actividad reciente
+LIMITE_ACTIVIDAD = 8
+INTERVALO_ACTIVIDAD_MS = 15000
+
+# Cada cuánto se miran los avisos de otras terminales (no consulta la BD)
+INTERVALO_CAMBIOS_MS = 300
+
+# Cada cuánto se ocupan las habitaciones cuyas reservas empiezan hoy
+INTERVALO_LLEGADAS_MS = 10 * 60 * 1000
 
 
 class DashboardWindow:
@@ -16,6 +30,7 @@ class DashboardWindow:
 
         # 🔹 OBTENER SESIÓN GLOBAL (ya tiene DB y datos del usuario)
         self.session = obtener_sesion()
+        self.trabajador = obtener_trabajador()
 
         # Verificar que hay sesión activa
         if not self.session.sesion_activa:
@@ -31,6 +46,7 @@ class DashboardWindow:
 
         # Variables
         self.boton_activo = None
+        self._sondeo_actividad = None
 
         # Colores del tema
         self.COLORES = {
@@ -48,6 +64,8 @@ class DashboardWindow:
 
         self._crear_interfaz()
         self.mostrar_inicio()
+        self._vigilar_cambios()
+        self._registrar_llegadas()
 
         # Protocolo de cierre
         self.root.protocol("WM_DELETE_WINDOW", self._on_closing)
@@ -337,21 +355,31 @@ class DashboardWindow:
         )
         self.area_contenido.pack(fill="both", expand=True, padx=0, pady=0)
 
+        # Las vistas de cada módulo se conservan entre cambios de menú
+        self.vistas = CacheVistas(self.area_contenido, self.session.db)
+
     def limpiar_area_contenido(self):
-        """Limpia el área de contenido"""
-        for widget in self.area_contenido.winfo_children():
-            widget.destroy()
+        """Limpia el área de contenido (destruye también las vistas en caché)"""
+        self.vistas.limpiar()
 
     def mostrar_inicio(self):
         """Muestra la pantalla de inicio con estadísticas"""
-        self.limpiar_area_contenido()
+        self.vistas.mostrar("inicio", self._construir_inicio, tablas=("habitaciones", "empleados", "eventos"))
 
-        container = ctk.CTkFrame(self.area_contenido, fg_color="transparent")
+    def _construir_inicio(self, frame):
+        """Construye la pantalla de inicio y devuelve su función de recarga"""
+        container = ctk.CTkFrame(frame, fg_color="transparent")
         container.pack(fill="both", expand=True, padx=30, pady=30)
 
         self._crear_header_inicio(container)
         self._crear_cards_estadisticas(container)
         self._crear_info_adicional(container)
+        return self._refrescar_inicio
+
+    def _refrescar_inicio(self):
+        """Recarga las estadísticas y trae la actividad nueva"""
+        self._cargar_estadisticas()
+        self._pedir_actividad()
 
     def _crear_header_inicio(self, parent):
         """Crea el header de inicio"""
@@ -374,10 +402,7 @@ class DashboardWindow:
         ).pack(anchor="w", pady=(5, 0))
 
     def _crear_cards_estadisticas(self, parent):
-        """Crea las tarjetas de estadísticas"""
-        # 🔹 USAR LA BD DE LA SESIÓN
-        stats = self.session.db.obtener_estadisticas()
-
+        """Crea las tarjetas de estadísticas y las llena en segundo plano"""
         stats_grid = ctk.CTkFrame(parent, fg_color="transparent")
         stats_grid.pack(fill="x", pady=(0, 30))
 
@@ -386,37 +411,58 @@ class DashboardWindow:
 
         cards_data = [
             {
+                "clave": "disponibles",
                 "titulo": "Disponibles",
-                "valor": stats['disponibles'],
                 "icono": "✅",
                 "color": self.COLORES['success'],
                 "subtitulo": "Habitaciones listas"
             },
             {
+                "clave": "ocupadas",
                 "titulo": "Ocupadas",
-                "valor": stats['ocupadas'],
                 "icono": "🏨",
                 "color": self.COLORES['danger'],
                 "subtitulo": "En uso actualmente"
             },
             {
+                "clave": "limpieza",
                 "titulo": "En Limpieza",
-                "valor": stats['limpieza'],
                 "icono": "🧹",
                 "color": self.COLORES['warning'],
                 "subtitulo": "En mantenimiento"
             },
             {
+                "clave": "empleados",
                 "titulo": "Empleados",
-                "valor": stats['empleados'],
                 "icono": "👥",
                 "color": self.COLORES['info'],
                 "subtitulo": "Personal activo"
             }
         ]
 
+        self.labels_stats = {}
         for i, card_data in enumerate(cards_data):
-            self._crear_tarjeta_stat(stats_grid, card_data, i)
+            card_data["valor"] = "…"
+            self.labels_stats[card_data["clave"]] = self._crear_tarjeta_stat(stats_grid, card_data, i)
+
+        self.stats_grid = stats_grid
+        self._cargar_estadisticas()
+
+    def _cargar_estadisticas(self):
+        """Pide las estadísticas en segundo plano"""
+        # 🔹 USAR LA BD DE LA SESIÓN (fuera del hilo de Tk)
+        self.trabajador.ejecutar(
+            self.stats_grid,
+            self.session.db.obtener_estadisticas,
+            al_terminar=self._actualizar_cards_estadisticas,
+            al_fallar=lambda error: print(f"Error al obtener estadísticas: {error}"),
+            clave=(id(self), "estadisticas")
+        )
+
+    def _actualizar_cards_estadisticas(self, stats):
+        """Escribe los valores recibidos en las tarjetas"""
+        for clave, label in self.labels_stats.items():
+            label.configure(text=str(stats.get(clave, 0)))
 
     def _crear_tarjeta_stat(self, parent, data, column):
         """Crea una tarjeta de estadística"""
@@ -460,12 +506,13 @@ class DashboardWindow:
             anchor="w"
         ).pack(anchor="w")
 
-        ctk.CTkLabel(
+        label_valor = ctk.CTkLabel(
             content,
             text=str(data['valor']),
             font=("Segoe UI", 42, "bold"),
             anchor="w"
-        ).pack(anchor="w", pady=(10, 5))
+        )
+        label_valor.pack(anchor="w", pady=(10, 5))
 
         ctk.CTkLabel(
             content,
@@ -475,6 +522,8 @@ class DashboardWindow:
             anchor="w"
         ).pack(anchor="w")
 
+        return label_valor
+
     def _crear_info_adicional(self, parent):
         """Crea sección de información adicional"""
         info_container = ctk.CTkFrame(parent, fg_color="transparent")
@@ -487,7 +536,7 @@ class DashboardWindow:
         self._crear_accesos_rapidos(info_container)
 
     def _crear_actividad_reciente(self, parent):
-        """Crea la sección de actividad reciente"""
+        """Crea la sección de actividad reciente (eventos reales de la BD)"""
         card = ctk.CTkFrame(
             parent,
             fg_color=self.COLORES['card_bg'],
@@ -505,33 +554,153 @@ class DashboardWindow:
             anchor="w"
         ).pack(anchor="w")
 
-        activities = [
-            "Nueva reserva registrada - Hab. 101",
-            "Check-out completado - Hab. 205",
-            "Habitación 302 lista para ocupar",
-            "Nueva reserva para fin de semana"
-        ]
-
-        for activity in activities:
-            item = ctk.CTkFrame(card, fg_color="transparent")
-            item.pack(fill="x", padx=25, pady=8)
+        self.lista_actividad = ctk.CTkFrame(card, fg_color="transparent")
+        self.lista_actividad.pack(fill="x")
 
-            ctk.CTkLabel(
-                item,
-                text="•",
-                font=("Segoe UI", 16),
-                text_color=self.COLORES['primary']
-            ).pack(side="left", padx=(0, 10))
+        self.label_actividad_vacia = ctk.CTkLabel(
+            self.lista_actividad,
+            text="Cargando actividad...",
+            font=("Segoe UI", 11),
+            text_color=("#7F8C8D", "#95A5A6"),
+            anchor="w"
+        )
+        self.label_actividad_vacia.pack(fill="x", padx=25, pady=8)
 
-            ctk.CTkLabel(
-                item,
-                text=activity,
-                font=("Segoe UI", 11),
-                anchor="w"
-            ).pack(side="left", fill="x", expand=True)
+        # Filas fijas que se reutilizan en cada actualización
+        self.filas_actividad = [self._crear_fila_actividad() for _ in range(LIMITE_ACTIVIDAD)]
+        self._eventos = []
+        self._ultimo_evento_id = None
 
         ctk.CTkFrame(card, fg_color="transparent", height=15).pack()
 
+        self._pedir_actividad()
+
+    def _crear_fila_actividad(self):
+        """Crea una fila (oculta) del feed de actividad"""
+        item = ctk.CTkFrame(self.lista_actividad, fg_color="transparent")
+
+        ctk.CTkLabel(
+            item,
+            text="•",
+            font=("Segoe UI", 16),
+            text_color=self.COLORES['primary']
+        ).pack(side="left", padx=(0, 10))
+
+        item.label_hora = ctk.CTkLabel(
+            item,
+            text="",
+            font=("Segoe UI", 10),
+            text_color=("#7F8C8D", "#95A5A6")
+        )
+        item.label_hora.pack(side="right")
+
+        item.label_texto = ctk.CTkLabel(
+            item,
+            text="",
+            font=("Segoe UI", 11),
+            anchor="w"
+        )
+        item.label_texto.pack(side="left", fill="x", expand=True)
+        return item
+
+    def _agregar_actividad(self, nuevos):
+        """Suma los eventos recibidos (del más nuevo al más viejo) y reprograma el sondeo"""
+        if nuevos:
+            self._eventos = (list(nuevos) + self._eventos)[:LIMITE_ACTIVIDAD]
+            self._ultimo_evento_id = self._eventos[0].id
+            self._mostrar_actividad()
+        elif self._ultimo_evento_id is None:
+            self._ultimo_evento_id = 0
+            self.label_actividad_vacia.configure(text="Sin actividad registrada")
+
+        self._programar_sondeo_actividad()
+
+    def _mostrar_actividad(self):
+        """Actualiza el texto de las filas fijas"""
+        self.label_actividad_vacia.pack_forget()
+
+        for fila, evento in zip(self.filas_actividad, self._eventos):
+            fila.label_texto.configure(text=describir(evento))
+            fila.label_hora.configure(text=evento.creado_en.strftime("%d/%m %H:%M"))
+            fila.pack(fill="x", padx=25, pady=8)
+
+        for fila in self.filas_actividad[len(self._eventos):]:
+            fila.pack_forget()
+
+    def _al_fallar_actividad(self, error):
+        print(f"Error al cargar actividad reciente: {error}")
+        if self._ultimo_evento_id is None:
+            self.label_actividad_vacia.configure(text="⚠️ No se pudo cargar la actividad")
+        self._programar_sondeo_actividad()
+
+    def _programar_sondeo_actividad(self):
+        if self._sondeo_actividad is not None:
+            self.root.after_cancel(self._sondeo_actividad)
+        self._sondeo_actividad = self.root.after(INTERVALO_ACTIVIDAD_MS, self._sondear_actividad)
+
+    def _sondear_actividad(self):
+        """Sondeo periódico del feed"""
+        self._sondeo_actividad = None
+        if not self.lista_actividad.winfo_exists():
+            return
+
+        # Con la vista oculta no se consulta; al volver a Inicio se refresca
+        if not self.lista_actividad.winfo_ismapped():
+            self._programar_sondeo_actividad()
+            return
+
+        self._pedir_actividad()
+
+    def _pedir_actividad(self):
+        """Pide los últimos eventos la primera vez y luego solo los más nuevos"""
+        if self._ultimo_evento_id is None:
+            funcion, args = self.session.db.obtener_eventos_recientes, (LIMITE_ACTIVIDAD,)
+        else:
+            funcion, args = self.session.db.obtener_eventos_desde, (self._ultimo_evento_id,)
+
+        self.trabajador.ejecutar(
+            self.lista_actividad,
+            funcion,
+            *args,
+            al_terminar=self._agregar_actividad,
+            al_fallar=self._al_fallar_actividad,
+            clave=(id(self), "actividad")
+        )
+
+    def _vigilar_cambios(self):
+        """Recarga la vista visible cuando otra terminal cambió sus tablas"""
+        try:
+            if not self.root.winfo_exists():
+                return
+        except Exception:
+            return
+
+        tablas = self.session.db.notificaciones.recoger() if self.session.db else set()
+        if tablas:
+            self.vistas.refrescar_visible(tablas)
+        self.root.after(INTERVALO_CAMBIOS_MS, self._vigilar_cambios)
+
+    def _registrar_llegadas(self):
+        """Ocupa en segundo plano las habitaciones de las reservas que empiezan hoy"""
+        try:
+            if not self.root.winfo_exists() or not self.session.db:
+                return
+        except Exception:
+            return
+
+        self.trabajador.ejecutar(
+            self.root,
+            self.session.db.registrar_llegadas,
+            al_terminar=self._al_registrar_llegadas,
+            al_fallar=lambda error: print(f"Error al registrar llegadas: {error}"),
+            clave=(id(self), "llegadas")
+        )
+        self.root.after(INTERVALO_LLEGADAS_MS, self._registrar_llegadas)
+
+    def _al_registrar_llegadas(self, ocupadas):
+        if ocupadas:
+            self.vistas.refrescar_visible(("habitaciones",))
+
     def _crear_accesos_rapidos(self, parent):
         """Crea la sección de accesos rápidos"""
         card = ctk.CTkFrame(
@@ -578,65 +747,61 @@ class DashboardWindow:
         if not self.session.tiene_privilegio_admin():
             self.mostrar_acceso_denegado()
             return
-        self.limpiar_area_contenido()
-        HabitacionesWindow(self.area_contenido)
+        self.vistas.mostrar(
+            "habitaciones",
+            lambda frame: HabitacionesWindow(frame).actualizar,
+            tablas=("habitaciones",)
+        )
 
     def abrir_empleados(self):
         if not self.session.tiene_privilegio_admin():
             self.mostrar_acceso_denegado()
             return
-        self.limpiar_area_contenido()
-        EmpleadosWindow(self.area_contenido)
+        self.vistas.mostrar(
+            "empleados",
+            lambda frame: EmpleadosWindow(frame).cargar_empleados,
+            tablas=("empleados",)
+        )
 
     def abrir_reservas(self):
-        self.limpiar_area_contenido()
         # 🔹 YA NO PASAMOS privilegio, la ventana usa session
-        ReservasWindow(self.area_contenido)
+        self.vistas.mostrar(
+            "reservas",
+            lambda frame: ReservasWindow(frame).actualizar,
+            tablas=("reservaciones", "huespedes", "habitaciones")
+        )
 
     def abrir_huesped(self):
-        self.limpiar_area_contenido()
-        HuespedesWindow(self.area_contenido)
+        self.vistas.mostrar(
+            "huespedes",
+            lambda frame: HuespedesWindow(frame).cargar_huespedes,
+            tablas=("huespedes",)
+        )
 
     def abrir_reportes(self):
         if not self.session.tiene_privilegio_admin():
             self.mostrar_acceso_denegado()
             return
-        self.limpiar_area_contenido()
-        ReportesWindow(self.area_contenido)
+        self.vistas.mostrar(
+            "reportes",
+            lambda frame: ReportesWindow(frame).refrescar,
+            tablas=("reservaciones", "habitaciones")
+        )
 
     def abrir_configuracion(self):
         if not self.session.tiene_privilegio_admin():
             self.mostrar_acceso_denegado()
             return
-        self.limpiar_area_contenido()
-        self.mostrar_en_desarrollo("Configuración", "⚙️")
-
-    def mostrar_en_desarrollo(self, modulo, icono):
-        """Muestra pantalla de módulo en desarrollo"""
-        container = ctk.CTkFrame(self.area_contenido, fg_color="transparent")
-        container.pack(fill="both", expand=True)
-
-        content = ctk.CTkFrame(container, fg_color="transparent")
-        content.place(relx=0.5, rely=0.5, anchor="center")
-
-        ctk.CTkLabel(content, text=icono, font=("Segoe UI", 80)).pack(pady=(0, 20))
-        ctk.CTkLabel(
-            content,
-            text=f"Módulo de {modulo}",
-            font=("Segoe UI", 28, "bold")
-        ).pack(pady=(0, 10))
-        ctk.CTkLabel(
-            content,
-            text="Esta funcionalidad estará disponible próximamente",
-            font=("Segoe UI", 14),
-            text_color=("#7F8C8D", "#95A5A6")
-        ).pack()
+        # Transitoria: se arma de nuevo al entrar, con las mediciones del momento
+        self.vistas.mostrar_transitoria(DiagnosticoWindow)
 
     def mostrar_acceso_denegado(self):
         """Muestra pantalla de acceso denegado"""
-        self.limpiar_area_contenido()
+        self.vistas.mostrar_transitoria(self._crear_acceso_denegado)
 
-        container = ctk.CTkFrame(self.area_contenido, fg_color="transparent")
+    def _crear_acceso_denegado(self, parent):
+        """Construye el contenido de la pantalla de acceso denegado"""
+        container = ctk.CTkFrame(parent, fg_color="transparent")
         container.pack(fill="both", expand=True)
 
         content = ctk.CTkFrame(container, fg_color="transparent")
@@ -671,7 +836,7 @@ class DashboardWindow:
 
     def _on_closing(self):
         """Maneja el cierre de la ventana del dashboard"""
-        # 🔹 CERRAR SESIÓN (esto también cierra la BD)
+        # 🔹 CERRAR SESIÓN (el pool de conexiones se conserva)
         self.session.cerrar_sesion()
 
         # Mostrar login de nuevo
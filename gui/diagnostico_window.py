@@ -0,0 +1,231 @@
+# gui/diagnostico_window.py
+import customtkinter as ctk
+from datetime import datetime
+from tkinter import ttk
+from core.session import obtener_sesion
+from database import seguridad
+from database.instrumentacion import obtener_instrumentacion
+
+# Cada cuánto se recalculan los percentiles mientras el panel está visible
+INTERVALO_ACTUALIZACION_MS = 5000
+
+# Consultas lentas que se listan
+LIMITE_LENTAS = 50
+
+
+class DiagnosticoWindow:
+    """Panel de diagnóstico (solo administradores): tiempos de consulta por método"""
+
+    def __init__(self, parent):
+        self.parent = parent
+
+        self.session = obtener_sesion()
+        self.db = self.session.db
+        self.instrumentacion = obtener_instrumentacion()
+
+        # Colores del tema
+        self.COLORES = {
+            'card_bg': ("#FFFFFF", "#3a3a3a"),
+            'primary': "#3498DB",
+            'warning': "#F39C12",
+            'danger': "#E74C3C",
+        }
+
+        self._crear_interfaz()
+        self.refrescar()
+
+    def _crear_interfaz(self):
+        """Crea la interfaz principal"""
+        main_container = ctk.CTkFrame(self.parent, fg_color="transparent")
+        main_container.pack(fill="both", expand=True, padx=30, pady=30)
+
+        self._crear_header(main_container)
+        self._crear_tabla_metodos(main_container)
+        self._crear_tabla_lentas(main_container)
+
+    def _crear_header(self, parent):
+        """Crea el header con título y botón de actualizar"""
+        header = ctk.CTkFrame(parent, fg_color="transparent")
+        header.pack(fill="x", pady=(0, 20))
+
+        title_frame = ctk.CTkFrame(header, fg_color="transparent")
+        title_frame.pack(side="left", fill="x", expand=True)
+
+        ctk.CTkLabel(
+            title_frame,
+            text="⚙️ Diagnóstico de Base de Datos",
+            font=("Segoe UI", 28, "bold"),
+            anchor="w"
+        ).pack(anchor="w")
+
+        self.label_resumen = ctk.CTkLabel(
+            title_frame,
+            text="",
+            font=("Segoe UI", 12),
+            text_color=("#7F8C8D", "#95A5A6"),
+            anchor="w"
+        )
+        self.label_resumen.pack(anchor="w", pady=(5, 0))
+
+        self.label_cache = ctk.CTkLabel(
+            title_frame,
+            text="",
+            font=("Segoe UI", 12),
+            text_color=("#7F8C8D", "#95A5A6"),
+            anchor="w"
+        )
+        self.label_cache.pack(anchor="w")
+
+        self.label_avisos = ctk.CTkLabel(
+            title_frame,
+            text="",
+            font=("Segoe UI", 12),
+            text_color=("#7F8C8D", "#95A5A6"),
+            anchor="w"
+        )
+        self.label_avisos.pack(anchor="w")
+
+        self.label_contrasenas = ctk.CTkLabel(
+            title_frame,
+            text="",
+            font=("Segoe UI", 12),
+            text_color=("#7F8C8D", "#95A5A6"),
+            anchor="w"
+        )
+        self.label_contrasenas.pack(anchor="w")
+
+        ctk.CTkButton(
+            header,
+            text="🔄 Actualizar",
+            command=self.refrescar,
+            width=140,
+            height=45,
+            font=("Segoe UI", 12, "bold"),
+            corner_radius=10,
+            fg_color=self.COLORES['primary']
+        ).pack(side="right")
+
+    def _crear_tabla_metodos(self, parent):
+        """Tabla de percentiles por método de DatabaseManager"""
+        tabla_frame = ctk.CTkFrame(parent, fg_color=self.COLORES['card_bg'], corner_radius=10)
+        tabla_frame.pack(fill="both", expand=True, pady=(0, 15))
+
+        columnas = ("Método", "Llamadas", "Errores", "p50", "p95", "p99", "Máx", "Filas")
+        self.tree_metodos = ttk.Treeview(tabla_frame, columns=columnas, show="headings", height=10)
+        for columna in columnas:
+            self.tree_metodos.heading(columna, text=columna)
+            self.tree_metodos.column(columna, width=90, anchor="e")
+        self.tree_metodos.column("Método", width=260, anchor="w")
+        self.tree_metodos.tag_configure("lento", foreground=self.COLORES['danger'])
+
+        scrollbar = ttk.Scrollbar(tabla_frame, orient="vertical", command=self.tree_metodos.yview)
+        self.tree_metodos.configure(yscrollcommand=scrollbar.set)
+
+        self.tree_metodos.pack(side="left", fill="both", expand=True, padx=10, pady=10)
+        scrollbar.pack(side="right", fill="y", pady=10, padx=(0, 10))
+
+    def _crear_tabla_lentas(self, parent):
+        """Últimas consultas lentas o con error"""
+        ctk.CTkLabel(
+            parent,
+            text=f"🐢 Consultas lentas (≥ {self.instrumentacion.umbral_ms:.0f} ms) y errores",
+            font=("Segoe UI", 14, "bold"),
+            anchor="w"
+        ).pack(anchor="w", pady=(0, 5))
+
+        tabla_frame = ctk.CTkFrame(parent, fg_color=self.COLORES['card_bg'], corner_radius=10)
+        tabla_frame.pack(fill="both", expand=True)
+
+        columnas = ("Hora", "Método", "ms", "Filas", "Consulta")
+        self.tree_lentas = ttk.Treeview(tabla_frame, columns=columnas, show="headings", height=8)
+        for columna in columnas:
+            self.tree_lentas.heading(columna, text=columna)
+        self.tree_lentas.column("Hora", width=90, anchor="center")
+        self.tree_lentas.column("Método", width=200)
+        self.tree_lentas.column("ms", width=80, anchor="e")
+        self.tree_lentas.column("Filas", width=70, anchor="e")
+        self.tree_lentas.column("Consulta", width=500)
+        self.tree_lentas.tag_configure("error", foreground=self.COLORES['danger'])
+
+        scrollbar = ttk.Scrollbar(tabla_frame, orient="vertical", command=self.tree_lentas.yview)
+        self.tree_lentas.configure(yscrollcommand=scrollbar.set)
+
+        self.tree_lentas.pack(side="left", fill="both", expand=True, padx=10, pady=10)
+        scrollbar.pack(side="right", fill="y", pady=10, padx=(0, 10))
+
+    def refrescar(self):
+        """Recalcula los percentiles desde el buffer en memoria (sin ir a la base)"""
+        if not self.tree_metodos.winfo_exists():
+            return  # El panel se cerró
+
+        if not self.instrumentacion.activa:
+            self.label_resumen.configure(text="Instrumentación desactivada (DB_INSTRUMENTAR=0)")
+        else:
+            mediciones = self.instrumentacion.mediciones()
+            self.label_resumen.configure(
+                text=f"Últimas {len(mediciones)} consultas · actualizado {datetime.now():%H:%M:%S}"
+            )
+        self._pintar_metodos()
+        self._pintar_lentas()
+        self._pintar_cache()
+        self._pintar_contrasenas()
+
+        if getattr(self, "_programado", None):
+            self.tree_metodos.after_cancel(self._programado)
+        self._programado = self.tree_metodos.after(INTERVALO_ACTUALIZACION_MS, self.refrescar)
+
+    def _pintar_metodos(self):
+        self.tree_metodos.delete(*self.tree_metodos.get_children())
+        umbral = self.instrumentacion.umbral_ms
+        for fila in self.instrumentacion.resumen():
+            self.tree_metodos.insert("", "end", values=(
+                fila.metodo,
+                fila.llamadas,
+                fila.errores,
+                f"{fila.p50_ms:.1f}",
+                f"{fila.p95_ms:.1f}",
+                f"{fila.p99_ms:.1f}",
+                f"{fila.max_ms:.1f}",
+                f"{fila.filas_promedio:.0f}"
+            ), tags=("lento",) if fila.p95_ms >= umbral else ())
+
+    def _pintar_lentas(self):
+        self.tree_lentas.delete(*self.tree_lentas.get_children())
+        for medicion in self.instrumentacion.lentas(LIMITE_LENTAS):
+            self.tree_lentas.insert("", "end", values=(
+                f"{datetime.fromtimestamp(medicion.momento):%H:%M:%S}",
+                medicion.metodo,
+                f"{medicion.total_ms:.1f}",
+                medicion.filas,
+                medicion.error or medicion.huella
+            ), tags=("error",) if medicion.error else ())
+
+    def _pintar_cache(self):
+        cache = self.db.reportes.estadisticas()
+        self.label_cache.configure(
+            text=f"Caché de reportes: {cache['tasa_aciertos']:.0%} aciertos · "
+                 f"{cache['entradas']} entradas · {cache['bytes'] / 1024 / 1024:.1f} de "
+                 f"{cache['presupuesto'] / 1024 / 1024:.0f} MB · {cache['desalojos']} desalojos"
+        )
+
+        avisos = self.db.notificaciones
+        if not avisos.activa:
+            texto = "Avisos de otras terminales: desactivados (DB_NOTIFICACIONES=0)"
+        else:
+            texto = (f"Avisos de otras terminales: {'conectado' if avisos.conectada else 'sin conexión'} · "
+                     f"{avisos.recibidas - avisos.ignoradas} recibidos · {avisos.ignoradas} propios · "
+                     f"{avisos.reconexiones} reconexiones")
+        self.label_avisos.configure(text=texto)
+
+    def _pintar_contrasenas(self):
+        """Tiempos de bcrypt medidos en database/seguridad.py"""
+        tiempos = seguridad.estadisticas()
+        partes = [
+            f"{operacion} {datos['cantidad']}× · {datos['promedio_ms']:.0f} ms prom · "
+            f"{datos['maximo_ms']:.0f} ms máx"
+            for operacion, datos in sorted(tiempos.items())
+        ]
+        self.label_contrasenas.configure(
+            text=f"Contraseñas (bcrypt, {seguridad.rondas_configuradas()} rondas): "
+                 + (" | ".join(partes) if partes else "sin operaciones todavía")
+        )
@@ -3,7 +3,10 @@ import customtkinter as ctk
 from tkinter import messagebox
 from database.db_manager import DatabaseManager
 from core.session import obtener_sesion
-from typing import Optional, List, Tuple
+from core.worker import obtener_trabajador
+from gui.busqueda import Debouncer, FiltroIncremental
+from models.empleado import Empleado
+from typing import Optional, List
 
 
 class EmpleadosWindow:
@@ -15,10 +18,17 @@ class EmpleadosWindow:
 
         # 🔹 Obtener la base de datos desde la sesión
         self.db = self.session.db
+        self.trabajador = obtener_trabajador()
 
         # Variables
         self.empleado_seleccionado = None
 
+        # Snapshot en memoria y tarjetas ya construidas (mismo orden)
+        self.filtro = FiltroIncremental()
+        self._tarjetas = []
+        self._visibles = set()
+        self._mensaje = None
+
         # Colores consistentes (DEBE IR ANTES de _crear_interfaz)
         self.COLORES = {
             'card_bg': ("#FFFFFF", "#3a3a3a"),
@@ -119,7 +129,8 @@ class EmpleadosWindow:
             corner_radius=10
         )
         self.entry_buscar.pack(side="left", padx=(0, 10))
-        self.entry_buscar.bind('<KeyRelease>', lambda e: self.aplicar_filtros())
+        self._buscar_con_espera = Debouncer(self.entry_buscar, self.aplicar_filtros)
+        self.entry_buscar.bind('<KeyRelease>', self._buscar_con_espera)
 
         btn_limpiar = ctk.CTkButton(
             search_frame,
@@ -187,78 +198,83 @@ class EmpleadosWindow:
             self.scroll_frame.columnconfigure(i, weight=1)
 
     def cargar_empleados(self):
-        """Carga y muestra los empleados"""
-        # Limpiar grid
+        """Carga los empleados en segundo plano"""
+        self._limpiar_grid()
+        self._mostrar_cargando()
+
+        self.trabajador.ejecutar(
+            self.scroll_frame,
+            self.session.empleados.todas,
+            al_terminar=self._mostrar_empleados,
+            al_fallar=self._mostrar_error_carga,
+            clave=(id(self), "empleados")
+        )
+
+    def _limpiar_grid(self):
+        """Elimina el contenido del grid"""
         for widget in self.scroll_frame.winfo_children():
             widget.destroy()
+        self._tarjetas = []
+        self._visibles = set()
+        self._mensaje = None
 
-        # Obtener empleados
-        empleados = self.db.obtener_empleados()
+    def _mostrar_empleados(self, empleados: List[Empleado]):
+        """Guarda el snapshot recibido y construye sus tarjetas una sola vez"""
+        self._limpiar_grid()
+        self.filtro.cargar(empleados, self._clave_busqueda)
 
         if not empleados:
             self._mostrar_mensaje_vacio()
             return
 
-        # Aplicar filtros
-        empleados_filtrados = self._filtrar_empleados(empleados)
-
-        if not empleados_filtrados:
-            self._mostrar_mensaje_sin_resultados()
-            return
-
-        # Mostrar empleados en grid
-        self._mostrar_empleados_grid(empleados_filtrados)
-
-    def _filtrar_empleados(self, empleados: List[Tuple]) -> List[Tuple]:
-        """Filtra los empleados según criterios"""
-        busqueda = self.entry_buscar.get().strip().lower()
-        privilegio_filtro = self.combo_filtro_privilegio.get()
+        self._tarjetas = [self._crear_tarjeta_empleado(empleado) for empleado in empleados]
 
-        empleados_filtrados = []
+        # Aplicar filtros
+        self.aplicar_filtros()
 
-        for empleado in empleados:
-            # empleado = (id, nombre, apellido, puesto, telefono, usuario, password, privilegio)
-            nombre_completo = f"{empleado[1]} {empleado[2]}".lower()
-            puesto = str(empleado[3]).lower()
-            usuario = str(empleado[5]).lower() if empleado[5] else ""
-            privilegio = empleado[7] if len(empleado) > 7 else "Empleado"
+    @staticmethod
+    def _clave_busqueda(empleado: Empleado) -> str:
+        """Texto en el que se busca: nombre completo, puesto y usuario"""
+        nombre_completo = f"{empleado.nombre} {empleado.apellido}"
+        usuario = str(empleado.usuario) if empleado.usuario else ""
+        return "\x00".join((nombre_completo, str(empleado.puesto), usuario))
 
-            # Aplicar filtros
-            coincide_busqueda = (busqueda in nombre_completo or
-                                 busqueda in puesto or
-                                 busqueda in usuario) if busqueda else True
+    @staticmethod
+    def _coincide_privilegio(empleado: Empleado, privilegio_filtro: str) -> bool:
+        """Verifica el filtro de privilegio"""
+        return empleado.privilegio == privilegio_filtro if privilegio_filtro != "Todos" else True
 
-            coincide_privilegio = (privilegio == privilegio_filtro if
-                                   privilegio_filtro != "Todos" else True)
+    def _mostrar_empleados_grid(self, indices: List[int]):
+        """Muestra u oculta las tarjetas existentes según el filtro"""
+        self._ocultar_mensaje()
 
-            if coincide_busqueda and coincide_privilegio:
-                empleados_filtrados.append(empleado)
+        nuevos = set(indices)
+        for i in self._visibles - nuevos:
+            self._tarjetas[i].grid_remove()
 
-        return empleados_filtrados
+        for posicion, i in enumerate(indices):
+            self._tarjetas[i].grid(row=posicion // 3, column=posicion % 3, padx=10, pady=10, sticky="nsew")
 
-    def _mostrar_empleados_grid(self, empleados: List[Tuple]):
-        """Muestra los empleados en formato grid"""
-        row = 0
-        col = 0
+        self._visibles = nuevos
 
-        for empleado in empleados:
-            card = self._crear_tarjeta_empleado(empleado)
-            card.grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
+        if not indices:
+            self._mostrar_mensaje_sin_resultados()
 
-            col += 1
-            if col >= 3:
-                col = 0
-                row += 1
+    def _ocultar_mensaje(self):
+        """Elimina el mensaje de estado si hay uno visible"""
+        if self._mensaje is not None:
+            self._mensaje.destroy()
+            self._mensaje = None
 
-    def _crear_tarjeta_empleado(self, datos: Tuple):
+    def _crear_tarjeta_empleado(self, datos: Empleado):
         """Crea una tarjeta visual para un empleado"""
-        empleado_id = datos[0]
-        nombre = datos[1]
-        apellido = datos[2]
-        puesto = datos[3]
-        telefono = datos[4] if datos[4] else "Sin teléfono"
-        usuario = datos[5] if datos[5] else "Sin usuario"
-        privilegio = datos[7] if len(datos) > 7 else "Empleado"
+        empleado_id = datos.id
+        nombre = datos.nombre
+        apellido = datos.apellido
+        puesto = datos.puesto
+        telefono = datos.telefono if datos.telefono else "Sin teléfono"
+        usuario = datos.usuario if datos.usuario else "Sin usuario"
+        privilegio = datos.privilegio
 
         # Frame principal de la tarjeta
         card = ctk.CTkFrame(
@@ -413,7 +429,7 @@ class EmpleadosWindow:
         btn_editar.pack(side="left", expand=True, padx=(0, 5))
 
         # Botón eliminar (no para admin)
-        if datos[0] != 1:  # No mostrar para el usuario admin
+        if datos.id != 1:  # No mostrar para el usuario admin
             btn_eliminar = ctk.CTkButton(
                 btn_frame,
                 text="🗑️",
@@ -423,7 +439,7 @@ class EmpleadosWindow:
                 corner_radius=8,
                 fg_color=self.COLORES['danger'],
                 hover_color="#C0392B",
-                command=lambda: self.eliminar_empleado(datos)
+                command=lambda: self.eliminar_empleado(datos, btn_eliminar)
             )
             btn_eliminar.pack(side="left", expand=True, padx=(5, 0))
 
@@ -435,6 +451,7 @@ class EmpleadosWindow:
         """Muestra mensaje cuando no hay empleados"""
         mensaje = ctk.CTkFrame(self.scroll_frame, fg_color="transparent")
         mensaje.grid(row=0, column=0, columnspan=3, pady=100)
+        self._mensaje = mensaje
 
         ctk.CTkLabel(
             mensaje,
@@ -455,10 +472,40 @@ class EmpleadosWindow:
             text_color=("#7F8C8D", "#95A5A6")
         ).pack()
 
+    def _mostrar_cargando(self):
+        """Muestra el estado de carga mientras llegan los datos"""
+        mensaje = ctk.CTkFrame(self.scroll_frame, fg_color="transparent")
+        mensaje.grid(row=0, column=0, columnspan=3, pady=100)
+
+        ctk.CTkLabel(
+            mensaje,
+            text="⏳",
+            font=("Segoe UI", 48)
+        ).pack()
+
+        ctk.CTkLabel(
+            mensaje,
+            text="Cargando empleados...",
+            font=("Segoe UI", 14),
+            text_color=("#7F8C8D", "#95A5A6")
+        ).pack(pady=(10, 0))
+
+    def _mostrar_error_carga(self, error: Exception):
+        """Muestra el error cuando la consulta falla"""
+        print(f"Error al cargar empleados: {error}")
+        self._limpiar_grid()
+        ctk.CTkLabel(
+            self.scroll_frame,
+            text="⚠️ No se pudieron cargar los empleados",
+            font=("Segoe UI", 14),
+            text_color=self.COLORES['danger']
+        ).grid(row=0, column=0, columnspan=3, pady=100)
+
     def _mostrar_mensaje_sin_resultados(self):
         """Muestra mensaje cuando no hay resultados"""
         mensaje = ctk.CTkFrame(self.scroll_frame, fg_color="transparent")
         mensaje.grid(row=0, column=0, columnspan=3, pady=100)
+        self._mensaje = mensaje
 
         ctk.CTkLabel(
             mensaje,
@@ -480,14 +527,25 @@ class EmpleadosWindow:
         ).pack()
 
     def aplicar_filtros(self):
-        """Aplica los filtros de búsqueda"""
-        self.cargar_empleados()
+        """Filtra el snapshot en memoria sin volver a consultar la base de datos"""
+        self._buscar_con_espera.cancelar()
+        if not self.filtro.filas:
+            return
+
+        privilegio_filtro = self.combo_filtro_privilegio.get()
+
+        indices = self.filtro.filtrar(
+            self.entry_buscar.get(),
+            firma=privilegio_filtro,
+            predicado=lambda empleado: self._coincide_privilegio(empleado, privilegio_filtro)
+        )
+        self._mostrar_empleados_grid(indices)
 
     def limpiar_busqueda(self):
         """Limpia el campo de búsqueda"""
         self.entry_buscar.delete(0, 'end')
         self.combo_filtro_privilegio.set("Todos")
-        self.cargar_empleados()
+        self.aplicar_filtros()
 
     def abrir_formulario_agregar(self):
         """Abre el formulario para agregar empleado"""
@@ -507,8 +565,8 @@ class EmpleadosWindow:
 
         FormularioEmpleado(self.parent, self.db, self.cargar_empleados, datos)
 
-    def eliminar_empleado(self, datos=None):
-        """Elimina un empleado"""
+    def eliminar_empleado(self, datos=None, boton=None):
+        """Elimina un empleado (en el trabajador; `boton` queda deshabilitado mientras tanto)"""
         if datos is None:
             datos = self.empleado_seleccionado
 
@@ -519,8 +577,8 @@ class EmpleadosWindow:
             )
             return
 
-        empleado_id = datos[0]
-        nombre_completo = f"{datos[1]} {datos[2]}"
+        empleado_id = datos.id
+        nombre_completo = f"{datos.nombre} {datos.apellido}"
 
         if empleado_id == 1:
             messagebox.showerror(
@@ -536,9 +594,28 @@ class EmpleadosWindow:
         )
 
         if respuesta:
-            self.db.eliminar_empleado(empleado_id)
-            messagebox.showinfo("Éxito", "Empleado eliminado correctamente")
-            self.cargar_empleados()
+            if boton is not None:
+                boton.configure(state="disabled", text="⏳")
+            self.trabajador.ejecutar(
+                self.parent,
+                self.session.empleados.eliminar,
+                empleado_id,
+                al_terminar=lambda _: self._al_eliminar(),
+                al_fallar=lambda error: self._al_fallar_eliminar(error, boton)
+            )
+
+    def _al_eliminar(self):
+        messagebox.showinfo("Éxito", "Empleado eliminado correctamente")
+        self.cargar_empleados()
+
+    def _al_fallar_eliminar(self, error, boton):
+        print(f"Error al eliminar empleado: {error}")
+        self._restaurar_boton(boton, "🗑️")
+        messagebox.showerror("Error", "No se pudo eliminar el empleado")
+
+    def _restaurar_boton(self, boton, texto):
+        if boton is not None and boton.winfo_exists():
+            boton.configure(state="normal", text=texto)
 
 class FormularioEmpleado:
     def __init__(self, parent, db, callback_refrescar, datos=None):
@@ -698,17 +775,16 @@ class FormularioEmpleado:
 
         # Si hay datos (modo editar), rellenar campos
         if self.datos:
-            # datos = (id, nombre, apellido, puesto, telefono, usuario, password, privilegio)
-            self.entry_nombre.insert(0, self.datos[1])
-            self.entry_apellido.insert(0, self.datos[2])
-            self.combo_puesto.set(self.datos[3])
-            self.entry_telefono.insert(0, self.datos[4] if self.datos[4] else "")
-            self.entry_usuario.insert(0, self.datos[5] if self.datos[5] else "")
-            self.entry_password.insert(0, self.datos[6] if self.datos[6] else "")
-            self.combo_privilegio.set(self.datos[7] if self.datos[7] else "Empleado")
+            self.entry_nombre.insert(0, self.datos.nombre)
+            self.entry_apellido.insert(0, self.datos.apellido)
+            self.combo_puesto.set(self.datos.puesto)
+            self.entry_telefono.insert(0, self.datos.telefono if self.datos.telefono else "")
+            self.entry_usuario.insert(0, self.datos.usuario if self.datos.usuario else "")
+            self.entry_password.insert(0, self.datos.password if self.datos.password else "")
+            self.combo_privilegio.set(self.datos.privilegio if self.datos.privilegio else "Empleado")
 
             # Si es el admin, deshabilitar privilegio
-            if self.datos[0] == 1:
+            if self.datos.id == 1:
                 self.combo_privilegio.configure(state="disabled")
 
         # Frame para botones
@@ -716,16 +792,16 @@ class FormularioEmpleado:
         frame_botones.pack(pady=(10, 15))
 
         # Botón Guardar
-        btn_guardar = ctk.CTkButton(frame_botones,
-                                    text="💾 Guardar",
-                                    command=self.guardar,
-                                    width=180,
-                                    height=45,
-                                    font=("Segoe UI", 13, "bold"),
-                                    corner_radius=10,
-                                    fg_color="#27ae60",
-                                    hover_color="#229954")
-        btn_guardar.pack(side="left", padx=5)
+        self.btn_guardar = ctk.CTkButton(frame_botones,
+                                         text="💾 Guardar",
+                                         command=self.guardar,
+                                         width=180,
+                                         height=45,
+                                         font=("Segoe UI", 13, "bold"),
+                                         corner_radius=10,
+                                         fg_color="#27ae60",
+                                         hover_color="#229954")
+        self.btn_guardar.pack(side="left", padx=5)
 
         # Botón Cancelar
         btn_cancelar = ctk.CTkButton(frame_botones,
@@ -764,30 +840,50 @@ class FormularioEmpleado:
             messagebox.showerror("Error", "El teléfono debe contener solo números")
             return
 
-        # Guardar en base de datos
+        # Guardar en base de datos (fuera del hilo de Tk: el hash de bcrypt es lento)
         if self.datos:  # EDITAR
-            empleado_id = self.datos[0]
-            exito = self.db.actualizar_empleado(empleado_id, nombre, apellido,
-                                                puesto, telefono, privilegio)
-
-            if exito:
-                messagebox.showinfo("Éxito", "Empleado actualizado correctamente")
-                self.callback_refrescar()
-                self.ventana.destroy()
-            else:
-                messagebox.showerror("Error", "No se pudo actualizar el empleado")
+            empleado_id = self.datos.id
+            self._ejecutar_guardado(
+                self.db.actualizar_empleado,
+                (empleado_id, nombre, apellido, puesto, telefono, privilegio),
+                "Empleado actualizado correctamente",
+                "No se pudo actualizar el empleado"
+            )
 
         else:  # AGREGAR
             if not usuario or not password:
                 messagebox.showerror("Error", "Usuario y contraseña son obligatorios")
                 return
 
-            exito = self.db.agregar_empleado(nombre, apellido, puesto, telefono,
-                                             usuario, password, privilegio)
+            self._ejecutar_guardado(
+                self.db.agregar_empleado,
+                (nombre, apellido, puesto, telefono, usuario, password, privilegio),
+                "Empleado agregado correctamente",
+                "El nombre de usuario ya existe"
+            )
+
+    def _ejecutar_guardado(self, funcion, args, mensaje_exito, mensaje_error):
+        """Ejecuta el guardado en el trabajador mostrando el progreso en el botón"""
+        self.btn_guardar.configure(state="disabled", text="⏳ Guardando...")
+        obtener_trabajador().ejecutar(
+            self.ventana,
+            funcion,
+            *args,
+            al_terminar=lambda exito: self._al_guardar(exito, mensaje_exito, mensaje_error),
+            al_fallar=self._al_fallar_guardado
+        )
 
-            if exito:
-                messagebox.showinfo("Éxito", "Empleado agregado correctamente")
-                self.callback_refrescar()
-                self.ventana.destroy()
-            else:
-                messagebox.showerror("Error", "El nombre de usuario ya existe")
\ No newline at end of file
+    def _al_guardar(self, exito, mensaje_exito, mensaje_error):
+        """Resultado del guardado (en el hilo de Tk)"""
+        if exito:
+            messagebox.showinfo("Éxito", mensaje_exito)
+            self.callback_refrescar()
+            self.ventana.destroy()
+        else:
+            self.btn_guardar.configure(state="normal", text="💾 Guardar")
+            messagebox.showerror("Error", mensaje_error)
+
+    def _al_fallar_guardado(self, error):
+        print(f"Error al guardar empleado: {error}")
+        self.btn_guardar.configure(state="normal", text="💾 Guardar")
+        messagebox.showerror("Error", "No se pudo guardar el empleado")
\ No newline at end of file
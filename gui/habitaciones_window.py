@@ -3,7 +3,10 @@ import customtkinter as ctk
 from tkinter import messagebox
 from database.db_manager import DatabaseManager
 from core.session import obtener_sesion
-from typing import Optional, List, Tuple
+from core.worker import obtener_trabajador
+from gui.busqueda import Debouncer, FiltroIncremental
+from models.habitacion import Habitacion
+from typing import Optional, List
 
 
 class HabitacionesWindow:
@@ -15,12 +18,19 @@ class HabitacionesWindow:
 
         # 🔹 Obtener la base de datos desde la sesión
         self.db = self.session.db
+        self.trabajador = obtener_trabajador()
 
         # Variables
         self.habitacion_seleccionada = None
         self.filtro_estado = "Todos"
         self.filtro_tipo = "Todos"
 
+        # Snapshot en memoria y tarjetas ya construidas (mismo orden)
+        self.filtro = FiltroIncremental()
+        self._tarjetas = []
+        self._visibles = set()
+        self._mensaje = None
+
         # Colores
         self.COLORES = {
             'disponible': "#27AE60",
@@ -121,7 +131,8 @@ class HabitacionesWindow:
             corner_radius=10
         )
         self.entry_buscar.pack(side="left", padx=(0, 15))
-        self.entry_buscar.bind('<KeyRelease>', lambda e: self.aplicar_filtros())
+        self._buscar_con_espera = Debouncer(self.entry_buscar, self.aplicar_filtros)
+        self.entry_buscar.bind('<KeyRelease>', self._buscar_con_espera)
 
         # Filtro por estado
         ctk.CTkLabel(
@@ -191,67 +202,105 @@ class HabitacionesWindow:
             self.scroll_frame.columnconfigure(i, weight=1)
 
     def cargar_habitaciones(self):
-        """Carga y muestra las habitaciones"""
-        # Limpiar grid
-        for widget in self.scroll_frame.winfo_children():
-            widget.destroy()
+        """Carga las habitaciones en segundo plano"""
+        self._limpiar_grid()
+        self._mostrar_cargando()
 
-        # Obtener habitaciones
-        habitaciones = self.db.obtener_habitaciones()
+        self.trabajador.ejecutar(
+            self.scroll_frame,
+            self.session.habitaciones.todas,
+            al_terminar=self._mostrar_habitaciones,
+            al_fallar=self._mostrar_error_carga,
+            clave=(id(self), "habitaciones")
+        )
 
-        if not habitaciones:
-            self._mostrar_mensaje_vacio()
+    def actualizar(self):
+        """Trae los cambios sin vaciar la pantalla (solo se rehacen las tarjetas que cambiaron)"""
+        if not self._tarjetas:
+            self.cargar_habitaciones()
             return
 
-        # Aplicar filtros
-        habitaciones_filtradas = self._filtrar_habitaciones(habitaciones)
+        self.trabajador.ejecutar(
+            self.scroll_frame,
+            self.session.habitaciones.todas,
+            al_terminar=self._aplicar_cambios,
+            al_fallar=lambda error: print(f"Error al actualizar habitaciones: {error}"),
+            clave=(id(self), "habitaciones")
+        )
 
-        if not habitaciones_filtradas:
-            self._mostrar_mensaje_sin_resultados()
+    def _aplicar_cambios(self, habitaciones: List[Habitacion]):
+        """Reemplaza solo las tarjetas cuya habitación es otro objeto del mapa"""
+        anteriores = self.filtro.filas
+        if [hab.id for hab in anteriores] != [hab.id for hab in habitaciones]:
+            # Se agregaron, borraron o renumeraron habitaciones
+            self._mostrar_habitaciones(habitaciones)
             return
 
-        # Mostrar habitaciones en grid
-        self._mostrar_habitaciones_grid(habitaciones_filtradas)
+        cambiadas = [i for i, (anterior, nueva) in enumerate(zip(anteriores, habitaciones))
+                     if anterior is not nueva]
+        if not cambiadas:
+            return
 
-    def _filtrar_habitaciones(self, habitaciones: List[Tuple]) -> List[Tuple]:
-        """Filtra las habitaciones según criterios"""
-        busqueda = self.entry_buscar.get().strip().lower()
-        estado_filtro = self.combo_filtro_estado.get()
-        tipo_filtro = self.combo_filtro_tipo.get()
+        for i in cambiadas:
+            self._tarjetas[i].destroy()
+            self._tarjetas[i] = self._crear_tarjeta_habitacion(habitaciones[i])
+        # Las tarjetas nuevas todavía no están en el grid
+        self._visibles.difference_update(cambiadas)
 
-        habitaciones_filtradas = []
+        self.filtro.cargar(habitaciones, lambda hab: str(hab.numero))
+        self.aplicar_filtros()
 
-        for hab in habitaciones:
-            # hab = (id, numero, tipo, precio, estado)
-            numero = str(hab[1]).lower()
-            tipo = hab[2]
-            estado = hab[4]
+    def _limpiar_grid(self):
+        """Elimina el contenido del grid"""
+        for widget in self.scroll_frame.winfo_children():
+            widget.destroy()
+        self._tarjetas = []
+        self._visibles = set()
+        self._mensaje = None
 
-            # Aplicar filtros
-            coincide_busqueda = busqueda in numero if busqueda else True
-            coincide_estado = estado == estado_filtro if estado_filtro != "Todos" else True
-            coincide_tipo = tipo == tipo_filtro if tipo_filtro != "Todos" else True
+    def _mostrar_habitaciones(self, habitaciones: List[Habitacion]):
+        """Guarda el snapshot recibido y construye sus tarjetas una sola vez"""
+        self._limpiar_grid()
+        self.filtro.cargar(habitaciones, lambda hab: str(hab.numero))
 
-            if coincide_busqueda and coincide_estado and coincide_tipo:
-                habitaciones_filtradas.append(hab)
+        if not habitaciones:
+            self._mostrar_mensaje_vacio()
+            return
+
+        self._tarjetas = [self._crear_tarjeta_habitacion(hab) for hab in habitaciones]
+
+        # Aplicar filtros
+        self.aplicar_filtros()
+
+    def _coincide_filtros(self, hab: Habitacion, estado_filtro: str, tipo_filtro: str) -> bool:
+        """Verifica los filtros de estado y tipo"""
+        coincide_estado = hab.estado == estado_filtro if estado_filtro != "Todos" else True
+        coincide_tipo = hab.tipo == tipo_filtro if tipo_filtro != "Todos" else True
+        return coincide_estado and coincide_tipo
+
+    def _mostrar_habitaciones_grid(self, indices: List[int]):
+        """Muestra u oculta las tarjetas existentes según el filtro"""
+        self._ocultar_mensaje()
 
-        return habitaciones_filtradas
+        nuevos = set(indices)
+        for i in self._visibles - nuevos:
+            self._tarjetas[i].grid_remove()
 
-    def _mostrar_habitaciones_grid(self, habitaciones: List[Tuple]):
-        """Muestra las habitaciones en formato grid"""
-        row = 0
-        col = 0
+        for posicion, i in enumerate(indices):
+            self._tarjetas[i].grid(row=posicion // 4, column=posicion % 4, padx=10, pady=10, sticky="n")
 
-        for hab in habitaciones:
-            card = self._crear_tarjeta_habitacion(hab)
-            card.grid(row=row, column=col, padx=10, pady=10, sticky="n")
+        self._visibles = nuevos
 
-            col += 1
-            if col >= 4:
-                col = 0
-                row += 1
+        if not indices:
+            self._mostrar_mensaje_sin_resultados()
+
+    def _ocultar_mensaje(self):
+        """Elimina el mensaje de estado si hay uno visible"""
+        if self._mensaje is not None:
+            self._mensaje.destroy()
+            self._mensaje = None
 
-    def _crear_tarjeta_habitacion(self, datos: Tuple):
+    def _crear_tarjeta_habitacion(self, datos: Habitacion):
         """Crea una tarjeta visual para una habitación"""
         habitacion_id, numero, tipo, precio, estado = datos
 
@@ -379,10 +428,12 @@ class HabitacionesWindow:
                 corner_radius=8,
                 fg_color=self.COLORES['danger'],
                 hover_color="#C0392B",
-                command=lambda: self.eliminar_habitacion(datos)
+                command=lambda: self.eliminar_habitacion(datos, btn_eliminar)
             )
             btn_eliminar.pack(side="left", expand=True, padx=(5, 0))
 
+        return card
+
     def _get_texto_estado(self, estado: str) -> str:
         """Retorna el texto formateado del estado"""
         estados = {
@@ -400,7 +451,8 @@ class HabitacionesWindow:
     def _mostrar_mensaje_vacio(self):
         """Muestra mensaje cuando no hay habitaciones"""
         mensaje = ctk.CTkFrame(self.scroll_frame, fg_color="transparent")
-        mensaje.pack(expand=True, pady=100)
+        mensaje.grid(row=0, column=0, columnspan=4, pady=100)
+        self._mensaje = mensaje
 
         ctk.CTkLabel(
             mensaje,
@@ -421,10 +473,40 @@ class HabitacionesWindow:
             text_color=("#7F8C8D", "#95A5A6")
         ).pack()
 
+    def _mostrar_cargando(self):
+        """Muestra el estado de carga mientras llegan los datos"""
+        mensaje = ctk.CTkFrame(self.scroll_frame, fg_color="transparent")
+        mensaje.grid(row=0, column=0, columnspan=4, pady=100)
+
+        ctk.CTkLabel(
+            mensaje,
+            text="⏳",
+            font=("Segoe UI", 48)
+        ).pack()
+
+        ctk.CTkLabel(
+            mensaje,
+            text="Cargando habitaciones...",
+            font=("Segoe UI", 14),
+            text_color=("#7F8C8D", "#95A5A6")
+        ).pack(pady=(10, 0))
+
+    def _mostrar_error_carga(self, error: Exception):
+        """Muestra el error cuando la consulta falla"""
+        print(f"Error al cargar habitaciones: {error}")
+        self._limpiar_grid()
+        ctk.CTkLabel(
+            self.scroll_frame,
+            text="⚠️ No se pudieron cargar las habitaciones",
+            font=("Segoe UI", 14),
+            text_color=self.COLORES['danger']
+        ).grid(row=0, column=0, columnspan=4, pady=100)
+
     def _mostrar_mensaje_sin_resultados(self):
         """Muestra mensaje cuando no hay resultados de búsqueda"""
         mensaje = ctk.CTkFrame(self.scroll_frame, fg_color="transparent")
-        mensaje.pack(expand=True, pady=100)
+        mensaje.grid(row=0, column=0, columnspan=4, pady=100)
+        self._mensaje = mensaje
 
         ctk.CTkLabel(
             mensaje,
@@ -446,8 +528,20 @@ class HabitacionesWindow:
         ).pack()
 
     def aplicar_filtros(self):
-        """Aplica los filtros de búsqueda"""
-        self.cargar_habitaciones()
+        """Filtra el snapshot en memoria sin volver a consultar la base de datos"""
+        self._buscar_con_espera.cancelar()
+        if not self.filtro.filas:
+            return
+
+        estado_filtro = self.combo_filtro_estado.get()
+        tipo_filtro = self.combo_filtro_tipo.get()
+
+        indices = self.filtro.filtrar(
+            self.entry_buscar.get(),
+            firma=(estado_filtro, tipo_filtro),
+            predicado=lambda hab: self._coincide_filtros(hab, estado_filtro, tipo_filtro)
+        )
+        self._mostrar_habitaciones_grid(indices)
 
     def abrir_formulario_agregar(self):
         """Abre el formulario para agregar habitación"""
@@ -467,8 +561,8 @@ class HabitacionesWindow:
 
         FormularioHabitacion(self.parent, self.db, self.cargar_habitaciones, datos)
 
-    def eliminar_habitacion(self, datos=None):
-        """Elimina una habitación"""
+    def eliminar_habitacion(self, datos=None, boton=None):
+        """Elimina una habitación (en el trabajador; `boton` queda deshabilitado mientras tanto)"""
         if datos is None:
             datos = self.habitacion_seleccionada
 
@@ -479,7 +573,7 @@ class HabitacionesWindow:
             )
             return
 
-        habitacion_id, numero = datos[0], datos[1]
+        habitacion_id, numero = datos.id, datos.numero
 
         respuesta = messagebox.askyesno(
             "Confirmar Eliminación",
@@ -488,9 +582,31 @@ class HabitacionesWindow:
         )
 
         if respuesta:
-            self.db.eliminar_habitacion(habitacion_id)
-            messagebox.showinfo("Éxito", "Habitación eliminada correctamente")
-            self.cargar_habitaciones()
+            if boton is not None:
+                boton.configure(state="disabled", text="⏳")
+            self.trabajador.ejecutar(
+                self.parent,
+                self.session.habitaciones.eliminar,
+                habitacion_id,
+                al_terminar=lambda _: self._al_eliminar(),
+                al_fallar=lambda error: self._al_fallar_eliminar(error, boton)
+            )
+
+    def _al_eliminar(self):
+        messagebox.showinfo("Éxito", "Habitación eliminada correctamente")
+        self.cargar_habitaciones()
+
+    def _al_fallar_eliminar(self, error, boton):
+        print(f"Error al eliminar habitación: {error}")
+        self._restaurar_boton(boton, "🗑️")
+        messagebox.showerror(
+            "Error",
+            "No se pudo eliminar la habitación.\nPuede tener reservas registradas."
+        )
+
+    def _restaurar_boton(self, boton, texto):
+        if boton is not None and boton.winfo_exists():
+            boton.configure(state="normal", text=texto)
 
 
 class FormularioHabitacion:
@@ -675,7 +791,7 @@ class FormularioHabitacion:
         frame_botones.pack(fill="x", pady=(30, 0))
 
         # Botón Guardar
-        btn_guardar = ctk.CTkButton(
+        self.btn_guardar = ctk.CTkButton(
             frame_botones,
             text="💾 Guardar",
             command=self.guardar,
@@ -685,7 +801,7 @@ class FormularioHabitacion:
             fg_color="#27AE60",
             hover_color="#229954"
         )
-        btn_guardar.pack(fill="x", pady=(0, 10))
+        self.btn_guardar.pack(fill="x", pady=(0, 10))
 
         # Botón Cancelar
         btn_cancelar = ctk.CTkButton(
@@ -705,10 +821,10 @@ class FormularioHabitacion:
 
     def _rellenar_campos(self):
         """Rellena los campos con los datos existentes"""
-        self.entry_numero.insert(0, self.datos[1])
-        self.combo_tipo.set(self.datos[2])
-        self.entry_precio.insert(0, self.datos[3])
-        self.combo_estado.set(self.datos[4])
+        self.entry_numero.insert(0, self.datos.numero)
+        self.combo_tipo.set(self.datos.tipo)
+        self.entry_precio.insert(0, self.datos.precio)
+        self.combo_estado.set(self.datos.estado)
 
     def guardar(self):
         """Guarda o actualiza la habitación"""
@@ -724,27 +840,42 @@ class FormularioHabitacion:
 
         precio = float(precio_str)
 
-        # Guardar en base de datos
-        try:
-            if self.datos:  # EDITAR
-                habitacion_id = self.datos[0]
-                exito = self.db.actualizar_habitacion(habitacion_id, numero, tipo, precio, estado)
-                mensaje = "Habitación actualizada correctamente"
-            else:  # AGREGAR
-                exito = self.db.agregar_habitacion(numero, tipo, precio, estado)
-                mensaje = "Habitación agregada correctamente"
-
-            if exito:
-                messagebox.showinfo("Éxito", mensaje)
-                self.callback_refrescar()
-                self.ventana.destroy()
-            else:
-                messagebox.showerror(
-                    "Error",
-                    "El número de habitación ya existe.\nIntenta con otro número."
-                )
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al guardar: {str(e)}")
+        # Guardar en base de datos (fuera del hilo de Tk)
+        if self.datos:  # EDITAR
+            funcion = self.db.actualizar_habitacion
+            args = (self.datos.id, numero, tipo, precio, estado)
+            mensaje = "Habitación actualizada correctamente"
+        else:  # AGREGAR
+            funcion = self.db.agregar_habitacion
+            args = (numero, tipo, precio, estado)
+            mensaje = "Habitación agregada correctamente"
+
+        self.btn_guardar.configure(state="disabled", text="⏳ Guardando...")
+        obtener_trabajador().ejecutar(
+            self.ventana,
+            funcion,
+            *args,
+            al_terminar=lambda exito: self._al_guardar(exito, mensaje),
+            al_fallar=self._al_fallar_guardado
+        )
+
+    def _al_guardar(self, exito, mensaje):
+        """Resultado del guardado (en el hilo de Tk)"""
+        if exito:
+            messagebox.showinfo("Éxito", mensaje)
+            self.callback_refrescar()
+            self.ventana.destroy()
+        else:
+            self.btn_guardar.configure(state="normal", text="💾 Guardar")
+            messagebox.showerror(
+                "Error",
+                "El número de habitación ya existe.\nIntenta con otro número."
+            )
+
+    def _al_fallar_guardado(self, error):
+        print(f"Error al guardar habitación: {error}")
+        self.btn_guardar.configure(state="normal", text="💾 Guardar")
+        messagebox.showerror("Error", f"Error al guardar: {error}")
 
     def _validar_campos(self, numero: str, precio_str: str) -> bool:
         """Valida los campos del formulario"""
@@ -3,7 +3,11 @@ import customtkinter as ctk
 from tkinter import messagebox
 from database.db_manager import DatabaseManager
 from core.session import obtener_sesion
-from typing import Optional, List, Tuple
+from core.worker import obtener_trabajador
+from gui.busqueda import Debouncer, FiltroIncremental
+from models.huesped import Huesped
+from utils.indice_busqueda import digitos_telefono
+from typing import Optional, List
 
 
 class HuespedesWindow:
@@ -15,10 +19,17 @@ class HuespedesWindow:
 
         # 🔹 Obtener la base de datos desde la sesión
         self.db = self.session.db
+        self.trabajador = obtener_trabajador()
 
         # Variables
         self.huesped_seleccionado = None
 
+        # Snapshot en memoria y tarjetas ya construidas (mismo orden)
+        self.filtro = FiltroIncremental()
+        self._tarjetas = []
+        self._visibles = set()
+        self._mensaje = None
+
         # Colores consistentes con el diseño
         self.COLORES = {
             'card_bg': ("#FFFFFF", "#3a3a3a"),
@@ -117,7 +128,8 @@ class HuespedesWindow:
             corner_radius=10
         )
         self.entry_buscar.pack(side="left", padx=(0, 10))
-        self.entry_buscar.bind('<KeyRelease>', lambda e: self.aplicar_filtros())
+        self._buscar_con_espera = Debouncer(self.entry_buscar, self.aplicar_filtros)
+        self.entry_buscar.bind('<KeyRelease>', self._buscar_con_espera)
 
         btn_limpiar = ctk.CTkButton(
             search_frame,
@@ -168,69 +180,84 @@ class HuespedesWindow:
             self.scroll_frame.columnconfigure(i, weight=1)
 
     def cargar_huespedes(self):
-        """Carga y muestra los huéspedes"""
-        # Limpiar grid
+        """Carga los huéspedes en segundo plano"""
+        self._limpiar_grid()
+        self._mostrar_cargando()
+
+        self.trabajador.ejecutar(
+            self.scroll_frame,
+            self._preparar_snapshot,
+            al_terminar=self._mostrar_huespedes,
+            al_fallar=self._mostrar_error_carga,
+            clave=(id(self), "huespedes")
+        )
+
+    def _limpiar_grid(self):
+        """Elimina el contenido del grid"""
         for widget in self.scroll_frame.winfo_children():
             widget.destroy()
-
-        # Obtener huéspedes
-        huespedes = self.db.obtener_huespedes()
+        self._tarjetas = []
+        self._visibles = set()
+        self._mensaje = None
+
+    def _preparar_snapshot(self) -> FiltroIncremental:
+        """(Hilo de trabajo) Trae los huéspedes y arma el índice de búsqueda"""
+        filtro = FiltroIncremental()
+        filtro.cargar(self.session.huespedes.todas(), self._clave_busqueda, indexar=True)
+        return filtro
+
+    def _mostrar_huespedes(self, filtro: FiltroIncremental):
+        """Guarda el snapshot recibido y construye sus tarjetas una sola vez"""
+        self._limpiar_grid()
+        self.filtro = filtro
+        huespedes = filtro.filas
 
         if not huespedes:
             self._mostrar_mensaje_vacio()
             return
 
-        # Aplicar filtros
-        huespedes_filtrados = self._filtrar_huespedes(huespedes)
-
-        if not huespedes_filtrados:
-            self._mostrar_mensaje_sin_resultados()
-            return
-
-        # Mostrar huéspedes en grid
-        self._mostrar_huespedes_grid(huespedes_filtrados)
-
-    def _filtrar_huespedes(self, huespedes: List[Tuple]) -> List[Tuple]:
-        """Filtra los huéspedes según criterios de búsqueda"""
-        busqueda = self.entry_buscar.get().strip().lower()
+        self._tarjetas = [self._crear_tarjeta_huesped(huesped) for huesped in huespedes]
 
-        if not busqueda:
-            return huespedes
+        # Aplicar filtros
+        self.aplicar_filtros()
 
-        huespedes_filtrados = []
+    @staticmethod
+    def _clave_busqueda(huesped: Huesped) -> str:
+        """Texto en el que se busca: nombre completo, teléfono (también solo dígitos) y email"""
+        nombre_completo = f"{huesped.nombre} {huesped.apellido}"
+        telefono = str(huesped.telefono) if huesped.telefono else ""
+        email = str(huesped.email) if huesped.email else ""
+        return "\x00".join((nombre_completo, telefono, digitos_telefono(telefono) or "", email))
 
-        for huesped in huespedes:
-            # huesped = (id, nombre, apellido, telefono, password, email)
-            nombre_completo = f"{huesped[1]} {huesped[2]}".lower()
-            telefono = str(huesped[3]).lower() if huesped[3] else ""
-            email = str(huesped[5]).lower() if len(huesped) > 5 and huesped[5] else ""
+    def _mostrar_huespedes_grid(self, indices: List[int]):
+        """Muestra u oculta las tarjetas existentes según el filtro"""
+        self._ocultar_mensaje()
 
-            if busqueda in nombre_completo or busqueda in telefono or busqueda in email:
-                huespedes_filtrados.append(huesped)
+        nuevos = set(indices)
+        for i in self._visibles - nuevos:
+            self._tarjetas[i].grid_remove()
 
-        return huespedes_filtrados
+        for posicion, i in enumerate(indices):
+            self._tarjetas[i].grid(row=posicion // 3, column=posicion % 3, padx=10, pady=10, sticky="nsew")
 
-    def _mostrar_huespedes_grid(self, huespedes: List[Tuple]):
-        """Muestra los huéspedes en formato grid"""
-        row = 0
-        col = 0
+        self._visibles = nuevos
 
-        for huesped in huespedes:
-            card = self._crear_tarjeta_huesped(huesped)
-            card.grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
+        if not indices:
+            self._mostrar_mensaje_sin_resultados()
 
-            col += 1
-            if col >= 3:
-                col = 0
-                row += 1
+    def _ocultar_mensaje(self):
+        """Elimina el mensaje de estado si hay uno visible"""
+        if self._mensaje is not None:
+            self._mensaje.destroy()
+            self._mensaje = None
 
-    def _crear_tarjeta_huesped(self, datos: Tuple):
+    def _crear_tarjeta_huesped(self, datos: Huesped):
         """Crea una tarjeta visual para un huésped"""
-        huesped_id = datos[0]
-        nombre = datos[1]
-        apellido = datos[2]
-        telefono = datos[3]
-        email = datos[5] if len(datos) > 5 else None
+        huesped_id = datos.id
+        nombre = datos.nombre
+        apellido = datos.apellido
+        telefono = datos.telefono
+        email = datos.email
 
         # Frame principal de la tarjeta
         card = ctk.CTkFrame(
@@ -379,7 +406,7 @@ class HuespedesWindow:
             corner_radius=8,
             fg_color=self.COLORES['danger'],
             hover_color="#C0392B",
-            command=lambda: self.eliminar_huesped(datos)
+            command=lambda: self.eliminar_huesped(datos, btn_eliminar)
         )
         btn_eliminar.pack(side="left", expand=True, padx=(5, 0))
 
@@ -391,6 +418,7 @@ class HuespedesWindow:
         """Muestra mensaje cuando no hay huéspedes"""
         mensaje = ctk.CTkFrame(self.scroll_frame, fg_color="transparent")
         mensaje.grid(row=0, column=0, columnspan=3, pady=100)
+        self._mensaje = mensaje
 
         ctk.CTkLabel(
             mensaje,
@@ -411,10 +439,40 @@ class HuespedesWindow:
             text_color=("#7F8C8D", "#95A5A6")
         ).pack()
 
+    def _mostrar_cargando(self):
+        """Muestra el estado de carga mientras llegan los datos"""
+        mensaje = ctk.CTkFrame(self.scroll_frame, fg_color="transparent")
+        mensaje.grid(row=0, column=0, columnspan=3, pady=100)
+
+        ctk.CTkLabel(
+            mensaje,
+            text="⏳",
+            font=("Segoe UI", 48)
+        ).pack()
+
+        ctk.CTkLabel(
+            mensaje,
+            text="Cargando huéspedes...",
+            font=("Segoe UI", 14),
+            text_color=("#7F8C8D", "#95A5A6")
+        ).pack(pady=(10, 0))
+
+    def _mostrar_error_carga(self, error: Exception):
+        """Muestra el error cuando la consulta falla"""
+        print(f"Error al cargar huéspedes: {error}")
+        self._limpiar_grid()
+        ctk.CTkLabel(
+            self.scroll_frame,
+            text="⚠️ No se pudieron cargar los huéspedes",
+            font=("Segoe UI", 14),
+            text_color=self.COLORES['danger']
+        ).grid(row=0, column=0, columnspan=3, pady=100)
+
     def _mostrar_mensaje_sin_resultados(self):
         """Muestra mensaje cuando no hay resultados de búsqueda"""
         mensaje = ctk.CTkFrame(self.scroll_frame, fg_color="transparent")
         mensaje.grid(row=0, column=0, columnspan=3, pady=100)
+        self._mensaje = mensaje
 
         ctk.CTkLabel(
             mensaje,
@@ -436,13 +494,20 @@ class HuespedesWindow:
         ).pack()
 
     def aplicar_filtros(self):
-        """Aplica los filtros de búsqueda"""
-        self.cargar_huespedes()
+        """Filtra el snapshot en memoria sin volver a consultar la base de datos"""
+        self._buscar_con_espera.cancelar()
+        if not self.filtro.filas:
+            return
+
+        # "(55) 12-34" busca también como "551234"
+        texto = self.entry_buscar.get()
+        indices = self.filtro.filtrar(digitos_telefono(texto) or texto)
+        self._mostrar_huespedes_grid(indices)
 
     def limpiar_busqueda(self):
         """Limpia el campo de búsqueda"""
         self.entry_buscar.delete(0, 'end')
-        self.cargar_huespedes()
+        self.aplicar_filtros()
 
     def abrir_formulario_agregar(self):
         """Abre el formulario para agregar huésped"""
@@ -462,8 +527,8 @@ class HuespedesWindow:
 
         FormularioHuesped(self.parent, self.db, self.cargar_huespedes, datos)
 
-    def eliminar_huesped(self, datos=None):
-        """Elimina un huésped"""
+    def eliminar_huesped(self, datos=None, boton=None):
+        """Elimina un huésped (en el trabajador; `boton` queda deshabilitado mientras tanto)"""
         if datos is None:
             datos = self.huesped_seleccionado
 
@@ -474,8 +539,8 @@ class HuespedesWindow:
             )
             return
 
-        huesped_id = datos[0]
-        nombre_completo = f"{datos[1]} {datos[2]}"
+        huesped_id = datos.id
+        nombre_completo = f"{datos.nombre} {datos.apellido}"
 
         respuesta = messagebox.askyesno(
             "Confirmar Eliminación",
@@ -484,9 +549,32 @@ class HuespedesWindow:
         )
 
         if respuesta:
-            self.db.eliminar_huesped(huesped_id)
-            messagebox.showinfo("Éxito", "Huésped eliminado correctamente")
-            self.cargar_huespedes()
+            if boton is not None:
+                boton.configure(state="disabled", text="⏳")
+            self.trabajador.ejecutar(
+                self.parent,
+                self.session.huespedes.eliminar,
+                huesped_id,
+                al_terminar=lambda exito: self._al_eliminar(exito, boton),
+                al_fallar=lambda error: self._al_fallar_eliminar(error, boton)
+            )
+
+    def _al_eliminar(self, exito, boton):
+        if not exito:
+            self._restaurar_boton(boton, "🗑️")
+            messagebox.showerror("Error", "No se puede eliminar un huésped con reservas registradas")
+            return
+        messagebox.showinfo("Éxito", "Huésped eliminado correctamente")
+        self.cargar_huespedes()
+
+    def _al_fallar_eliminar(self, error, boton):
+        print(f"Error al eliminar huésped: {error}")
+        self._restaurar_boton(boton, "🗑️")
+        messagebox.showerror("Error", "No se pudo eliminar el huésped")
+
+    def _restaurar_boton(self, boton, texto):
+        if boton is not None and boton.winfo_exists():
+            boton.configure(state="normal", text=texto)
 
 
 class FormularioHuesped:
@@ -678,7 +766,7 @@ class FormularioHuesped:
         frame_botones.pack(fill="x", pady=(30, 0))
 
         # Botón Guardar
-        btn_guardar = ctk.CTkButton(
+        self.btn_guardar = ctk.CTkButton(
             frame_botones,
             text="💾 Guardar",
             command=self._guardar,
@@ -688,7 +776,7 @@ class FormularioHuesped:
             fg_color="#27AE60",
             hover_color="#229954"
         )
-        btn_guardar.pack(fill="x", pady=(0, 10))
+        self.btn_guardar.pack(fill="x", pady=(0, 10))
 
         # Botón Cancelar
         btn_cancelar = ctk.CTkButton(
@@ -708,12 +796,11 @@ class FormularioHuesped:
 
     def _rellenar_campos(self):
         """Rellena los campos con los datos existentes"""
-        # datos = (id, nombre, apellido, telefono, password, email)
-        self.entry_nombre.insert(0, self.datos[1])
-        self.entry_apellido.insert(0, self.datos[2])
-        self.entry_telefono.insert(0, self.datos[3])
-        if len(self.datos) > 5 and self.datos[5]:
-            self.entry_email.insert(0, self.datos[5])
+        self.entry_nombre.insert(0, self.datos.nombre)
+        self.entry_apellido.insert(0, self.datos.apellido)
+        self.entry_telefono.insert(0, self.datos.telefono)
+        if self.datos.email:
+            self.entry_email.insert(0, self.datos.email)
 
     def _guardar(self):
         nombre = self.entry_nombre.get().strip()
@@ -727,23 +814,39 @@ class FormularioHuesped:
 
         if self.datos:
             if not password:
-                password = self.datos[4]
+                password = self.datos.password
 
-            ok = self.db.actualizar_huesped(
-                self.datos[0], nombre, apellido, telefono, password, email
-            )
+            funcion = self.db.actualizar_huesped
+            args = (self.datos.id, nombre, apellido, telefono, password, email)
         else:
-            ok = self.db.agregar_huesped(
-                nombre, apellido, telefono, password, email
-            )
+            funcion = self.db.agregar_huesped
+            args = (nombre, apellido, telefono, password, email)
+
+        # Fuera del hilo de Tk: el hash de bcrypt es lento
+        self.btn_guardar.configure(state="disabled", text="⏳ Guardando...")
+        obtener_trabajador().ejecutar(
+            self.ventana,
+            funcion,
+            *args,
+            al_terminar=self._al_guardar,
+            al_fallar=self._al_fallar_guardado
+        )
 
+    def _al_guardar(self, ok):
+        """Resultado del guardado (en el hilo de Tk)"""
         if ok:
             if self.callback_refrescar:
                 self.callback_refrescar()
             self.ventana.destroy()
         else:
+            self.btn_guardar.configure(state="normal", text="💾 Guardar")
             messagebox.showerror("Error", "No se pudo guardar el huésped")
 
+    def _al_fallar_guardado(self, error):
+        print(f"Error al guardar huésped: {error}")
+        self.btn_guardar.configure(state="normal", text="💾 Guardar")
+        messagebox.showerror("Error", "No se pudo guardar el huésped")
+
     def _validar(self, nombre, apellido, telefono):
         if not nombre or not apellido or not telefono:
             messagebox.showerror("Error", "Nombre, apellido y teléfono son obligatorios")
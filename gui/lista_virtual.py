@@ -0,0 +1,215 @@
+# gui/lista_virtual.py
+"""
+Lista virtualizada para listados largos
+Solo crea widgets para las filas visibles (más un pequeño margen) y los
+recicla al desplazarse, así la memoria no crece con la cantidad de datos
+"""
+
+import math
+import sys
+import tkinter as tk
+from typing import Any, Callable, List, Optional, Sequence
+
+import customtkinter as ctk
+
+
+class _Fila:
+    """Widget reciclable y el índice de datos que muestra actualmente"""
+    __slots__ = ("widget", "item", "indice")
+
+    def __init__(self, widget, item):
+        self.widget = widget
+        self.item = item
+        self.indice: Optional[int] = None
+
+
+class ListaVirtual(ctk.CTkFrame):
+    """
+    Lista de alto de fila fijo dibujada sobre un Canvas
+
+    Args:
+        alto_fila: Alto en píxeles reservado para cada fila (incluye separación)
+        crear_fila: Función que recibe el padre y crea un widget de fila vacío
+        llenar_fila: Función que recibe (widget, datos) y actualiza la fila
+        separacion: Espacio vertical entre filas
+        margen: Filas extra que se mantienen creadas por encima y por debajo
+        al_acercarse_al_final: Se llama cuando la vista llega cerca de la última fila
+            (útil para pedir la siguiente página)
+    """
+
+    def __init__(self, parent, alto_fila: int, crear_fila: Callable[[Any], Any],
+                 llenar_fila: Callable[[Any, Any], None], separacion: int = 16,
+                 margen: int = 2, al_acercarse_al_final: Optional[Callable[[], None]] = None,
+                 **kwargs):
+        kwargs.setdefault("fg_color", "transparent")
+        super().__init__(parent, **kwargs)
+
+        self.alto_fila = alto_fila
+        self.separacion = separacion
+        self.margen = margen
+        self._crear_fila = crear_fila
+        self._llenar_fila = llenar_fila
+        self._al_acercarse_al_final = al_acercarse_al_final
+
+        self._datos: List = []
+        self._filas: List[_Fila] = []
+
+        self.canvas = tk.Canvas(self, highlightthickness=0, borderwidth=0,
+                                yscrollincrement=max(1, alto_fila // 4))
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self._al_desplazar)
+
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+
+        self._aplicar_color_fondo()
+
+        self.canvas.bind("<Configure>", self._al_redimensionar)
+        self.canvas.bind("<Enter>", self._activar_rueda)
+        self.canvas.bind("<Leave>", self._desactivar_rueda)
+
+    # ==================== API ====================
+
+    def set_datos(self, datos: Sequence, reiniciar_scroll: bool = True):
+        """Reemplaza los datos mostrados"""
+        self._datos = list(datos)
+        for fila in self._filas:
+            fila.indice = None
+        self._actualizar_region()
+        if reiniciar_scroll:
+            self.canvas.yview_moveto(0)
+        self._reubicar_filas()
+
+    def agregar_datos(self, datos: Sequence):
+        """Agrega filas al final sin mover el desplazamiento actual"""
+        self._datos.extend(datos)
+        self._actualizar_region()
+        self._reubicar_filas()
+
+    def refrescar(self):
+        """Vuelve a llenar las filas visibles (p. ej. tras cambiar un dato)"""
+        for fila in self._filas:
+            fila.indice = None
+        self._reubicar_filas()
+
+    @property
+    def datos(self) -> Sequence:
+        return self._datos
+
+    # ==================== DIBUJO ====================
+
+    def _actualizar_region(self):
+        alto_total = len(self._datos) * self.alto_fila
+        self.canvas.configure(scrollregion=(0, 0, self.canvas.winfo_width(), alto_total))
+
+    def _filas_necesarias(self) -> int:
+        alto_vista = max(self.canvas.winfo_height(), self.alto_fila)
+        return math.ceil(alto_vista / self.alto_fila) + 2 * self.margen + 1
+
+    def _asegurar_pool(self):
+        """Ajusta la cantidad de widgets al tamaño de la vista"""
+        necesarias = self._filas_necesarias()
+        if len(self._filas) == necesarias:
+            return
+
+        while len(self._filas) < necesarias:
+            widget = self._crear_fila(self.canvas)
+            item = self.canvas.create_window(
+                0, 0, anchor="nw", window=widget,
+                width=self.canvas.winfo_width(),
+                height=self.alto_fila - self.separacion,
+                state="hidden"
+            )
+            self._filas.append(_Fila(widget, item))
+
+        while len(self._filas) > necesarias:
+            fila = self._filas.pop()
+            self.canvas.delete(fila.item)
+            fila.widget.destroy()
+
+        # El reparto de índices depende del tamaño del pool
+        for fila in self._filas:
+            fila.indice = None
+
+    def _reubicar_filas(self):
+        """Asigna cada widget del pool a una fila visible"""
+        if not self._filas and not self._datos:
+            return
+
+        self._asegurar_pool()
+        total_pool = len(self._filas)
+
+        primero = max(0, int(self.canvas.canvasy(0) // self.alto_fila) - self.margen)
+        ultimo = min(len(self._datos), primero + total_pool)
+        visibles = set()
+
+        for indice in range(primero, ultimo):
+            # Reparto circular: al bajar una fila solo se rellena un widget
+            fila = self._filas[indice % total_pool]
+            visibles.add(id(fila))
+            if fila.indice != indice:
+                self._llenar_fila(fila.widget, self._datos[indice])
+                self.canvas.coords(fila.item, 0, indice * self.alto_fila + self.separacion // 2)
+                fila.indice = indice
+            self.canvas.itemconfigure(fila.item, state="normal")
+
+        for fila in self._filas:
+            if id(fila) not in visibles:
+                self.canvas.itemconfigure(fila.item, state="hidden")
+                fila.indice = None
+
+        if self._al_acercarse_al_final and self._datos and ultimo >= len(self._datos) - self.margen:
+            self._al_acercarse_al_final()
+
+    def _al_desplazar(self, primero, ultimo):
+        self.scrollbar.set(primero, ultimo)
+        self._reubicar_filas()
+
+    def _al_redimensionar(self, event):
+        for fila in self._filas:
+            self.canvas.itemconfigure(fila.item, width=event.width)
+        self._actualizar_region()
+        self._reubicar_filas()
+
+    # ==================== RUEDA DEL RATÓN ====================
+
+    def _activar_rueda(self, event=None):
+        if sys.platform.startswith("linux"):
+            self.canvas.bind_all("<Button-4>", self._al_girar_rueda)
+            self.canvas.bind_all("<Button-5>", self._al_girar_rueda)
+        else:
+            self.canvas.bind_all("<MouseWheel>", self._al_girar_rueda)
+
+    def _desactivar_rueda(self, event=None):
+        # Al pasar sobre una tarjeta el canvas recibe <Leave>, pero el puntero sigue dentro
+        if event is not None:
+            debajo = self.winfo_containing(event.x_root, event.y_root)
+            if debajo is not None and str(debajo).startswith(str(self.canvas)):
+                return
+
+        if sys.platform.startswith("linux"):
+            self.canvas.unbind_all("<Button-4>")
+            self.canvas.unbind_all("<Button-5>")
+        else:
+            self.canvas.unbind_all("<MouseWheel>")
+
+    def _al_girar_rueda(self, event):
+        if event.num == 4:
+            pasos = -1
+        elif event.num == 5:
+            pasos = 1
+        elif sys.platform == "darwin":
+            pasos = -event.delta
+        else:
+            pasos = -int(event.delta / 120)
+        self.canvas.yview_scroll(pasos, "units")
+
+    # ==================== TEMA ====================
+
+    def _aplicar_color_fondo(self):
+        color = self._fg_color if self._fg_color != "transparent" else self._detect_color_of_master()
+        self.canvas.configure(bg=self._apply_appearance_mode(color))
+
+    def _set_appearance_mode(self, mode_string):
+        super()._set_appearance_mode(mode_string)
+        self._aplicar_color_fondo()
@@ -2,6 +2,7 @@
 import customtkinter as ctk
 from tkinter import messagebox
 from core.session import obtener_sesion
+from core.worker import obtener_trabajador
 from typing import Optional, Tuple
 
 # Configuración de tema
@@ -23,6 +24,7 @@ class LoginWindow:
         self.intentos_fallidos = 0
         self.max_intentos = 3
         self.password_visible = False
+        self._validando = False
 
         # Crear interfaz
         self._crear_widgets()
@@ -203,6 +205,14 @@ class LoginWindow:
         )
         self.btn_login.pack(pady=(0, 15))
 
+        # Progreso mientras se verifican las credenciales (se muestra al validar)
+        self.progreso_login = ctk.CTkProgressBar(
+            form_container,
+            width=350,
+            height=6,
+            mode="indeterminate"
+        )
+
         # Botón Limpiar
         ctk.CTkButton(
             form_container,
@@ -363,45 +373,75 @@ class LoginWindow:
 
     def validar_login(self):
         """Valida credenciales y abre dashboard"""
+        if self._validando:
+            return
+
         es_valido, usuario, password = self._validar_campos()
         if not es_valido:
             return
 
+        # La conexión y bcrypt son lentos: se hacen en el trabajador
+        self._mostrar_progreso(True)
+        obtener_trabajador().ejecutar(
+            self.root,
+            self._autenticar,
+            usuario,
+            password,
+            al_terminar=self._al_autenticar,
+            al_fallar=self._al_fallar_autenticacion
+        )
+
+    def _autenticar(self, usuario, password):
+        """Conecta si hace falta y valida (se ejecuta fuera del hilo de Tk)"""
         # 🔹 CONECTAR A BD SOLO AL HACER LOGIN
-        if not self.session.db:
-            conectado = self.session.conectar_db()
-            if not conectado:
-                messagebox.showwarning(
-                    "Sin conexión",
-                    "No se pudo conectar al servidor.\n"
-                    "Verifique su conexión o contacte al administrador."
-                )
-                return
+        if not self.session.db and not self.session.conectar_db():
+            raise ConnectionError("No se pudo conectar al servidor")
+        return self.session.db.validar_login(usuario, password)
 
-        try:
-            # Validar login
-            empleado = self.session.db.validar_login(usuario, password)
+    def _al_autenticar(self, empleado):
+        """Resultado de la validación (en el hilo de Tk)"""
+        self._mostrar_progreso(False)
 
-            if empleado:
-                self._login_exitoso(empleado)
-            else:
-                self._login_fallido()
+        if empleado:
+            self._login_exitoso(empleado)
+        else:
+            self._login_fallido()
 
-        except Exception as e:
-            print(f"Error en login: {e}")
-            messagebox.showerror(
-                "Error",
-                "Ocurrió un problema al validar las credenciales.\n"
-                "Intente nuevamente."
+    def _al_fallar_autenticacion(self, error):
+        """Error de conexión o de consulta durante el login"""
+        self._mostrar_progreso(False)
+
+        if isinstance(error, ConnectionError):
+            messagebox.showwarning(
+                "Sin conexión",
+                "No se pudo conectar al servidor.\n"
+                "Verifique su conexión o contacte al administrador."
             )
+            return
+
+        print(f"Error en login: {error}")
+        messagebox.showerror(
+            "Error",
+            "Ocurrió un problema al validar las credenciales.\n"
+            "Intente nuevamente."
+        )
+
+    def _mostrar_progreso(self, activo: bool):
+        """Muestra u oculta el estado de verificación en el panel"""
+        self._validando = activo
+        if activo:
+            self.btn_login.configure(state="disabled", text="VERIFICANDO...")
+            self.progreso_login.pack(after=self.btn_login, pady=(0, 15))
+            self.progreso_login.start()
+        else:
+            self.progreso_login.stop()
+            self.progreso_login.pack_forget()
+            self.btn_login.configure(state="normal", text="INGRESAR")
 
     def _login_exitoso(self, empleado):
         """Maneja login exitoso"""
-        empleado_id = empleado[0]
-        privilegio = self._obtener_privilegio(empleado_id)
-
-        # 🔹 INICIAR SESIÓN EN EL SESSIONMANAGER
-        self.session.iniciar_sesion(empleado, privilegio)
+        # 🔹 INICIAR SESIÓN EN EL SESSIONMANAGER (el resultado ya trae el privilegio)
+        self.session.iniciar_sesion(empleado)
 
         # Ocultar ventana de login
         self.root.withdraw()
@@ -424,17 +464,6 @@ class LoginWindow:
         else:
             self._bloquear_login()
 
-    def _obtener_privilegio(self, empleado_id: int) -> str:
-        """Obtiene el privilegio del empleado"""
-        try:
-            empleados = self.session.db.obtener_empleados()
-            for emp in empleados:
-                if emp[0] == empleado_id:
-                    return emp[7] if emp[7] else "Administrador"
-            return "Administrador"
-        except Exception:
-            return "Administrador"
-
     def _abrir_dashboard(self):
         """Abre la ventana del dashboard"""
         from gui.dashboard_window import DashboardWindow
@@ -458,7 +487,7 @@ class LoginWindow:
         self._limpiar_campos()
         self.intentos_fallidos = 0
 
-        # 🔹 CERRAR SESIÓN (esto también cierra la BD)
+        # 🔹 CERRAR SESIÓN (el pool de conexiones sigue abierto para el próximo login)
         self.session.cerrar_sesion()
 
         # Mostrar login de nuevo
@@ -466,6 +495,8 @@ class LoginWindow:
 
     def _on_closing(self):
         """Maneja cierre de la ventana"""
-        # 🔹 CERRAR SESIÓN AL SALIR
+        # 🔹 CERRAR SESIÓN Y CONEXIONES AL SALIR
         self.session.cerrar_sesion()
+        obtener_trabajador().cerrar()
+        self.session.cerrar_db()
         self.root.quit()
\ No newline at end of file
@@ -1,10 +1,21 @@
 # gui/reportes_window.py
+import threading
 import customtkinter as ctk
 from tkinter import messagebox, filedialog, ttk
 from datetime import datetime, timedelta
 from tkcalendar import DateEntry
 from database.db_manager import DatabaseManager
+from core.exportacion import (Columna, ExportacionCancelada, FORMATO_FECHA,
+                              FORMATO_MONEDA, HojaExcel, exportar_excel)
 from core.session import obtener_sesion
+from core.worker import obtener_trabajador
+
+# Cada cuánto se actualiza la barra de progreso de la exportación
+INTERVALO_PROGRESO_MS = 150
+
+# Opciones de agrupación de la pestaña de indicadores -> grano de analitica
+GRANOS_INDICADORES = {"Día": "dia", "Semana": "semana", "Mes": "mes"}
+TODOS_LOS_TIPOS = "Todos los tipos"
 
 class ReportesWindow:
     def __init__(self, parent):
@@ -15,6 +26,7 @@ class ReportesWindow:
 
         # 🔹 Obtener la base de datos desde la sesión
         self.db = self.session.db
+        self.trabajador = obtener_trabajador()
 
         # Colores del tema
         self.COLORES = {
@@ -29,6 +41,13 @@ class ReportesWindow:
         self.fecha_inicio = datetime.now() - timedelta(days=30)
         self.fecha_fin = datetime.now()
 
+        # Filas mostradas en cada pestaña: {reporte: (rango, filas)}
+        self._filas_reporte = {}
+
+        # Exportación en curso (evento de cancelación) y su avance (escritas, total)
+        self._exportacion = None
+        self._avance_exportacion = (0, 0)
+
         self._crear_interfaz()
 
     def _crear_interfaz(self):
@@ -74,7 +93,32 @@ class ReportesWindow:
         btn_frame = ctk.CTkFrame(header, fg_color="transparent")
         btn_frame.pack(side="right")
 
-        btn_excel = ctk.CTkButton(
+        # Progreso de la exportación (visible solo mientras exporta)
+        self.frame_exportacion = ctk.CTkFrame(btn_frame, fg_color="transparent")
+
+        self.label_exportacion = ctk.CTkLabel(
+            self.frame_exportacion,
+            text="",
+            font=("Segoe UI", 10),
+            text_color=("#7F8C8D", "#95A5A6")
+        )
+        self.label_exportacion.pack(anchor="w")
+
+        self.progreso_exportacion = ctk.CTkProgressBar(self.frame_exportacion, width=160)
+        self.progreso_exportacion.pack(side="left", pady=(2, 0))
+
+        ctk.CTkButton(
+            self.frame_exportacion,
+            text="✕",
+            command=self._cancelar_exportacion,
+            width=30,
+            height=24,
+            corner_radius=8,
+            fg_color=self.COLORES['danger'],
+            hover_color="#C0392B"
+        ).pack(side="left", padx=(8, 0))
+
+        self.btn_excel = ctk.CTkButton(
             btn_frame,
             text="📊 Exportar a Excel",
             command=self.exportar_excel,
@@ -85,7 +129,7 @@ class ReportesWindow:
             fg_color=self.COLORES['success'],
             hover_color="#229954"
         )
-        btn_excel.pack(side="left", padx=5)
+        self.btn_excel.pack(side="left", padx=5)
 
     def _crear_panel_filtros(self, parent):
         """Crea el panel de filtros de fecha"""
@@ -209,10 +253,21 @@ class ReportesWindow:
         # Crear tabs
         self.tab_reservas = self.tabview.add("📅 Historial de Reservas")
         self.tab_habitaciones = self.tabview.add("🛏️ Historial de Habitaciones")
+        self.tab_indicadores = self.tabview.add("📈 Indicadores")
+        self._crear_tab_indicadores()
 
         # Cargar contenido inicial
+        self.refrescar()
+
+    def refrescar(self):
+        """Recarga los reportes con el rango de fechas actual"""
         self._cargar_reporte_reservas()
         self._cargar_reporte_habitaciones()
+        self._cargar_indicadores()
+
+    def _rango_actual(self):
+        """Rango de fechas del filtro como strings para las consultas"""
+        return self.fecha_inicio.strftime("%Y-%m-%d"), self.fecha_fin.strftime("%Y-%m-%d")
 
     def _filtro_rapido(self, dias):
         """Aplica un filtro rápido de días"""
@@ -233,8 +288,7 @@ class ReportesWindow:
             return
 
         # Recargar reportes
-        self._cargar_reporte_reservas()
-        self._cargar_reporte_habitaciones()
+        self.refrescar()
 
     def _cargar_reporte_reservas(self):
         """Carga el reporte de reservas"""
@@ -257,26 +311,79 @@ class ReportesWindow:
             anchor="w"
         ).pack(anchor="w", pady=(0, 15))
 
-        # Obtener datos
-        reservas = self.db.obtener_reporte_reservas(
-            self.fecha_inicio.strftime("%Y-%m-%d"),
-            self.fecha_fin.strftime("%Y-%m-%d")
+        self._cargar_en_tabla(
+            "reservas", scroll_frame,
+            self.db.iterar_reporte_reservas,
+            self._crear_tabla_reservas,
+            self._insertar_reservas,
+            "No hay reservas en el período seleccionado",
+            al_completar=self._cargar_resumen_reservas
         )
 
-        if not reservas:
-            ctk.CTkLabel(
-                scroll_frame,
-                text="No hay reservas en el período seleccionado",
-                font=("Segoe UI", 12),
-                text_color=("#7F8C8D", "#95A5A6")
-            ).pack(pady=50)
-            return
+    def _cargar_en_tabla(self, reporte, scroll_frame, iterar, crear_tabla, insertar, texto_vacio,
+                         al_completar=None):
+        """
+        Llena la tabla de un reporte por lotes, a medida que llegan del
+        cursor del servidor: la primera página se ve sin esperar al resto
+
+        Args:
+            al_completar: Callback (scroll_frame, tree, rango) al terminar con filas
+        """
+        cargando = self._crear_label_cargando(scroll_frame)
+        rango = self._rango_actual()
+        self._filas_reporte.pop(reporte, None)
+        filas = []
+        tabla = []  # El Treeview se crea con el primer lote
+
+        def al_lote(lote):
+            if not tabla:
+                cargando.destroy()
+                tabla.append(crear_tabla(scroll_frame))
+            insertar(tabla[0], lote)
+            filas.extend(lote)
+
+        def al_terminar(total):
+            if not tabla:
+                cargando.destroy()
+                ctk.CTkLabel(
+                    scroll_frame,
+                    text=texto_vacio,
+                    font=("Segoe UI", 12),
+                    text_color=("#7F8C8D", "#95A5A6")
+                ).pack(pady=50)
+            # Completo: la exportación puede reutilizarlo
+            self._filas_reporte[reporte] = (rango, filas)
+            if tabla and al_completar:
+                al_completar(scroll_frame, tabla[0], rango)
+
+        def al_fallar(error):
+            print(f"Error al cargar reporte de {reporte}: {error}")
+            if not tabla:
+                cargando.configure(text="⚠️ No se pudo cargar el reporte")
+
+        self.trabajador.ejecutar_por_lotes(
+            scroll_frame,
+            iterar,
+            *rango,
+            al_lote=al_lote,
+            al_terminar=al_terminar,
+            al_fallar=al_fallar,
+            clave=(id(self), f"reporte_{reporte}")
+        )
 
-        # Crear tabla
-        self._crear_tabla_reservas(scroll_frame, reservas)
+    def _crear_label_cargando(self, parent):
+        """Crea el indicador de carga de un reporte"""
+        cargando = ctk.CTkLabel(
+            parent,
+            text="⏳ Cargando reporte...",
+            font=("Segoe UI", 12),
+            text_color=("#7F8C8D", "#95A5A6")
+        )
+        cargando.pack(pady=50)
+        return cargando
 
-    def _crear_tabla_reservas(self, parent, datos):
-        """Crea una tabla con el historial de reservas"""
+    def _crear_tabla_reservas(self, parent):
+        """Crea la tabla (vacía) del historial de reservas"""
         # Frame para la tabla
         tabla_frame = ctk.CTkFrame(parent, fg_color=self.COLORES['card_bg'], corner_radius=10)
         tabla_frame.pack(fill="both", expand=True)
@@ -315,26 +422,53 @@ class ReportesWindow:
         scrollbar = ttk.Scrollbar(tabla_frame, orient="vertical", command=tree.yview)
         tree.configure(yscrollcommand=scrollbar.set)
 
-        # Insertar datos
-        for reserva in datos:
-            # Calcular días
-            fecha_entrada = datetime.strptime(str(reserva[3]), "%Y-%m-%d")
-            fecha_salida = datetime.strptime(str(reserva[4]), "%Y-%m-%d")
-            dias = (fecha_salida - fecha_entrada).days
+        tree.pack(side="left", fill="both", expand=True, padx=10, pady=10)
+        scrollbar.pack(side="right", fill="y", pady=10, padx=(0, 10))
+        return tree
 
+    def _insertar_reservas(self, tree, datos):
+        """Agrega un lote de reservas a la tabla (días, total y estado ya vienen de SQL)"""
+        for id_reserva, huesped, numero, entrada, salida, dias, _, total_texto, estado in datos:
             tree.insert("", "end", values=(
-                reserva[0],  # ID
-                reserva[1],  # Huésped
-                f"#{reserva[2]}",  # Habitación
-                reserva[3],  # Entrada
-                reserva[4],  # Salida
-                dias,
-                f"${reserva[5]:,.2f}",  # Total
-                reserva[6].upper()  # Estado
+                id_reserva, huesped, f"#{numero}", entrada, salida, dias, total_texto, estado
             ))
 
-        tree.pack(side="left", fill="both", expand=True, padx=10, pady=10)
-        scrollbar.pack(side="right", fill="y", pady=10, padx=(0, 10))
+    def _cargar_resumen_reservas(self, scroll_frame, tree, rango):
+        """Pide los totales del período para la fila de pie"""
+        self.trabajador.ejecutar(
+            tree,
+            self.db.obtener_resumen_reservas,
+            *rango,
+            al_terminar=lambda resumen: self._mostrar_resumen_reservas(scroll_frame, tree, resumen),
+            al_fallar=lambda error: self._resumen_no_disponible(tree, error),
+            clave=(id(self), "resumen_reservas")
+        )
+
+    def _resumen_no_disponible(self, tree, error):
+        """Fila de pie sin totales cuando la consulta del resumen falla"""
+        print(f"Error al obtener totales de reservas: {error}")
+        tree.tag_configure("pie", font=("Segoe UI", 10, "bold"))
+        tree.insert("", "end", tags=("pie",), values=(
+            "", "TOTAL", "totales no disponibles", "", "", "", "", ""
+        ))
+
+    def _mostrar_resumen_reservas(self, scroll_frame, tree, resumen):
+        """Agrega la fila de totales y el conteo por estado"""
+        total = resumen.total
+        tree.tag_configure("pie", font=("Segoe UI", 10, "bold"))
+        tree.insert("", "end", tags=("pie",), values=(
+            "", "TOTAL", f"{total.reservas} reservas", "", "", total.noches, f"${total.total:,.2f}", ""
+        ))
+
+        ctk.CTkLabel(
+            scroll_frame,
+            text="   ·   ".join(
+                f"{fila.etiqueta}: {fila.reservas} (${fila.total:,.2f})" for fila in resumen.por_estado
+            ),
+            font=("Segoe UI", 11),
+            text_color=("#7F8C8D", "#95A5A6"),
+            anchor="w"
+        ).pack(anchor="w", pady=(10, 0))
 
     def _cargar_reporte_habitaciones(self):
         """Carga el reporte de habitaciones"""
@@ -357,26 +491,16 @@ class ReportesWindow:
             anchor="w"
         ).pack(anchor="w", pady=(0, 15))
 
-        # Obtener datos
-        habitaciones = self.db.obtener_reporte_habitaciones(
-            self.fecha_inicio.strftime("%Y-%m-%d"),
-            self.fecha_fin.strftime("%Y-%m-%d")
+        self._cargar_en_tabla(
+            "habitaciones", scroll_frame,
+            self.db.iterar_reporte_habitaciones,
+            self._crear_tabla_habitaciones,
+            self._insertar_habitaciones,
+            "No hay actividad de habitaciones en el período seleccionado"
         )
 
-        if not habitaciones:
-            ctk.CTkLabel(
-                scroll_frame,
-                text="No hay actividad de habitaciones en el período seleccionado",
-                font=("Segoe UI", 12),
-                text_color=("#7F8C8D", "#95A5A6")
-            ).pack(pady=50)
-            return
-
-        # Crear tabla
-        self._crear_tabla_habitaciones(scroll_frame, habitaciones)
-
-    def _crear_tabla_habitaciones(self, parent, datos):
-        """Crea una tabla con el historial de habitaciones"""
+    def _crear_tabla_habitaciones(self, parent):
+        """Crea la tabla (vacía) del historial de habitaciones"""
         # Frame para la tabla
         tabla_frame = ctk.CTkFrame(parent, fg_color=self.COLORES['card_bg'], corner_radius=10)
         tabla_frame.pack(fill="both", expand=True)
@@ -408,7 +532,12 @@ class ReportesWindow:
         scrollbar = ttk.Scrollbar(tabla_frame, orient="vertical", command=tree.yview)
         tree.configure(yscrollcommand=scrollbar.set)
 
-        # Insertar datos
+        tree.pack(side="left", fill="both", expand=True, padx=10, pady=10)
+        scrollbar.pack(side="right", fill="y", pady=10, padx=(0, 10))
+        return tree
+
+    def _insertar_habitaciones(self, tree, datos):
+        """Agrega un lote de eventos de habitaciones a la tabla"""
         for hab in datos:
             tree.insert("", "end", values=(
                 f"#{hab[0]}",  # Habitación
@@ -419,129 +548,353 @@ class ReportesWindow:
                 hab[5] if hab[5] else "-"  # Detalles
             ))
 
-        tree.pack(side="left", fill="both", expand=True, padx=10, pady=10)
-        scrollbar.pack(side="right", fill="y", pady=10, padx=(0, 10))
+    # ==================== INDICADORES ====================
 
-    def exportar_excel(self):
-        """Exporta los reportes a Excel"""
-        try:
-            import openpyxl
-            from openpyxl.styles import Font, Alignment, PatternFill
-
-            # Diálogo para guardar
-            filename = filedialog.asksaveasfilename(
-                defaultextension=".xlsx",
-                filetypes=[("Excel files", "*.xlsx")],
-                initialfile=f"reporte_hotel_{datetime.now().strftime('%Y%m%d')}.xlsx"
-            )
+    def _crear_tab_indicadores(self):
+        """Crea la pestaña de ocupación, ADR y RevPAR (se llena en _cargar_indicadores)"""
+        self._indicadores = None
 
-            if not filename:
-                return
-
-            # Crear workbook
-            wb = openpyxl.Workbook()
-
-            # ===== HOJA 1: RESERVAS =====
-            ws_reservas = wb.active
-            ws_reservas.title = "Reservas"
-
-            # Encabezado
-            ws_reservas['A1'] = "HISTORIAL DE RESERVAS"
-            ws_reservas['A1'].font = Font(size=16, bold=True)
-            ws_reservas[
-                'A2'] = f"Período: {self.fecha_inicio.strftime('%d/%m/%Y')} - {self.fecha_fin.strftime('%d/%m/%Y')}"
-
-            # Headers de tabla
-            headers = ["ID", "Huésped", "Habitación", "Entrada", "Salida", "Días", "Total", "Estado"]
-            for col, header in enumerate(headers, start=1):
-                cell = ws_reservas.cell(row=4, column=col)
-                cell.value = header
-                cell.font = Font(bold=True, color="FFFFFF")
-                cell.fill = PatternFill(start_color="3498DB", fill_type="solid")
-                cell.alignment = Alignment(horizontal="center")
-
-            # Datos de reservas
-            reservas = self.db.obtener_reporte_reservas(
-                self.fecha_inicio.strftime("%Y-%m-%d"),
-                self.fecha_fin.strftime("%Y-%m-%d")
-            )
+        contenido = ctk.CTkFrame(self.tab_indicadores, fg_color="transparent")
+        contenido.pack(fill="both", expand=True, padx=10, pady=10)
 
-            row = 5
-            for reserva in reservas:
-                fecha_entrada = datetime.strptime(str(reserva[3]), "%Y-%m-%d")
-                fecha_salida = datetime.strptime(str(reserva[4]), "%Y-%m-%d")
-                dias = (fecha_salida - fecha_entrada).days
-
-                ws_reservas.cell(row, 1, reserva[0])
-                ws_reservas.cell(row, 2, reserva[1])
-                ws_reservas.cell(row, 3, f"#{reserva[2]}")
-                ws_reservas.cell(row, 4, str(reserva[3]))
-                ws_reservas.cell(row, 5, str(reserva[4]))
-                ws_reservas.cell(row, 6, dias)
-                ws_reservas.cell(row, 7, reserva[5])
-                ws_reservas.cell(row, 7).number_format = '$#,##0.00'
-                ws_reservas.cell(row, 8, reserva[6].upper())
-                row += 1
-
-            # Ajustar columnas
-            ws_reservas.column_dimensions['A'].width = 8
-            ws_reservas.column_dimensions['B'].width = 25
-            ws_reservas.column_dimensions['C'].width = 12
-            ws_reservas.column_dimensions['D'].width = 15
-            ws_reservas.column_dimensions['E'].width = 15
-            ws_reservas.column_dimensions['F'].width = 10
-            ws_reservas.column_dimensions['G'].width = 15
-            ws_reservas.column_dimensions['H'].width = 15
-
-            # ===== HOJA 2: HABITACIONES =====
-            ws_hab = wb.create_sheet("Habitaciones")
-
-            # Encabezado
-            ws_hab['A1'] = "HISTORIAL DE HABITACIONES"
-            ws_hab['A1'].font = Font(size=16, bold=True)
-            ws_hab['A2'] = f"Período: {self.fecha_inicio.strftime('%d/%m/%Y')} - {self.fecha_fin.strftime('%d/%m/%Y')}"
-
-            # Headers de tabla
-            headers_hab = ["Habitación", "Tipo", "Evento", "Fecha", "Huésped", "Detalles"]
-            for col, header in enumerate(headers_hab, start=1):
-                cell = ws_hab.cell(row=4, column=col)
-                cell.value = header
-                cell.font = Font(bold=True, color="FFFFFF")
-                cell.fill = PatternFill(start_color="27AE60", fill_type="solid")
-                cell.alignment = Alignment(horizontal="center")
-
-            # Datos de habitaciones
-            habitaciones = self.db.obtener_reporte_habitaciones(
-                self.fecha_inicio.strftime("%Y-%m-%d"),
-                self.fecha_fin.strftime("%Y-%m-%d")
+        # Controles
+        controles = ctk.CTkFrame(contenido, fg_color="transparent")
+        controles.pack(fill="x", pady=(0, 15))
+
+        ctk.CTkLabel(
+            controles,
+            text="Agrupar por:",
+            font=("Segoe UI", 11, "bold")
+        ).pack(side="left", padx=(0, 8))
+
+        self.selector_grano = ctk.CTkSegmentedButton(
+            controles,
+            values=list(GRANOS_INDICADORES),
+            command=lambda _: self._cargar_indicadores()
+        )
+        self.selector_grano.set("Mes")
+        self.selector_grano.pack(side="left")
+
+        self.selector_tipo = ctk.CTkOptionMenu(
+            controles,
+            values=[TODOS_LOS_TIPOS],
+            command=lambda _: self._pintar_indicadores(),
+            width=170
+        )
+        self.selector_tipo.pack(side="left", padx=15)
+
+        self.label_estado_indicadores = ctk.CTkLabel(
+            controles,
+            text="",
+            font=("Segoe UI", 11),
+            text_color=("#7F8C8D", "#95A5A6")
+        )
+        self.label_estado_indicadores.pack(side="left")
+
+        # Tarjetas con los totales del rango
+        tarjetas = ctk.CTkFrame(contenido, fg_color="transparent")
+        tarjetas.pack(fill="x", pady=(0, 15))
+
+        self.valores_indicadores = {}
+        for columna, (clave, titulo, color) in enumerate((
+                ("ocupacion", "Ocupación", self.COLORES['primary']),
+                ("adr", "ADR", self.COLORES['success']),
+                ("revpar", "RevPAR", self.COLORES['warning']),
+                ("ingresos", "Ingresos", self.COLORES['danger']),
+        )):
+            tarjeta = ctk.CTkFrame(tarjetas, fg_color=self.COLORES['card_bg'], corner_radius=10)
+            tarjeta.grid(row=0, column=columna, sticky="ew", padx=5)
+            tarjetas.grid_columnconfigure(columna, weight=1)
+
+            ctk.CTkLabel(
+                tarjeta,
+                text=titulo,
+                font=("Segoe UI", 11),
+                text_color=("#7F8C8D", "#95A5A6")
+            ).pack(anchor="w", padx=15, pady=(10, 0))
+
+            valor = ctk.CTkLabel(
+                tarjeta,
+                text="-",
+                font=("Segoe UI", 22, "bold"),
+                text_color=color
             )
+            valor.pack(anchor="w", padx=15, pady=(0, 10))
+            self.valores_indicadores[clave] = valor
+
+        # Serie por período
+        tabla_frame = ctk.CTkFrame(contenido, fg_color=self.COLORES['card_bg'], corner_radius=10)
+        tabla_frame.pack(fill="both", expand=True)
+
+        columnas = ("Período", "Ocupación", "ADR", "RevPAR", "Noches", "Ingresos")
+        self.tree_indicadores = ttk.Treeview(tabla_frame, columns=columnas, show="headings", height=12)
+        for columna in columnas:
+            self.tree_indicadores.heading(columna, text=columna)
+            self.tree_indicadores.column(columna, width=120, anchor="e")
+        self.tree_indicadores.column("Período", width=140, anchor="center")
+
+        scrollbar = ttk.Scrollbar(tabla_frame, orient="vertical", command=self.tree_indicadores.yview)
+        self.tree_indicadores.configure(yscrollcommand=scrollbar.set)
+
+        self.tree_indicadores.pack(side="left", fill="both", expand=True, padx=10, pady=10)
+        scrollbar.pack(side="right", fill="y", pady=10, padx=(0, 10))
+
+    def _cargar_indicadores(self):
+        """Pide los indicadores del rango y la agrupación actuales"""
+        self.label_estado_indicadores.configure(text="⏳ Calculando...")
+        self.trabajador.ejecutar(
+            self.tree_indicadores,
+            self.db.obtener_indicadores,
+            *self._rango_actual(),
+            GRANOS_INDICADORES[self.selector_grano.get()],
+            al_terminar=self._mostrar_indicadores,
+            al_fallar=self._al_fallar_indicadores,
+            clave=(id(self), "indicadores")
+        )
+
+    def _mostrar_indicadores(self, indicadores):
+        """Guarda el resultado y actualiza los tipos disponibles"""
+        self._indicadores = indicadores
+        self.label_estado_indicadores.configure(text="")
+
+        tipos = [TODOS_LOS_TIPOS] + indicadores.tipos
+        self.selector_tipo.configure(values=tipos)
+        if self.selector_tipo.get() not in tipos:
+            self.selector_tipo.set(TODOS_LOS_TIPOS)
+
+        self._pintar_indicadores()
+
+    def _al_fallar_indicadores(self, error):
+        print(f"Error al calcular indicadores: {error}")
+        self.label_estado_indicadores.configure(text="⚠️ No se pudieron calcular los indicadores")
+
+    def _pintar_indicadores(self):
+        """Llena tarjetas y tabla con el tipo elegido (sin volver a consultar)"""
+        if self._indicadores is None:
+            return
+
+        tipo = self.selector_tipo.get()
+        serie, total = self._indicadores.de_tipo(None if tipo == TODOS_LOS_TIPOS else tipo)
+
+        if total is not None:
+            self.valores_indicadores["ocupacion"].configure(text=f"{total.ocupacion:.1%}")
+            self.valores_indicadores["adr"].configure(text=f"${total.adr:,.2f}")
+            self.valores_indicadores["revpar"].configure(text=f"${total.revpar:,.2f}")
+            self.valores_indicadores["ingresos"].configure(text=f"${total.ingresos:,.2f}")
+        else:
+            for valor in self.valores_indicadores.values():
+                valor.configure(text="-")
+
+        self.tree_indicadores.delete(*self.tree_indicadores.get_children())
+        for fila in serie:
+            self.tree_indicadores.insert("", "end", values=(
+                self._formatear_periodo(fila.periodo, self._indicadores.grano),
+                f"{fila.ocupacion:.1%}",
+                f"${fila.adr:,.2f}",
+                f"${fila.revpar:,.2f}",
+                f"{fila.vendidas} / {fila.disponibles}",
+                f"${fila.ingresos:,.2f}"
+            ))
 
-            row = 5
-            for hab in habitaciones:
-                ws_hab.cell(row, 1, f"#{hab[0]}")
-                ws_hab.cell(row, 2, hab[1])
-                ws_hab.cell(row, 3, hab[2])
-                ws_hab.cell(row, 4, str(hab[3]))
-                ws_hab.cell(row, 5, hab[4] if hab[4] else "-")
-                ws_hab.cell(row, 6, hab[5] if hab[5] else "-")
-                row += 1
-
-            # Ajustar columnas
-            ws_hab.column_dimensions['A'].width = 12
-            ws_hab.column_dimensions['B'].width = 15
-            ws_hab.column_dimensions['C'].width = 20
-            ws_hab.column_dimensions['D'].width = 15
-            ws_hab.column_dimensions['E'].width = 25
-            ws_hab.column_dimensions['F'].width = 30
-
-            # Guardar
-            wb.save(filename)
-            messagebox.showinfo("Éxito", f"Reporte exportado exitosamente a:\n{filename}")
+    @staticmethod
+    def _formatear_periodo(periodo, grano):
+        if grano == "mes":
+            return periodo.strftime("%Y-%m")
+        if grano == "semana":
+            return f"Sem. {periodo.strftime('%d/%m/%Y')}"
+        return periodo.strftime("%Y-%m-%d")
 
+    # ==================== EXPORTACIÓN ====================
+
+    def exportar_excel(self):
+        """Exporta los reportes a Excel en segundo plano"""
+        if self._exportacion is not None:
+            return
+
+        try:
+            import openpyxl  # noqa: F401
         except ImportError:
             messagebox.showerror(
                 "Error",
                 "Para exportar a Excel necesitas instalar openpyxl:\npip install openpyxl"
             )
+            return
+
+        # Diálogo para guardar
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".xlsx",
+            filetypes=[("Excel files", "*.xlsx")],
+            initialfile=f"reporte_hotel_{datetime.now().strftime('%Y%m%d')}.xlsx"
+        )
+
+        if not filename:
+            return
+
+        # Reutilizar lo que ya se muestra si corresponde al mismo rango
+        rango = self._rango_actual()
+        reservas = self._filas_vigentes("reservas", rango)
+        habitaciones = self._filas_vigentes("habitaciones", rango)
+        periodo = f"Período: {self.fecha_inicio.strftime('%d/%m/%Y')} - {self.fecha_fin.strftime('%d/%m/%Y')}"
+
+        self._exportacion = threading.Event()
+        self._avance_exportacion = (0, 0)
+        self._mostrar_progreso_exportacion(True)
+
+        self.trabajador.ejecutar(
+            self.btn_excel,
+            self._generar_excel,
+            filename, rango, periodo, reservas, habitaciones, self._exportacion,
+            al_terminar=lambda filas: self._al_exportar(filename, filas),
+            al_fallar=self._al_fallar_exportacion
+        )
+        self._sondear_exportacion()
+
+    def _filas_vigentes(self, reporte, rango):
+        """Filas mostradas del reporte si son del rango pedido (o None)"""
+        guardado = self._filas_reporte.get(reporte)
+        if guardado is not None and guardado[0] == rango:
+            return guardado[1]
+        return None
+
+    def _generar_excel(self, filename, rango, periodo, reservas, habitaciones, cancelar):
+        """Escribe el archivo (se ejecuta en el trabajador, fuera del hilo de Tk)"""
+        try:
+            resumen = self.db.obtener_resumen_reservas(*rango)
         except Exception as e:
-            messagebox.showerror("Error", f"No se pudo exportar el reporte:\n{str(e)}")
\ No newline at end of file
+            # Sin totales se exporta igual el detalle: sin pie ni hoja de resumen
+            print(f"Error al obtener totales de reservas: {e}")
+            resumen = None
+
+        # Lo que no estaba cargado en pantalla se lee en streaming del servidor
+        if reservas is None:
+            reservas = self.db.iterar_reporte_reservas(*rango)
+        if habitaciones is None:
+            habitaciones = self.db.iterar_reporte_habitaciones(*rango)
+
+        hojas = [
+            HojaExcel(
+                nombre="Reservas",
+                titulo="HISTORIAL DE RESERVAS",
+                subtitulo=periodo,
+                color="3498DB",
+                columnas=[
+                    Columna("ID", 8),
+                    Columna("Huésped", 25),
+                    Columna("Habitación", 12),
+                    Columna("Entrada", 15, FORMATO_FECHA),
+                    Columna("Salida", 15, FORMATO_FECHA),
+                    Columna("Días", 10),
+                    Columna("Total", 15, FORMATO_MONEDA),
+                    Columna("Estado", 15),
+                ],
+                filas=self._filas_excel_reservas(reservas),
+                total=self._total_conocido(reservas),
+                pie=("", "TOTAL", f"{resumen.total.reservas} reservas", None, None,
+                     resumen.total.noches, resumen.total.total, "") if resumen else None
+            ),
+            HojaExcel(
+                nombre="Habitaciones",
+                titulo="HISTORIAL DE HABITACIONES",
+                subtitulo=periodo,
+                color="27AE60",
+                columnas=[
+                    Columna("Habitación", 12),
+                    Columna("Tipo", 15),
+                    Columna("Evento", 20),
+                    Columna("Fecha", 15, FORMATO_FECHA),
+                    Columna("Huésped", 25),
+                    Columna("Detalles", 30),
+                ],
+                filas=self._filas_excel_habitaciones(habitaciones),
+                total=self._total_conocido(habitaciones)
+            ),
+        ]
+
+        if resumen is not None:
+            hojas.insert(1, HojaExcel(
+                nombre="Resumen",
+                titulo="RESUMEN DE RESERVAS",
+                subtitulo=periodo,
+                color="F39C12",
+                columnas=[
+                    Columna("Grupo", 18),
+                    Columna("Reservas", 12),
+                    Columna("Noches", 12),
+                    Columna("Total", 18, FORMATO_MONEDA),
+                ],
+                filas=[tuple(fila) for fila in resumen.por_mes + resumen.por_estado],
+                total=len(resumen.por_mes) + len(resumen.por_estado),
+                pie=tuple(resumen.total)
+            ))
+
+        return exportar_excel(filename, hojas, progreso=self._registrar_avance, cancelar=cancelar)
+
+    @staticmethod
+    def _total_conocido(filas):
+        """Cantidad de filas si ya están en memoria (0 si llegan en streaming)"""
+        return len(filas) if isinstance(filas, list) else 0
+
+    @staticmethod
+    def _filas_excel_reservas(reservas):
+        """Filas de la hoja de reservas (fechas como date, días y estado desde SQL)"""
+        for id_reserva, huesped, numero, entrada, salida, dias, total, _, estado in reservas:
+            yield id_reserva, huesped, f"#{numero}", entrada, salida, dias, total, estado
+
+    @staticmethod
+    def _filas_excel_habitaciones(habitaciones):
+        """Filas de la hoja de habitaciones"""
+        for numero, tipo, evento, fecha, huesped, detalles in habitaciones:
+            yield f"#{numero}", tipo, evento, fecha, huesped or "-", detalles or "-"
+
+    def _registrar_avance(self, escritas, total):
+        """Callback del exportador (hilo del trabajador); la UI lo lee al sondear"""
+        self._avance_exportacion = (escritas, total)
+
+    def _sondear_exportacion(self):
+        """Actualiza la barra de progreso mientras dura la exportación"""
+        if self._exportacion is None:
+            return
+
+        escritas, total = self._avance_exportacion
+        if self._exportacion.is_set():
+            self.label_exportacion.configure(text="Cancelando...")
+        elif total >= escritas and total:
+            self.progreso_exportacion.set(escritas / total)
+            self.label_exportacion.configure(text=f"Exportando {escritas:,} de {total:,} filas")
+        elif escritas:
+            # Parte de las filas llega en streaming: el total no se conoce
+            self.label_exportacion.configure(text=f"Exportando {escritas:,} filas")
+
+        self.btn_excel.after(INTERVALO_PROGRESO_MS, self._sondear_exportacion)
+
+    def _mostrar_progreso_exportacion(self, activo):
+        """Muestra u oculta el progreso y bloquea el botón de exportar"""
+        if activo:
+            self.progreso_exportacion.set(0)
+            self.label_exportacion.configure(text="Preparando exportación...")
+            self.frame_exportacion.pack(side="left", padx=5, before=self.btn_excel)
+            self.btn_excel.configure(state="disabled")
+        else:
+            self.frame_exportacion.pack_forget()
+            self.btn_excel.configure(state="normal")
+
+    def _cancelar_exportacion(self):
+        """Pide detener la exportación en curso"""
+        if self._exportacion is not None:
+            self._exportacion.set()
+
+    def _terminar_exportacion(self):
+        self._exportacion = None
+        self._mostrar_progreso_exportacion(False)
+
+    def _al_exportar(self, filename, filas):
+        """Exportación terminada (hilo de Tk)"""
+        self._terminar_exportacion()
+        messagebox.showinfo("Éxito", f"Reporte exportado exitosamente a:\n{filename}\n({filas:,} filas)")
+
+    def _al_fallar_exportacion(self, error):
+        """Exportación cancelada o con error (hilo de Tk)"""
+        self._terminar_exportacion()
+        if isinstance(error, ExportacionCancelada):
+            return
+        messagebox.showerror("Error", f"No se pudo exportar el reporte:\n{str(error)}")
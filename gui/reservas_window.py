@@ -2,10 +2,31 @@
 import customtkinter as ctk
 from tkinter import messagebox
 from tkcalendar import DateEntry
-from datetime import datetime, timedelta
-from database.db_manager import DatabaseManager
+from datetime import date, datetime, timedelta
+from database.db_manager import (
+    DatabaseManager, ResultadoReserva, RESERVA_CONFLICTO, RESERVA_ERROR, RESERVA_NO_DISPONIBLE
+)
 from core.session import obtener_sesion
-from typing import Optional, List, Tuple
+from core.worker import obtener_trabajador
+from gui.busqueda import Debouncer
+from gui.lista_virtual import ListaVirtual
+from models.habitacion import HabitacionLibre
+from models.huesped import HuespedEncontrado
+from models.reserva import Reserva
+from typing import Optional, List
+
+# Alto reservado para cada tarjeta en la lista virtual (incluye separación)
+ALTO_TARJETA_RESERVA = 176
+
+# Reservas que se piden al servidor por página
+TAMANO_PAGINA_RESERVAS = 50
+
+# Coincidencias que se listan al buscar un huésped en el formulario
+MAX_COINCIDENCIAS_HUESPED = 8
+
+# Textos del combo de habitaciones cuando no hay una opción válida
+SIN_HABITACIONES = "⚠️ No hay habitaciones disponibles"
+CARGANDO_HABITACIONES = "⏳ Buscando habitaciones libres..."
 
 
 class ReservasWindow:
@@ -17,9 +38,16 @@ class ReservasWindow:
 
         # 🔹 Obtener la base de datos desde la sesión
         self.db = self.session.db
+        self.trabajador = obtener_trabajador()
+
         # Variables
         self.reserva_seleccionada = None
         self.filtro_estado = "Todas"
+        self._filtros_actuales = ("", None)
+        self._siguiente_pagina = None
+        self._cargando_pagina = False
+        # Reservas con un check-out o cancelación en curso (botones deshabilitados)
+        self._en_proceso = set()
 
         # Colores consistentes con el diseño
         self.COLORES = {
@@ -125,7 +153,10 @@ class ReservasWindow:
             corner_radius=10
         )
         self.entry_buscar.pack(side="left")
-        self.entry_buscar.bind('<KeyRelease>', lambda e: self.aplicar_filtros())
+        # Los datos están paginados en el servidor: se espera a que el usuario
+        # deje de escribir antes de lanzar la consulta
+        self._buscar_con_espera = Debouncer(self.entry_buscar, self._buscar_si_cambio)
+        self.entry_buscar.bind('<KeyRelease>', self._buscar_con_espera)
 
         # Filtro por estado
         ctk.CTkLabel(
@@ -167,232 +198,149 @@ class ReservasWindow:
         btn_refrescar.pack(side="left", padx=5)
 
     def _crear_grid_reservas(self, parent):
-        """Crea el grid scrollable de reservas"""
-        # Frame contenedor con scroll
-        self.scroll_frame = ctk.CTkScrollableFrame(
-            parent,
-            fg_color="transparent"
+        """Crea la lista virtualizada de reservas"""
+        # Área que alterna entre la lista y los mensajes de estado
+        self.area_lista = ctk.CTkFrame(parent, fg_color="transparent")
+        self.area_lista.pack(fill="both", expand=True)
+
+        # Solo se crean tarjetas para las filas visibles y se reciclan al desplazarse
+        self.lista = ListaVirtual(
+            self.area_lista,
+            alto_fila=ALTO_TARJETA_RESERVA,
+            crear_fila=lambda padre: TarjetaReserva(padre, self),
+            llenar_fila=lambda tarjeta, datos: tarjeta.mostrar(datos),
+            al_acercarse_al_final=self._cargar_siguiente_pagina
         )
-        self.scroll_frame.pack(fill="both", expand=True)
 
     def cargar_reservas(self):
-        """Carga y muestra las reservas"""
-        # Limpiar grid
-        for widget in self.scroll_frame.winfo_children():
-            widget.destroy()
-
-        # Obtener reservas
-        reservas = self.db.obtener_reservas()
+        """Carga en segundo plano la primera página con los filtros actuales"""
+        self._limpiar_grid()
+        self._mostrar_cargando()
+
+        busqueda = self.entry_buscar.get().strip()
+        estado = self.combo_filtro_estado.get()
+        self._filtros_actuales = (busqueda, estado if estado != "Todas" else None)
+        self._siguiente_pagina = None
+        self._cargando_pagina = True
+        # Un refresco en curso ya no aplica a la lista nueva
+        self.trabajador.invalidar((id(self), "reservas_vigentes"))
+
+        self.trabajador.ejecutar(
+            self.area_lista,
+            self.session.reservas.pagina,
+            *self._filtros_actuales,
+            limite=TAMANO_PAGINA_RESERVAS,
+            al_terminar=self._mostrar_reservas,
+            al_fallar=self._mostrar_error_carga,
+            clave=(id(self), "reservas")
+        )
 
-        if not reservas:
-            self._mostrar_mensaje_vacio()
+    def _cargar_siguiente_pagina(self):
+        """Pide la siguiente página cuando la lista llega al final"""
+        if self._cargando_pagina or not self._siguiente_pagina:
             return
 
-        # Aplicar filtros
-        reservas_filtradas = self._filtrar_reservas(reservas)
+        self._cargando_pagina = True
+        self.trabajador.ejecutar(
+            self.area_lista,
+            self.session.reservas.pagina,
+            *self._filtros_actuales,
+            cursor=self._siguiente_pagina,
+            limite=TAMANO_PAGINA_RESERVAS,
+            al_terminar=self._agregar_pagina,
+            al_fallar=self._al_fallar_pagina,
+            clave=(id(self), "reservas")
+        )
 
-        if not reservas_filtradas:
-            self._mostrar_mensaje_sin_resultados()
+    def _agregar_pagina(self, pagina):
+        """Agrega una página recibida al final de la lista"""
+        self._cargando_pagina = False
+        self._siguiente_pagina = pagina.siguiente
+        self.lista.agregar_datos(pagina.filas)
+
+    def _al_fallar_pagina(self, error: Exception):
+        """Permite reintentar la página al volver a desplazarse"""
+        self._cargando_pagina = False
+        print(f"Error al cargar más reservas: {error}")
+
+    def _limpiar_grid(self):
+        """Oculta la lista y elimina los mensajes de estado"""
+        self.lista.pack_forget()
+        for widget in self.area_lista.winfo_children():
+            if widget is not self.lista:
+                widget.destroy()
+
+    def _mostrar_reservas(self, pagina):
+        """Muestra la primera página recibida del trabajador"""
+        self._limpiar_grid()
+        self._cargando_pagina = False
+        self._siguiente_pagina = pagina.siguiente
+
+        if not pagina.filas:
+            busqueda, estado = self._filtros_actuales
+            if busqueda or estado:
+                self._mostrar_mensaje_sin_resultados()
+            else:
+                self._mostrar_mensaje_vacio()
             return
 
         # Mostrar reservas
-        self._mostrar_reservas_lista(reservas_filtradas)
-
-    def _filtrar_reservas(self, reservas: List[Tuple]) -> List[Tuple]:
-        """Filtra las reservas según criterios"""
-        busqueda = self.entry_buscar.get().strip().lower()
-        estado_filtro = self.combo_filtro_estado.get()
-
-        reservas_filtradas = []
-
-        for reserva in reservas:
-            # Estructura: (id, huesped_id, huesped_nombre, habitacion_id, numero, tipo, fecha_entrada, fecha_salida, estado, total)
-            huesped = reserva[2].lower()
-            habitacion = str(reserva[4]).lower()
-            estado = reserva[8]
-
-            # Aplicar filtros
-            coincide_busqueda = busqueda in huesped or busqueda in habitacion if busqueda else True
-            coincide_estado = estado == estado_filtro if estado_filtro != "Todas" else True
-
-            if coincide_busqueda and coincide_estado:
-                reservas_filtradas.append(reserva)
-
-        return reservas_filtradas
-
-    def _mostrar_reservas_lista(self, reservas: List[Tuple]):
-        """Muestra las reservas en formato de lista de tarjetas"""
-        for reserva in reservas:
-            card = self._crear_tarjeta_reserva(reserva)
-            card.pack(fill="x", pady=8)
-
-    def _crear_tarjeta_reserva(self, datos: Tuple):
-        """Crea una tarjeta visual para una reserva"""
-        # Estructura: (id, huesped_id, huesped_nombre, habitacion_id, numero, tipo, fecha_entrada, fecha_salida, estado, total)
-        (reserva_id, huesped_id, huesped_nombre, habitacion_id,
-         habitacion_numero, tipo, fecha_entrada, fecha_salida, estado, total) = datos
-
-        # Frame principal de la tarjeta
-        card = ctk.CTkFrame(
-            self.scroll_frame,
-            fg_color=self.COLORES['card_bg'],
-            corner_radius=15,
-            border_width=2,
-            border_color=("#E0E0E0", "#4A4A4A")
-        )
-
-        # Hover effect
-        card.bind("<Enter>", lambda e: card.configure(border_color=self.COLORES['primary']))
-        card.bind("<Leave>", lambda e: card.configure(border_color=("#E0E0E0", "#4A4A4A")))
-
-        # Container interno
-        content = ctk.CTkFrame(card, fg_color="transparent")
-        content.pack(fill="both", padx=20, pady=15)
-
-        # Grid layout
-        content.columnconfigure(0, weight=1)  # Info principal
-        content.columnconfigure(1, weight=0)  # Fechas
-        content.columnconfigure(2, weight=0)  # Total y acciones
-
-        # === COLUMNA 1: Información Principal ===
-        info_frame = ctk.CTkFrame(content, fg_color="transparent")
-        info_frame.grid(row=0, column=0, sticky="w", padx=(0, 20))
+        self._mostrar_reservas_lista(pagina.filas)
 
-        # ID y Estado en una línea
-        header_frame = ctk.CTkFrame(info_frame, fg_color="transparent")
-        header_frame.pack(anchor="w", pady=(0, 8))
+    def _mostrar_reservas_lista(self, reservas: List[Reserva]):
+        """Muestra las reservas en la lista virtualizada de tarjetas"""
+        self.lista.pack(fill="both", expand=True)
+        self.lista.set_datos(reservas)
 
-        ctk.CTkLabel(
-            header_frame,
-            text=f"#{reserva_id}",
-            font=("Segoe UI", 14, "bold"),
-            text_color=("#7F8C8D", "#95A5A6")
-        ).pack(side="left", padx=(0, 15))
-
-        # Badge de estado
-        badge = ctk.CTkLabel(
-            header_frame,
-            text=self._get_texto_estado(estado),
-            font=("Segoe UI", 9, "bold"),
-            fg_color=self.COLORES.get(estado, "#95A5A6"),
-            corner_radius=6,
-            padx=12,
-            pady=4
+    def actualizar(self):
+        """Refresco por cambios en la BD (propios o de otras terminales)"""
+        if self.lista.datos:
+            self._refrescar_cargadas()
+        else:
+            self.cargar_reservas()
+
+    def _refrescar_cargadas(self):
+        """Tras un cambio, trae solo las reservas modificadas en vez de recargar las páginas"""
+        self.trabajador.ejecutar(
+            self.area_lista,
+            self._consultar_vigentes,
+            list(self.lista.datos),
+            al_terminar=self._mostrar_vigentes,
+            al_fallar=self._al_fallar_vigentes,
+            # Clave propia: no descarta una página que se esté cargando
+            clave=(id(self), "reservas_vigentes")
         )
-        badge.pack(side="left")
-
-        # Nombre del huésped
-        ctk.CTkLabel(
-            info_frame,
-            text=f"👤 {huesped_nombre}",
-            font=("Segoe UI", 16, "bold"),
-            anchor="w"
-        ).pack(anchor="w", pady=(0, 5))
-
-        # Habitación
-        ctk.CTkLabel(
-            info_frame,
-            text=f"🛏️ Habitación #{habitacion_numero} - {tipo}",
-            font=("Segoe UI", 12),
-            text_color=("#7F8C8D", "#95A5A6"),
-            anchor="w"
-        ).pack(anchor="w")
-
-        # === COLUMNA 2: Fechas ===
-        fechas_frame = ctk.CTkFrame(content, fg_color="transparent")
-        fechas_frame.grid(row=0, column=1, sticky="w", padx=(0, 20))
-
-        # Check-in
-        checkin_frame = ctk.CTkFrame(fechas_frame, fg_color="transparent")
-        checkin_frame.pack(anchor="w", pady=(0, 8))
-
-        ctk.CTkLabel(
-            checkin_frame,
-            text="Check-in",
-            font=("Segoe UI", 9),
-            text_color=("#95A5A6", "#7F8C8D")
-        ).pack(anchor="w")
-
-        ctk.CTkLabel(
-            checkin_frame,
-            text=str(fecha_entrada),
-            font=("Segoe UI", 12, "bold")
-        ).pack(anchor="w")
-
-        # Check-out
-        checkout_frame = ctk.CTkFrame(fechas_frame, fg_color="transparent")
-        checkout_frame.pack(anchor="w")
 
-        ctk.CTkLabel(
-            checkout_frame,
-            text="Check-out",
-            font=("Segoe UI", 9),
-            text_color=("#95A5A6", "#7F8C8D")
-        ).pack(anchor="w")
+    def _consultar_vigentes(self, reservas: List[Reserva]):
+        """(Hilo de trabajo) Las reservas cargadas al día, o None si hay reservas nuevas"""
+        vigentes = self.session.reservas.vigentes(reservas)
+        return None if self.session.reservas.tomar_nuevas() else vigentes
 
-        ctk.CTkLabel(
-            checkout_frame,
-            text=str(fecha_salida),
-            font=("Segoe UI", 12, "bold")
-        ).pack(anchor="w")
-
-        # === COLUMNA 3: Total y Acciones ===
-        acciones_frame = ctk.CTkFrame(content, fg_color="transparent")
-        acciones_frame.grid(row=0, column=2, sticky="e")
-
-        # Total
-        total_frame = ctk.CTkFrame(acciones_frame, fg_color="transparent")
-        total_frame.pack(pady=(0, 10))
-
-        ctk.CTkLabel(
-            total_frame,
-            text="Total",
-            font=("Segoe UI", 9),
-            text_color=("#95A5A6", "#7F8C8D")
-        ).pack()
-
-        ctk.CTkLabel(
-            total_frame,
-            text=f"${total:,.2f}" if total else "$0.00",
-            font=("Segoe UI", 18, "bold"),
-            text_color=self.COLORES['success']
-        ).pack()
+    def _mostrar_vigentes(self, reservas: Optional[List[Reserva]]):
+        """Reemplaza las reservas cargadas conservando el desplazamiento"""
+        if reservas is None:
+            # Se crearon reservas: la primera página cambia
+            self.cargar_reservas()
+            return
 
-        # Botones de acción (solo para reservas activas)
-        if estado == "activa":
-            botones_frame = ctk.CTkFrame(acciones_frame, fg_color="transparent")
-            botones_frame.pack()
+        # Se aplican sobre la lista actual: una página que llegó mientras
+        # tanto se conserva
+        vigentes = {reserva.id: reserva for reserva in reservas}
+        reservas = [vigentes.get(reserva.id, reserva) for reserva in self.lista.datos]
 
-            # Botón Check-out
-            btn_checkout = ctk.CTkButton(
-                botones_frame,
-                text="✅ Check-out",
-                command=lambda: self.hacer_checkout(datos),
-                height=35,
-                width=120,
-                font=("Segoe UI", 11, "bold"),
-                corner_radius=8,
-                fg_color=self.COLORES['primary'],
-                hover_color="#2980B9"
-            )
-            btn_checkout.pack(pady=2)
-
-            # Botón Cancelar (solo admin)
-            if self.session.tiene_privilegio_admin():
-                btn_cancelar = ctk.CTkButton(
-                    botones_frame,
-                    text="❌ Cancelar",
-                    command=lambda: self.cancelar_reserva(datos),
-                    height=35,
-                    width=120,
-                    font=("Segoe UI", 11, "bold"),
-                    corner_radius=8,
-                    fg_color=self.COLORES['danger'],
-                    hover_color="#C0392B"
-                )
-                btn_cancelar.pack(pady=2)
+        estado = self._filtros_actuales[1]
+        if estado:
+            reservas = [reserva for reserva in reservas if reserva.estado == estado]
+        if not reservas:
+            self.cargar_reservas()
+            return
+        # Las tarjetas cuya reserva no cambió (mismo objeto) no se repintan
+        self.lista.set_datos(reservas, reiniciar_scroll=False)
 
-        return card
+    def _al_fallar_vigentes(self, error: Exception):
+        """Si no se pudo refrescar, se recarga desde la primera página"""
+        print(f"Error al refrescar reservas: {error}")
+        self.cargar_reservas()
 
     def _get_texto_estado(self, estado: str) -> str:
         """Retorna el texto formateado del estado"""
@@ -405,7 +353,7 @@ class ReservasWindow:
 
     def _mostrar_mensaje_vacio(self):
         """Muestra mensaje cuando no hay reservas"""
-        mensaje = ctk.CTkFrame(self.scroll_frame, fg_color="transparent")
+        mensaje = ctk.CTkFrame(self.area_lista, fg_color="transparent")
         mensaje.pack(expand=True, pady=100)
 
         ctk.CTkLabel(
@@ -427,9 +375,39 @@ class ReservasWindow:
             text_color=("#7F8C8D", "#95A5A6")
         ).pack()
 
+    def _mostrar_cargando(self):
+        """Muestra el estado de carga mientras llegan los datos"""
+        mensaje = ctk.CTkFrame(self.area_lista, fg_color="transparent")
+        mensaje.pack(expand=True, pady=100)
+
+        ctk.CTkLabel(
+            mensaje,
+            text="⏳",
+            font=("Segoe UI", 48)
+        ).pack()
+
+        ctk.CTkLabel(
+            mensaje,
+            text="Cargando reservas...",
+            font=("Segoe UI", 14),
+            text_color=("#7F8C8D", "#95A5A6")
+        ).pack(pady=(10, 0))
+
+    def _mostrar_error_carga(self, error: Exception):
+        """Muestra el error cuando la consulta falla"""
+        self._cargando_pagina = False
+        print(f"Error al cargar reservas: {error}")
+        self._limpiar_grid()
+        ctk.CTkLabel(
+            self.area_lista,
+            text="⚠️ No se pudieron cargar las reservas",
+            font=("Segoe UI", 14),
+            text_color=self.COLORES['danger']
+        ).pack(expand=True, pady=100)
+
     def _mostrar_mensaje_sin_resultados(self):
         """Muestra mensaje cuando no hay resultados de búsqueda"""
-        mensaje = ctk.CTkFrame(self.scroll_frame, fg_color="transparent")
+        mensaje = ctk.CTkFrame(self.area_lista, fg_color="transparent")
         mensaje.pack(expand=True, pady=100)
 
         ctk.CTkLabel(
@@ -452,9 +430,15 @@ class ReservasWindow:
         ).pack()
 
     def aplicar_filtros(self):
-        """Aplica los filtros de búsqueda"""
+        """Aplica los filtros de búsqueda en el servidor"""
+        self._buscar_con_espera.cancelar()
         self.cargar_reservas()
 
+    def _buscar_si_cambio(self):
+        """Consulta solo si el texto buscado cambió (ignora flechas, Shift, etc.)"""
+        if self.entry_buscar.get().strip() != self._filtros_actuales[0]:
+            self.cargar_reservas()
+
     def abrir_formulario_nueva_reserva(self):
         """Abre el formulario para crear nueva reserva"""
         FormularioReserva(self.parent, self.db, self.cargar_reservas)
@@ -468,9 +452,9 @@ class ReservasWindow:
             )
             return
 
-        reserva_id = datos[0]
-        estado = datos[8]
-        huesped = datos[2]
+        reserva_id = datos.id
+        estado = datos.estado
+        huesped = datos.huesped_nombre
 
         if estado != "activa":
             messagebox.showwarning(
@@ -479,6 +463,14 @@ class ReservasWindow:
             )
             return
 
+        if datos.fecha_entrada > date.today():
+            messagebox.showwarning(
+                "Advertencia",
+                f"La reserva empieza el {datos.fecha_entrada}.\n"
+                "No se puede hacer check-out antes de la llegada; cancélala si ya no va."
+            )
+            return
+
         respuesta = messagebox.askyesno(
             "Confirmar Check-out",
             f"¿Realizar check-out para {huesped}?\n\n"
@@ -486,15 +478,12 @@ class ReservasWindow:
         )
 
         if respuesta:
-            exito = self.db.finalizar_reserva(reserva_id)
-            if exito:
-                messagebox.showinfo(
-                    "Éxito",
-                    "Check-out realizado correctamente.\nHabitación en limpieza."
-                )
-                self.cargar_reservas()
-            else:
-                messagebox.showerror("Error", "No se pudo realizar el check-out")
+            self._ejecutar_accion(
+                reserva_id,
+                self.session.reservas.finalizar,
+                "Check-out realizado correctamente.\nHabitación en limpieza.",
+                "No se pudo realizar el check-out"
+            )
 
     def cancelar_reserva(self, datos):
         """Cancela una reserva"""
@@ -505,9 +494,9 @@ class ReservasWindow:
             )
             return
 
-        reserva_id = datos[0]
-        estado = datos[8]
-        huesped = datos[2]
+        reserva_id = datos.id
+        estado = datos.estado
+        huesped = datos.huesped_nombre
 
         if estado != "activa":
             messagebox.showwarning(
@@ -524,12 +513,256 @@ class ReservasWindow:
         )
 
         if respuesta:
-            exito = self.db.cancelar_reserva(reserva_id)
+            self._ejecutar_accion(
+                reserva_id,
+                self.session.reservas.cancelar,
+                "Reserva cancelada correctamente",
+                "No se pudo cancelar la reserva"
+            )
+
+    def _ejecutar_accion(self, reserva_id, funcion, texto_exito, texto_error):
+        """Check-out o cancelación en el trabajador, con los botones de la reserva deshabilitados"""
+        if reserva_id in self._en_proceso:
+            return
+        self._en_proceso.add(reserva_id)
+        self.lista.refrescar()
+
+        def al_terminar(exito):
+            self._terminar_accion(reserva_id)
             if exito:
-                messagebox.showinfo("Éxito", "Reserva cancelada correctamente")
-                self.cargar_reservas()
+                messagebox.showinfo("Éxito", texto_exito)
             else:
-                messagebox.showerror("Error", "No se pudo cancelar la reserva")
+                messagebox.showerror(
+                    "Error",
+                    f"{texto_error}.\nLa reserva pudo haber cambiado en otra terminal."
+                )
+            self._refrescar_cargadas()
+
+        def al_fallar(error):
+            self._terminar_accion(reserva_id)
+            print(f"Error al actualizar la reserva {reserva_id}: {error}")
+            messagebox.showerror("Error", f"{texto_error}.\nRevisa la conexión e intenta de nuevo.")
+
+        self.trabajador.ejecutar(
+            self.area_lista,
+            funcion,
+            reserva_id,
+            al_terminar=al_terminar,
+            al_fallar=al_fallar
+        )
+
+    def _terminar_accion(self, reserva_id):
+        self._en_proceso.discard(reserva_id)
+        self.lista.refrescar()
+
+
+class TarjetaReserva(ctk.CTkFrame):
+    """Tarjeta reciclable de una reserva: los widgets se crean una vez y se rellenan con mostrar()"""
+
+    def __init__(self, parent, ventana: ReservasWindow):
+        self.ventana = ventana
+        self.COLORES = ventana.COLORES
+        self.datos = None
+
+        # Frame principal de la tarjeta
+        super().__init__(
+            parent,
+            fg_color=self.COLORES['card_bg'],
+            corner_radius=15,
+            border_width=2,
+            border_color=("#E0E0E0", "#4A4A4A")
+        )
+
+        # Hover effect
+        self.bind("<Enter>", lambda e: self.configure(border_color=self.COLORES['primary']))
+        self.bind("<Leave>", lambda e: self.configure(border_color=("#E0E0E0", "#4A4A4A")))
+
+        # Container interno
+        content = ctk.CTkFrame(self, fg_color="transparent")
+        content.pack(fill="both", padx=20, pady=15)
+
+        # Grid layout
+        content.columnconfigure(0, weight=1)  # Info principal
+        content.columnconfigure(1, weight=0)  # Fechas
+        content.columnconfigure(2, weight=0)  # Total y acciones
+
+        # === COLUMNA 1: Información Principal ===
+        info_frame = ctk.CTkFrame(content, fg_color="transparent")
+        info_frame.grid(row=0, column=0, sticky="w", padx=(0, 20))
+
+        # ID y Estado en una línea
+        header_frame = ctk.CTkFrame(info_frame, fg_color="transparent")
+        header_frame.pack(anchor="w", pady=(0, 8))
+
+        self.label_id = ctk.CTkLabel(
+            header_frame,
+            text="",
+            font=("Segoe UI", 14, "bold"),
+            text_color=("#7F8C8D", "#95A5A6")
+        )
+        self.label_id.pack(side="left", padx=(0, 15))
+
+        # Badge de estado
+        self.badge = ctk.CTkLabel(
+            header_frame,
+            text="",
+            font=("Segoe UI", 9, "bold"),
+            corner_radius=6,
+            padx=12,
+            pady=4
+        )
+        self.badge.pack(side="left")
+
+        # Nombre del huésped
+        self.label_huesped = ctk.CTkLabel(
+            info_frame,
+            text="",
+            font=("Segoe UI", 16, "bold"),
+            anchor="w"
+        )
+        self.label_huesped.pack(anchor="w", pady=(0, 5))
+
+        # Habitación
+        self.label_habitacion = ctk.CTkLabel(
+            info_frame,
+            text="",
+            font=("Segoe UI", 12),
+            text_color=("#7F8C8D", "#95A5A6"),
+            anchor="w"
+        )
+        self.label_habitacion.pack(anchor="w")
+
+        # === COLUMNA 2: Fechas ===
+        fechas_frame = ctk.CTkFrame(content, fg_color="transparent")
+        fechas_frame.grid(row=0, column=1, sticky="w", padx=(0, 20))
+
+        # Check-in
+        checkin_frame = ctk.CTkFrame(fechas_frame, fg_color="transparent")
+        checkin_frame.pack(anchor="w", pady=(0, 8))
+
+        ctk.CTkLabel(
+            checkin_frame,
+            text="Check-in",
+            font=("Segoe UI", 9),
+            text_color=("#95A5A6", "#7F8C8D")
+        ).pack(anchor="w")
+
+        self.label_entrada = ctk.CTkLabel(
+            checkin_frame,
+            text="",
+            font=("Segoe UI", 12, "bold")
+        )
+        self.label_entrada.pack(anchor="w")
+
+        # Check-out
+        checkout_frame = ctk.CTkFrame(fechas_frame, fg_color="transparent")
+        checkout_frame.pack(anchor="w")
+
+        ctk.CTkLabel(
+            checkout_frame,
+            text="Check-out",
+            font=("Segoe UI", 9),
+            text_color=("#95A5A6", "#7F8C8D")
+        ).pack(anchor="w")
+
+        self.label_salida = ctk.CTkLabel(
+            checkout_frame,
+            text="",
+            font=("Segoe UI", 12, "bold")
+        )
+        self.label_salida.pack(anchor="w")
+
+        # === COLUMNA 3: Total y Acciones ===
+        acciones_frame = ctk.CTkFrame(content, fg_color="transparent")
+        acciones_frame.grid(row=0, column=2, sticky="e")
+
+        # Total
+        total_frame = ctk.CTkFrame(acciones_frame, fg_color="transparent")
+        total_frame.pack(pady=(0, 10))
+
+        ctk.CTkLabel(
+            total_frame,
+            text="Total",
+            font=("Segoe UI", 9),
+            text_color=("#95A5A6", "#7F8C8D")
+        ).pack()
+
+        self.label_total = ctk.CTkLabel(
+            total_frame,
+            text="",
+            font=("Segoe UI", 18, "bold"),
+            text_color=self.COLORES['success']
+        )
+        self.label_total.pack()
+
+        # Botones de acción (solo visibles para reservas activas)
+        self.botones_frame = ctk.CTkFrame(acciones_frame, fg_color="transparent")
+
+        # Botón Check-out
+        self.btn_checkout = ctk.CTkButton(
+            self.botones_frame,
+            text="✅ Check-out",
+            command=lambda: self.ventana.hacer_checkout(self.datos),
+            height=35,
+            width=120,
+            font=("Segoe UI", 11, "bold"),
+            corner_radius=8,
+            fg_color=self.COLORES['primary'],
+            hover_color="#2980B9"
+        )
+        self.btn_checkout.pack(pady=2)
+
+        # Botón Cancelar (solo admin)
+        self.btn_cancelar = None
+        if self.ventana.session.tiene_privilegio_admin():
+            self.btn_cancelar = ctk.CTkButton(
+                self.botones_frame,
+                text="❌ Cancelar",
+                command=lambda: self.ventana.cancelar_reserva(self.datos),
+                height=35,
+                width=120,
+                font=("Segoe UI", 11, "bold"),
+                corner_radius=8,
+                fg_color=self.COLORES['danger'],
+                hover_color="#C0392B"
+            )
+            self.btn_cancelar.pack(pady=2)
+
+    def mostrar(self, datos: Reserva):
+        """Rellena la tarjeta con los datos de una reserva"""
+        (reserva_id, huesped_id, huesped_nombre, habitacion_id,
+         habitacion_numero, tipo, fecha_entrada, fecha_salida, estado, total) = datos
+        if datos is self.datos:
+            self._pintar_acciones()
+            return  # Misma reserva sin cambios (mapa de identidad)
+        self.datos = datos
+
+        self.label_id.configure(text=f"#{reserva_id}")
+        self.badge.configure(
+            text=self.ventana._get_texto_estado(estado),
+            fg_color=self.COLORES.get(estado, "#95A5A6")
+        )
+        self.label_huesped.configure(text=f"👤 {huesped_nombre}")
+        self.label_habitacion.configure(text=f"🛏️ Habitación #{habitacion_numero} - {tipo}")
+        self.label_entrada.configure(text=str(fecha_entrada))
+        self.label_salida.configure(text=str(fecha_salida))
+        self.label_total.configure(text=f"${total:,.2f}" if total else "$0.00")
+
+        self._pintar_acciones()
+
+    def _pintar_acciones(self):
+        """Botones solo para reservas activas; deshabilitados mientras se procesa una acción"""
+        if self.datos.estado != "activa":
+            self.botones_frame.pack_forget()
+            return
+        self.botones_frame.pack()
+        en_proceso = self.datos.id in self.ventana._en_proceso
+        self.btn_checkout.configure(
+            state="disabled" if en_proceso else "normal",
+            text="⏳ Procesando..." if en_proceso else "✅ Check-out"
+        )
+        if self.btn_cancelar is not None:
+            self.btn_cancelar.configure(state="disabled" if en_proceso else "normal")
 
 
 class FormularioReserva:
@@ -540,6 +773,7 @@ class FormularioReserva:
         # Variables
         self.huesped_seleccionado = None
         self.habitaciones_disponibles = []
+        self._seleccion_anterior = None
         self.total_calculado = 0
 
         # Colores
@@ -641,7 +875,7 @@ class FormularioReserva:
         # Campo de búsqueda
         ctk.CTkLabel(
             parent,
-            text="Teléfono del Huésped *",
+            text="Huésped *",
             font=("Segoe UI", 13, "bold"),
             anchor="w"
         ).pack(anchor="w", pady=(0, 8))
@@ -651,7 +885,7 @@ class FormularioReserva:
 
         self.entry_buscar = ctk.CTkEntry(
             search_frame,
-            placeholder_text="Ingrese teléfono del huésped",
+            placeholder_text="Nombre, teléfono o email del huésped",
             height=50,
             font=("Segoe UI", 13),
             corner_radius=12
@@ -670,6 +904,11 @@ class FormularioReserva:
             hover_color="#2980B9"
         )
         btn_buscar.pack(side="left")
+        self.entry_buscar.bind('<Return>', lambda e: self.buscar_huesped())
+
+        # Coincidencias cuando la búsqueda devuelve más de un huésped
+        self.frame_resultados = ctk.CTkFrame(parent, fg_color="transparent")
+        self.frame_resultados.pack_forget()
 
         # Card para mostrar huésped seleccionado
         self.card_huesped = ctk.CTkFrame(
@@ -707,6 +946,9 @@ class FormularioReserva:
         # Total
         self._crear_seccion_total(parent)
 
+        # Habitaciones libres para las fechas iniciales
+        self._actualizar_habitaciones()
+
     def _crear_campo_habitacion(self, parent):
         """Crea el campo de selección de habitación"""
         ctk.CTkLabel(
@@ -716,19 +958,10 @@ class FormularioReserva:
             anchor="w"
         ).pack(anchor="w", pady=(0, 8))
 
-        # Cargar habitaciones disponibles
-        self.habitaciones_disponibles = self.db.obtener_habitaciones_disponibles()
-        opciones_hab = [
-            f"#{hab[1]} - {hab[2]} - ${hab[3]:,.2f}/noche"
-            for hab in self.habitaciones_disponibles
-        ]
-
-        if not opciones_hab:
-            opciones_hab = ["⚠️ No hay habitaciones disponibles"]
-
+        # Las opciones dependen de las fechas: se cargan al crear los calendarios
         self.combo_habitacion = ctk.CTkComboBox(
             parent,
-            values=opciones_hab,
+            values=[CARGANDO_HABITACIONES],
             height=50,
             font=("Segoe UI", 13),
             corner_radius=12,
@@ -737,13 +970,63 @@ class FormularioReserva:
             dropdown_font=("Segoe UI", 12)
         )
         self.combo_habitacion.pack(fill="x", pady=(0, 20))
-
-        if opciones_hab and opciones_hab[0] != "⚠️ No hay habitaciones disponibles":
-            self.combo_habitacion.set(opciones_hab[0])
-            self.ventana.after(500, self.calcular_total_automatico)
+        self.combo_habitacion.set(CARGANDO_HABITACIONES)
 
         self.combo_habitacion.configure(command=lambda e: self.calcular_total_automatico())
 
+    @staticmethod
+    def _texto_habitacion(hab: HabitacionLibre):
+        """Texto de una habitación en el combo"""
+        return f"#{hab.numero} - {hab.tipo} - ${hab.precio:,.2f}/noche"
+
+    def _actualizar_habitaciones(self):
+        """Pide en segundo plano las habitaciones libres para las fechas elegidas"""
+        fecha_entrada = self.date_entrada.get_date()
+        fecha_salida = self.date_salida.get_date()
+        if fecha_salida <= fecha_entrada:
+            return
+
+        self.combo_habitacion.configure(values=[CARGANDO_HABITACIONES])
+        self.combo_habitacion.set(CARGANDO_HABITACIONES)
+
+        obtener_trabajador().ejecutar(
+            self.ventana,
+            obtener_sesion().habitaciones.libres,
+            fecha_entrada,
+            fecha_salida,
+            al_terminar=self._mostrar_habitaciones_libres,
+            al_fallar=self._al_fallar_habitaciones,
+            clave=(id(self), "disponibilidad")
+        )
+
+    def _mostrar_habitaciones_libres(self, habitaciones):
+        """Llena el combo conservando la selección si sigue libre"""
+        anterior = self._seleccion_anterior
+        self.habitaciones_disponibles = habitaciones
+        opciones_hab = [self._texto_habitacion(hab) for hab in habitaciones]
+
+        if not opciones_hab:
+            opciones_hab = [SIN_HABITACIONES]
+
+        self.combo_habitacion.configure(values=opciones_hab)
+        self.combo_habitacion.set(anterior if anterior in opciones_hab else opciones_hab[0])
+        self.calcular_total_automatico()
+
+    def _al_fallar_habitaciones(self, error):
+        print(f"Error al consultar disponibilidad: {error}")
+        self.habitaciones_disponibles = []
+        self.combo_habitacion.configure(values=[SIN_HABITACIONES])
+        self.combo_habitacion.set(SIN_HABITACIONES)
+        self.calcular_total_automatico()
+
+    def _al_cambiar_fechas(self):
+        """Recalcula el total y la disponibilidad para el nuevo rango"""
+        seleccion = self.combo_habitacion.get()
+        if seleccion not in (SIN_HABITACIONES, CARGANDO_HABITACIONES):
+            self._seleccion_anterior = seleccion
+        self.calcular_total_automatico()
+        self._actualizar_habitaciones()
+
     def _crear_campos_fechas(self, parent):
         """Crea los campos de fechas con calendarios"""
         fechas_container = ctk.CTkFrame(parent, fg_color="transparent")
@@ -776,7 +1059,7 @@ class FormularioReserva:
             locale='es_ES'
         )
         self.date_entrada.pack(fill="x")
-        self.date_entrada.bind("<<DateEntrySelected>>", lambda e: self.calcular_total_automatico())
+        self.date_entrada.bind("<<DateEntrySelected>>", lambda e: self._al_cambiar_fechas())
 
         # Check-out
         checkout_frame = ctk.CTkFrame(fechas_container, fg_color="transparent")
@@ -802,7 +1085,7 @@ class FormularioReserva:
             locale='es_ES'
         )
         self.date_salida.pack(fill="x")
-        self.date_salida.bind("<<DateEntrySelected>>", lambda e: self.calcular_total_automatico())
+        self.date_salida.bind("<<DateEntrySelected>>", lambda e: self._al_cambiar_fechas())
 
     def _crear_seccion_total(self, parent):
         """Crea la sección de visualización del total"""
@@ -844,7 +1127,7 @@ class FormularioReserva:
         frame_botones = ctk.CTkFrame(parent, fg_color="transparent")
         frame_botones.pack(fill="x", pady=(20, 0))
 
-        btn_guardar = ctk.CTkButton(
+        self.btn_guardar = ctk.CTkButton(
             frame_botones,
             text="💾 Guardar Reserva",
             command=self.guardar,
@@ -854,7 +1137,7 @@ class FormularioReserva:
             fg_color=self.COLORES['success'],
             hover_color="#229954"
         )
-        btn_guardar.pack(fill="x", pady=(0, 10))
+        self.btn_guardar.pack(fill="x", pady=(0, 10))
 
         btn_cancelar = ctk.CTkButton(
             frame_botones,
@@ -872,39 +1155,82 @@ class FormularioReserva:
         btn_cancelar.pack(fill="x")
 
     def buscar_huesped(self):
-        """Busca un huésped por teléfono"""
-        telefono = self.entry_buscar.get().strip()
+        """Busca huéspedes por fragmento de nombre, teléfono o email"""
+        texto = self.entry_buscar.get().strip()
 
-        if not telefono:
-            messagebox.showwarning("Advertencia", "Ingrese un teléfono para buscar")
+        if not texto:
+            messagebox.showwarning("Advertencia", "Ingrese un nombre, teléfono o email para buscar")
             return
 
-        huesped = self.db.buscar_huesped_por_telefono(telefono)
+        obtener_trabajador().ejecutar(
+            self.ventana,
+            obtener_sesion().huespedes.buscar,
+            texto,
+            MAX_COINCIDENCIAS_HUESPED,
+            al_terminar=self._mostrar_coincidencias,
+            al_fallar=self._al_fallar_busqueda,
+            clave=(id(self), "buscar_huesped")
+        )
 
-        if huesped:
-            self.huesped_seleccionado = huesped
-            nombre_completo = f"{huesped[1]} {huesped[2]}"
-            self._mostrar_huesped_seleccionado(huesped)
-            messagebox.showinfo("Encontrado", f"Huésped: {nombre_completo}")
-        else:
-            self.card_huesped.pack_forget()
-            self.huesped_seleccionado = None
-
-            respuesta = messagebox.askyesno(
-                "No encontrado",
-                "Huésped no encontrado.\n\n"
-                "¿Desea registrar un nuevo huésped?\n"
-                "(Vaya al módulo de Huéspedes)"
+    def _mostrar_coincidencias(self, huespedes):
+        """Selecciona el único resultado o lista las coincidencias para elegir"""
+        for widget in self.frame_resultados.winfo_children():
+            widget.destroy()
+        self.frame_resultados.pack_forget()
+
+        if len(huespedes) == 1:
+            self._elegir_huesped(huespedes[0])
+            return
+
+        self.card_huesped.pack_forget()
+        self.huesped_seleccionado = None
+
+        if huespedes:
+            self.frame_resultados.pack(fill="x", pady=(0, 10), after=self.entry_buscar.master)
+            for huesped in huespedes:
+                detalle = " · ".join(str(dato) for dato in (huesped.telefono, huesped.email) if dato)
+                ctk.CTkButton(
+                    self.frame_resultados,
+                    text=f"👤 {huesped.nombre} {huesped.apellido}    {detalle}",
+                    command=lambda h=huesped: self._elegir_huesped(h),
+                    height=32,
+                    anchor="w",
+                    font=("Segoe UI", 12),
+                    corner_radius=8,
+                    fg_color="transparent",
+                    border_width=1,
+                    border_color=("#BDC3C7", "#4A4A4A"),
+                    text_color=("#2C3E50", "#ECF0F1"),
+                    hover_color=("#ECF0F1", "#3A3A3A")
+                ).pack(fill="x", pady=2)
+            return
+
+        respuesta = messagebox.askyesno(
+            "No encontrado",
+            "Huésped no encontrado.\n\n"
+            "¿Desea registrar un nuevo huésped?\n"
+            "(Vaya al módulo de Huéspedes)"
+        )
+
+        if respuesta:
+            messagebox.showinfo(
+                "Info",
+                "Por favor, registre primero al huésped en el módulo\n"
+                "de Huéspedes y luego cree la reserva."
             )
 
-            if respuesta:
-                messagebox.showinfo(
-                    "Info",
-                    "Por favor, registre primero al huésped en el módulo\n"
-                    "de Huéspedes y luego cree la reserva."
-                )
+    def _elegir_huesped(self, huesped):
+        for widget in self.frame_resultados.winfo_children():
+            widget.destroy()
+        self.frame_resultados.pack_forget()
+        self.huesped_seleccionado = huesped
+        self._mostrar_huesped_seleccionado(huesped)
 
-    def _mostrar_huesped_seleccionado(self, huesped):
+    def _al_fallar_busqueda(self, error):
+        print(f"Error al buscar huésped: {error}")
+        messagebox.showerror("Error", "No se pudo buscar el huésped")
+
+    def _mostrar_huesped_seleccionado(self, huesped: HuespedEncontrado):
         """Muestra la información del huésped seleccionado"""
         for widget in self.card_huesped.winfo_children():
             widget.destroy()
@@ -934,7 +1260,7 @@ class FormularioReserva:
         info_frame = ctk.CTkFrame(content, fg_color="transparent")
         info_frame.pack(fill="x")
 
-        nombre_completo = f"{huesped[1]} {huesped[2]}"
+        nombre_completo = f"{huesped.nombre} {huesped.apellido}"
 
         ctk.CTkLabel(
             info_frame,
@@ -943,19 +1269,19 @@ class FormularioReserva:
             anchor="w"
         ).pack(anchor="w", pady=(0, 5))
 
-        if huesped[4]:  # Email
+        if huesped.email:
             ctk.CTkLabel(
                 info_frame,
-                text=f"📧 {huesped[4]}",
+                text=f"📧 {huesped.email}",
                 font=("Segoe UI", 11),
                 text_color=("#7F8C8D", "#95A5A6"),
                 anchor="w"
             ).pack(anchor="w", pady=(0, 3))
 
-        if huesped[3]:  # Teléfono
+        if huesped.telefono:
             ctk.CTkLabel(
                 info_frame,
-                text=f"📱 {huesped[3]}",
+                text=f"📱 {huesped.telefono}",
                 font=("Segoe UI", 11),
                 text_color=("#7F8C8D", "#95A5A6"),
                 anchor="w"
@@ -966,8 +1292,7 @@ class FormularioReserva:
         seleccion = self.combo_habitacion.get()
 
         for i, hab in enumerate(self.habitaciones_disponibles):
-            opcion = f"#{hab[1]} - {hab[2]} - ${hab[3]:,.2f}/noche"
-            if opcion == seleccion:
+            if self._texto_habitacion(hab) == seleccion:
                 return i
 
         return -1
@@ -975,8 +1300,7 @@ class FormularioReserva:
     def calcular_total_automatico(self):
         """Calcula el total automáticamente al cambiar las fechas"""
         try:
-            if (not self.combo_habitacion.get() or
-                    self.combo_habitacion.get() == "⚠️ No hay habitaciones disponibles"):
+            if self.combo_habitacion.get() in ("", SIN_HABITACIONES, CARGANDO_HABITACIONES):
                 self.label_total.configure(text="$0.00")
                 self.label_noches.configure(text="Selecciona una habitación")
                 self.total_calculado = 0
@@ -987,7 +1311,7 @@ class FormularioReserva:
                 return
 
             habitacion = self.habitaciones_disponibles[indice]
-            precio_noche = habitacion[3]
+            precio_noche = habitacion.precio
 
             fecha_entrada = self.date_entrada.get_date()
             fecha_salida = self.date_salida.get_date()
@@ -1029,8 +1353,7 @@ class FormularioReserva:
             self.entry_buscar.focus()
             return
 
-        if (not self.combo_habitacion.get() or
-                self.combo_habitacion.get() == "⚠️ No hay habitaciones disponibles"):
+        if self.combo_habitacion.get() in ("", SIN_HABITACIONES, CARGANDO_HABITACIONES):
             messagebox.showerror(
                 "Campo Requerido",
                 "Debe seleccionar una habitación"
@@ -1054,31 +1377,54 @@ class FormularioReserva:
             messagebox.showerror("Error", "No se pudo identificar la habitación")
             return
 
-        habitacion_id = self.habitaciones_disponibles[indice][0]
-        habitacion_numero = self.habitaciones_disponibles[indice][1]
-        huesped_id = self.huesped_seleccionado[0]
-        huesped_nombre = f"{self.huesped_seleccionado[1]} {self.huesped_seleccionado[2]}"
+        habitacion = self.habitaciones_disponibles[indice]
+        habitacion_id, habitacion_numero = habitacion.id, habitacion.numero
+        huesped_id = self.huesped_seleccionado.id
+        huesped_nombre = f"{self.huesped_seleccionado.nombre} {self.huesped_seleccionado.apellido}"
+
+        resumen = (
+            f"Huésped: {huesped_nombre}\n"
+            f"Habitación: #{habitacion_numero}\n"
+            f"Check-in: {fecha_entrada}\n"
+            f"Check-out: {fecha_salida}\n"
+            f"Total: ${self.total_calculado:,.2f}"
+        )
 
-        exito = self.db.agregar_reserva(
+        # Transacción con bloqueo de la habitación, fuera del hilo de Tk
+        self.btn_guardar.configure(state="disabled", text="⏳ Guardando...")
+        obtener_trabajador().ejecutar(
+            self.ventana,
+            obtener_sesion().reservas.reservar,
             huesped_id,
             habitacion_id,
             fecha_entrada,
             fecha_salida,
-            self.total_calculado
+            self.total_calculado,
+            al_terminar=lambda resultado: self._al_guardar(resultado, resumen),
+            al_fallar=lambda error: self._al_guardar(ResultadoReserva(RESERVA_ERROR, mensaje=str(error)), resumen)
         )
 
-        if exito:
+    def _al_guardar(self, resultado, resumen):
+        """Muestra el resultado de reservar_habitacion"""
+        if resultado.exito:
             messagebox.showinfo(
                 "✓ Reserva Creada",
-                f"La reserva se ha creado correctamente\n\n"
-                f"Huésped: {huesped_nombre}\n"
-                f"Habitación: #{habitacion_numero}\n"
-                f"Check-in: {fecha_entrada}\n"
-                f"Check-out: {fecha_salida}\n"
-                f"Total: ${self.total_calculado:,.2f}"
+                f"La reserva se ha creado correctamente\n\n{resumen}"
             )
             self.callback_refrescar()
             self.ventana.destroy()
+            return
+
+        self.btn_guardar.configure(state="normal", text="💾 Guardar Reserva")
+
+        if resultado.estado in (RESERVA_CONFLICTO, RESERVA_NO_DISPONIBLE):
+            # Otra terminal la tomó mientras tanto: actualizar las opciones
+            messagebox.showwarning(
+                "Habitación no disponible",
+                f"{resultado.mensaje}.\n\n"
+                "Se actualizó la lista de habitaciones libres."
+            )
+            self._al_cambiar_fechas()
         else:
             messagebox.showerror(
                 "Error",
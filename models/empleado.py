@@ -0,0 +1,14 @@
+# models/empleado.py
+from typing import NamedTuple, Optional
+
+
+class Empleado(NamedTuple):
+    """Fila de empleados (password es el hash bcrypt)"""
+    id: int
+    nombre: str
+    apellido: str
+    puesto: str
+    telefono: Optional[str]
+    usuario: Optional[str]
+    password: Optional[str]
+    privilegio: Optional[str]
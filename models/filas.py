@@ -0,0 +1,52 @@
+# models/filas.py
+"""
+Lectura de filas de psycopg2 como modelos NamedTuple
+
+Cada modelo declara sus campos en el mismo orden que la lista de columnas
+de su consulta (columnas(Modelo) arma esa lista), así no depende del orden
+de SELECT *. Un NamedTuple ocupa lo mismo que la tupla que devuelve
+psycopg2 y se crea en C (Modelo._make), sin indexar fila por fila en Python.
+
+Las filas se leen por lotes de fetchmany: psycopg2 solo crea las tuplas de
+un lote a la vez, así nunca conviven la lista completa de tuplas y la de
+modelos (el pico de memoria es el resultado más un lote).
+"""
+
+from typing import List, Optional, Type, TypeVar
+
+T = TypeVar("T")
+
+# Filas que se convierten por vuelta en leer_filas
+LOTE_FILAS = 1000
+
+
+def columnas(modelo: Type[T], alias: str = "") -> str:
+    """Lista de columnas SQL del modelo: 'id, numero, ...' (o 'h.id, h.numero, ...')"""
+    prefijo = f"{alias}." if alias else ""
+    return ", ".join(prefijo + campo for campo in modelo._fields)
+
+
+def _comprobar(cur, modelo):
+    """Falla si la consulta no devuelve exactamente las columnas del modelo"""
+    nombres = tuple(col.name for col in cur.description or ())
+    if nombres != modelo._fields:
+        raise ValueError(f"{modelo.__name__}: la consulta devolvió {nombres}, se esperaba {modelo._fields}")
+
+
+def leer_filas(cur, modelo: Type[T], lote: int = LOTE_FILAS) -> List[T]:
+    """Todas las filas del resultado convertidas al modelo, de a `lote`"""
+    _comprobar(cur, modelo)
+    crear = modelo._make
+    filas: List[T] = []
+    while True:
+        tuplas = cur.fetchmany(lote)
+        if not tuplas:
+            return filas
+        filas.extend(map(crear, tuplas))
+
+
+def leer_fila(cur, modelo: Type[T]) -> Optional[T]:
+    """fetchone() convertido al modelo (None si no hay fila)"""
+    _comprobar(cur, modelo)
+    fila = cur.fetchone()
+    return modelo._make(fila) if fila is not None else None
@@ -0,0 +1,20 @@
+# models/habitacion.py
+from decimal import Decimal
+from typing import NamedTuple
+
+
+class Habitacion(NamedTuple):
+    """Fila de habitaciones"""
+    id: int
+    numero: str
+    tipo: str
+    precio: Decimal
+    estado: str  # disponible | ocupada | limpieza | mantenimiento
+
+
+class HabitacionLibre(NamedTuple):
+    """Habitación que se puede reservar en un rango de fechas"""
+    id: int
+    numero: str
+    tipo: str
+    precio: Decimal
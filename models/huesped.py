@@ -0,0 +1,21 @@
+# models/huesped.py
+from typing import NamedTuple, Optional
+
+
+class Huesped(NamedTuple):
+    """Fila de huespedes (password es el hash bcrypt, '' si no tiene)"""
+    id: int
+    nombre: str
+    apellido: str
+    telefono: Optional[str]
+    password: Optional[str]
+    email: Optional[str]
+
+
+class HuespedEncontrado(NamedTuple):
+    """Resultado de las búsquedas de huéspedes (sin la contraseña)"""
+    id: int
+    nombre: str
+    apellido: str
+    telefono: Optional[str]
+    email: Optional[str]
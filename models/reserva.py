@@ -0,0 +1,18 @@
+# models/reserva.py
+from datetime import date
+from decimal import Decimal
+from typing import NamedTuple
+
+
+class Reserva(NamedTuple):
+    """Reserva con el huésped y la habitación ya resueltos (listados)"""
+    id: int
+    huesped_id: int
+    huesped_nombre: str
+    habitacion_id: int
+    numero: str
+    tipo: str
+    fecha_entrada: date
+    fecha_salida: date
+    estado: str  # activa | finalizada | cancelada
+    total: Decimal
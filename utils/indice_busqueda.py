@@ -0,0 +1,80 @@
+# utils/indice_busqueda.py
+"""
+Índice de trigramas en memoria para buscar fragmentos de texto
+
+Cada clave se normaliza (minúsculas, sin acentos) y se parte en trigramas;
+cada trigrama guarda la lista ordenada de filas que lo contienen. Para un
+texto de 3 o más caracteres se intersectan las listas de sus trigramas (la
+más corta primero) y solo los candidatos se comparan por subcadena, así
+"ramir", "5512" o "@gmail" se resuelven sin recorrer todo el snapshot.
+Textos más cortos hacen una pasada lineal (coinciden con casi todo).
+
+Es la contraparte local de DatabaseManager.buscar_huespedes (pg_trgm).
+"""
+
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence
+
+LARGO_NGRAMA = 3
+
+_TELEFONO = re.compile(r"[\d\s()+.-]*\d[\d\s()+.-]*")
+_NO_DIGITOS = re.compile(r"\D")
+
+
+def normalizar(texto: str) -> str:
+    """Minúsculas y sin acentos: 'José Peña' -> 'jose pena'"""
+    texto = unicodedata.normalize("NFKD", texto.lower())
+    return "".join(c for c in texto if not unicodedata.combining(c))
+
+
+def digitos_telefono(texto: str) -> Optional[str]:
+    """Solo los dígitos si el texto parece un teléfono ('(55) 12-34' -> '551234'), si no None"""
+    texto = texto.strip()
+    if not _TELEFONO.fullmatch(texto):
+        return None
+    return _NO_DIGITOS.sub("", texto)
+
+
+def _ngramas(texto: str):
+    return {texto[i:i + LARGO_NGRAMA] for i in range(len(texto) - LARGO_NGRAMA + 1)}
+
+
+class IndiceNgramas:
+    """Índice invertido trigrama -> filas, sobre claves ya normalizadas"""
+
+    def __init__(self, claves: Sequence[str]):
+        self.claves = list(claves)
+        postings = defaultdict(list)
+        n = LARGO_NGRAMA
+        for i, clave in enumerate(self.claves):
+            for ngrama in {clave[j:j + n] for j in range(len(clave) - n + 1)}:
+                postings[ngrama].append(i)  # i crece: cada lista queda ordenada
+        self._postings: Dict[str, List[int]] = dict(postings)
+
+    def buscar(self, texto: str) -> List[int]:
+        """Índices (ascendentes) de las claves que contienen `texto` ya normalizado"""
+        claves = self.claves
+        if len(texto) < LARGO_NGRAMA:
+            return [i for i, clave in enumerate(claves) if texto in clave]
+
+        listas = []
+        for ngrama in _ngramas(texto):
+            lista = self._postings.get(ngrama)
+            if lista is None:
+                return []
+            listas.append(lista)
+        listas.sort(key=len)
+
+        candidatos = set(listas[0])
+        for lista in listas[1:]:
+            candidatos.intersection_update(lista)
+            if not candidatos:
+                return []
+
+        # Los trigramas pueden estar en otro orden: se confirma la subcadena
+        return sorted(i for i in candidatos if texto in claves[i])
+
+    def __len__(self):
+        return len(self.claves)